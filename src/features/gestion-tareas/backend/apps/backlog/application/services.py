@@ -0,0 +1,409 @@
+import csv
+import io
+import json
+from datetime import date
+from itertools import groupby, islice
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.mail import send_mass_mail
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, Q, Sum, Value, When, Window
+from django.db.models.functions import Cast, Coalesce, RowNumber
+from django.utils import timezone
+
+from apps.backlog.domain.models import BacklogItem, ImportJob, ImportRowError
+from apps.shared.domain.value_objects import PRIORITY_RANKS, Priority, Status
+from apps.shared.infrastructure.cache import invalidate_tags
+
+
+BACKLOG_POINTS = set(range(1, 21))
+STORY_POINTS = {1, 2, 3, 5, 8, 13, 21}
+
+
+def chunked(iterable, size):
+    """Divide un iterable en listas de tamaño acotado sin materializarlo"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def parse_choice(value, enum, field, errors, default):
+    """Acepta el valor ('Alta') o el nombre ('HIGH') de un objeto de valor"""
+    if value in (None, ''):
+        return default
+    text = str(value).strip()
+    for member in enum:
+        if text.lower() in (member.value.lower(), member.name.lower()):
+            return member.value
+    errors.append((field, f'Valor no permitido: {text}'))
+    return default
+
+
+def parse_points(value, allowed, errors, field='story_points'):
+    if value in (None, ''):
+        return None
+    try:
+        points = int(value)
+    except (TypeError, ValueError):
+        errors.append((field, f'Debe ser un entero: {value}'))
+        return None
+    if points not in allowed:
+        errors.append((field, f'Valor no permitido: {points}'))
+        return None
+    return points
+
+
+def parse_labels(value):
+    if isinstance(value, list):
+        return [str(label).strip() for label in value if str(label).strip()]
+    if not value:
+        return []
+    return [label.strip() for label in str(value).replace('|', ';').split(';') if label.strip()]
+
+
+def parse_text(data, field, errors, max_length=None, required=False):
+    value = str(data.get(field) or '').strip()
+    if required and not value:
+        errors.append((field, 'Este campo es obligatorio'))
+    elif max_length and len(value) > max_length:
+        errors.append((field, f'Máximo {max_length} caracteres'))
+    return value
+
+
+class ImportService:
+    """Importa en streaming ítems del backlog o historias desde CSV o NDJSON"""
+
+    chunk_size = 1000
+    # Límite de errores guardados por importación; el resto sólo se cuenta
+    max_logged_errors = 10000
+
+    def run(self, job):
+        """Procesa la importación completa por lotes con transacciones independientes"""
+        ImportJob.objects.filter(pk=job.pk).update(status='running', started_at=timezone.now())
+        self.logged_errors = 0
+        try:
+            with job.source.open('rb') as raw:
+                stream = io.TextIOWrapper(raw, encoding='utf-8-sig', newline='')
+                for chunk in chunked(self.read_rows(stream, job.format), self.chunk_size):
+                    self.import_chunk(job, chunk)
+        except Exception as exc:
+            ImportJob.objects.filter(pk=job.pk).update(
+                status='failed', message=str(exc)[:1000], finished_at=timezone.now()
+            )
+            raise
+        ImportJob.objects.filter(pk=job.pk).update(status='completed', finished_at=timezone.now())
+
+    def read_rows(self, stream, format):
+        """Genera (número de fila, datos, error) leyendo el archivo línea a línea"""
+        if format == 'csv':
+            reader = csv.DictReader(stream)
+            for number, row in enumerate(reader, start=2):
+                yield number, row, None
+            return
+        for number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError as exc:
+                yield number, None, f'JSON inválido: {exc}'
+                continue
+            if not isinstance(data, dict):
+                yield number, None, 'Cada línea debe ser un objeto JSON'
+                continue
+            yield number, data, None
+
+    def import_chunk(self, job, chunk):
+        errors = []
+        valid = []
+        for number, data, error in chunk:
+            if error:
+                errors.append((number, '', error))
+                continue
+            cleaned, row_errors = self.clean_row(data, job.kind)
+            if row_errors:
+                errors.extend((number, field, message) for field, message in row_errors)
+            else:
+                valid.append((number, cleaned))
+
+        usernames = {cleaned['assigned_to'] for _, cleaned in valid if cleaned['assigned_to']}
+        users = dict(User.objects.filter(username__in=usernames).values_list('username', 'id'))
+        rows = []
+        for number, cleaned in valid:
+            username = cleaned.pop('assigned_to')
+            if username and username not in users:
+                errors.append((number, 'assigned_to', f'Usuario inexistente: {username}'))
+                continue
+            cleaned['assigned_to_id'] = users.get(username)
+            rows.append(cleaned)
+
+        with transaction.atomic():
+            created = self.write_rows(job, rows)
+            if created:
+                invalidate_tags('backlog')
+            self.log_errors(job, errors)
+            ImportJob.objects.filter(pk=job.pk).update(
+                processed_rows=F('processed_rows') + len(chunk),
+                created_rows=F('created_rows') + created,
+                error_count=F('error_count') + len({number for number, _, _ in errors}),
+            )
+
+    def clean_row(self, data, kind):
+        """Valida una fila contra los campos del modelo y los objetos de valor"""
+        errors = []
+        cleaned = {
+            'title': parse_text(data, 'title', errors, max_length=255, required=True),
+            'description': parse_text(data, 'description', errors),
+            'priority': parse_choice(data.get('priority'), Priority, 'priority', errors, Priority.MEDIUM.value),
+            'status': parse_choice(data.get('status'), Status, 'status', errors, Status.TODO.value),
+            'labels': parse_labels(data.get('labels')),
+            'assigned_to': str(data.get('assigned_to') or '').strip(),
+        }
+
+        if kind == 'backlog':
+            cleaned['story_points'] = parse_points(data.get('story_points'), BACKLOG_POINTS, errors)
+            due_date = str(data.get('due_date') or '').strip()
+            try:
+                cleaned['due_date'] = date.fromisoformat(due_date) if due_date else None
+            except ValueError:
+                errors.append(('due_date', f'Fecha inválida: {due_date}'))
+        else:
+            cleaned['story_points'] = parse_points(data.get('story_points'), STORY_POINTS, errors)
+            cleaned['as_a'] = parse_text(data, 'as_a', errors, max_length=255, required=True)
+            cleaned['i_want'] = parse_text(data, 'i_want', errors, max_length=255, required=True)
+            cleaned['so_that'] = parse_text(data, 'so_that', errors, max_length=255, required=True)
+            cleaned['acceptance_criteria'] = parse_text(data, 'acceptance_criteria', errors)
+            cleaned['epic'] = parse_text(data, 'epic', errors, max_length=100)
+            if not cleaned['description']:
+                errors.append(('description', 'Este campo es obligatorio'))
+        return cleaned, errors
+
+    def write_rows(self, job, rows):
+        from apps.backlog.infrastructure.audit import backlog_item_audit
+        from apps.backlog.infrastructure.labels import backlog_item_labels
+        from apps.shared.domain.models import AuditEntry
+        if not rows:
+            return 0
+
+        items = []
+        for row in rows:
+            points = row['story_points']
+            items.append(BacklogItem(
+                title=row['title'],
+                description=row['description'],
+                priority=row['priority'],
+                status=row['status'],
+                assigned_to_id=row['assigned_to_id'],
+                created_by_id=job.created_by_id,
+                due_date=row.get('due_date'),
+                story_points=points if points in BACKLOG_POINTS else None,
+                labels=row['labels'],
+            ))
+        BacklogItem.objects.bulk_create(items, batch_size=self.chunk_size)
+        backlog_item_labels.index_new(items)
+        backlog_item_audit.record(items, AuditEntry.CREATE, actor=job.created_by)
+
+        if job.kind == 'stories':
+            from apps.historias.domain.models import UserStory
+            from apps.historias.infrastructure.labels import user_story_labels
+            stories = UserStory.objects.bulk_create([
+                UserStory(
+                    title=row['title'],
+                    description=row['description'],
+                    as_a=row['as_a'],
+                    i_want=row['i_want'],
+                    so_that=row['so_that'],
+                    acceptance_criteria=row['acceptance_criteria'],
+                    priority=row['priority'],
+                    status=row['status'],
+                    story_points=row['story_points'],
+                    backlog_item=item,
+                    author_id=job.created_by_id,
+                    labels=row['labels'],
+                    epic=row['epic'],
+                )
+                for row, item in zip(rows, items)
+            ], batch_size=self.chunk_size)
+            user_story_labels.index_new(stories)
+        return len(items)
+
+    def log_errors(self, job, errors):
+        available = max(self.max_logged_errors - self.logged_errors, 0)
+        if not errors or not available:
+            return
+        ImportRowError.objects.bulk_create([
+            ImportRowError(job=job, row_number=number, field=field, message=message)
+            for number, field, message in errors[:available]
+        ])
+        self.logged_errors += min(len(errors), available)
+
+
+class BacklogStatsService:
+    """Tarjetas de resumen del backlog calculadas con un único agregado"""
+
+    def stats(self, queryset):
+        todo = Status.TODO.value
+        aggregates = {
+            'total': Count('id'),
+            'points': Coalesce(Sum('story_points'), 0),
+            'ready_for_sprint': Count('id', filter=Q(status=todo, story_points__isnull=False)),
+            'unestimated': Count('id', filter=Q(story_points__isnull=True)),
+        }
+        # Los alias de columna no admiten espacios ('En progreso'): se usan los nombres de los enums
+        for status in Status:
+            aggregates[f'status_{status.name}'] = Count('id', filter=Q(status=status.value))
+        for priority in Priority:
+            aggregates[f'priority_{priority.name}'] = Count('id', filter=Q(priority=priority.value))
+        row = queryset.order_by().aggregate(**aggregates)
+        return {
+            'total': row['total'],
+            'points': row['points'],
+            'ready_for_sprint': row['ready_for_sprint'],
+            'unestimated': row['unestimated'],
+            'by_status': {status.value: row[f'status_{status.name}'] for status in Status},
+            'by_priority': {priority.value: row[f'priority_{priority.name}'] for priority in Priority},
+        }
+
+
+class BacklogHistoryService:
+    """Backlog tal como estaba en un momento dado, reconstruido desde la auditoría"""
+
+    fields = ('title', 'status', 'priority', 'story_points', 'labels', 'assigned_to_id', 'due_date', 'created_at')
+
+    def as_of(self, when, status=None, priority=None, offset=0, limit=100):
+        """
+        Resumen y una página de ítems (por prioridad y antigüedad) en
+        ``when``. Son dos consultas sobre el valor de cada campo en ``when``
+        (la última entrada de auditoría que lo incluye): una agregada con los
+        totales del filtro y otra con la página, sin reconstruir el resto.
+        """
+        from apps.backlog.infrastructure.audit import backlog_item_audit
+
+        states = backlog_item_audit.states(
+            when, state_status='status', state_priority='priority', state_points='story_points',
+            state_created='created_at',
+        )
+        if status is not None:
+            states = states.filter(state_status=status)
+        if priority is not None:
+            states = states.filter(state_priority=priority)
+
+        totals = states.aggregate(
+            total=Count('object_id'),
+            points=Coalesce(Sum(Cast('state_points', IntegerField())), 0),
+            **{
+                f'status_{choice.name}': Count('object_id', filter=Q(state_status=choice.value))
+                for choice in Status
+            },
+        )
+        page = list(
+            states.annotate(state_rank=Case(
+                *[When(state_priority=value, then=Value(rank)) for value, rank in PRIORITY_RANKS.items()],
+                default=Value(len(PRIORITY_RANKS) + 1),
+                output_field=IntegerField(),
+            ))
+            .annotate(**{
+                f'item_{field}': backlog_item_audit.field_at(field, when, as_text=False) for field in self.fields
+            })
+            .order_by('state_rank', 'state_created', 'object_id')
+            .values('object_id', *(f'item_{field}' for field in self.fields))[offset:offset + limit]
+        )
+        return {
+            'as_of': when,
+            'total': totals['total'],
+            'points': totals['points'],
+            'by_status': {choice.value: totals[f'status_{choice.name}'] for choice in Status},
+            'offset': offset,
+            'limit': limit,
+            'items': [
+                {
+                    'id': BacklogItem._meta.pk.to_python(row['object_id']),
+                    **{field: backlog_item_audit.parse(field, row[f'item_{field}']) for field in self.fields},
+                }
+                for row in page
+            ],
+        }
+
+
+class OverdueDigestService:
+    """Resumen diario de ítems vencidos por responsable"""
+
+    # Ítems listados por responsable (los de fecha límite más antigua)
+    preview = 5
+
+    def digests(self, today=None):
+        """
+        Un resumen por responsable activo con totales y los primeros
+        ``preview`` ítems vencidos. Es una sola consulta: las funciones de
+        ventana por responsable calculan los totales sobre todos sus ítems
+        antes de recortar a los primeros de cada uno.
+        """
+        today = today or timezone.localdate()
+        assignee = [F('assigned_to_id')]
+        rows = (
+            BacklogItem.objects.overdue(today)
+            .filter(assigned_to__is_active=True)
+            .annotate(
+                position=Window(RowNumber(), partition_by=assignee, order_by=[F('due_date').asc(), F('id').asc()]),
+                overdue_count=Window(Count('id'), partition_by=assignee),
+                overdue_points=Window(Sum('story_points'), partition_by=assignee),
+                critical_count=Window(Count('id', filter=Q(priority=Priority.CRITICAL.value)), partition_by=assignee),
+            )
+            .filter(position__lte=self.preview)
+            .order_by('assigned_to_id', 'position')
+            .values(
+                'assigned_to_id', 'assigned_to__username', 'assigned_to__email',
+                'id', 'title', 'priority', 'due_date',
+                'overdue_count', 'overdue_points', 'critical_count',
+            )
+        )
+        digests = []
+        for user_id, items in groupby(rows, key=lambda row: row['assigned_to_id']):
+            items = list(items)
+            first = items[0]
+            digests.append({
+                'user_id': user_id,
+                'username': first['assigned_to__username'],
+                'email': first['assigned_to__email'],
+                'total': first['overdue_count'],
+                'points': first['overdue_points'] or 0,
+                'critical': first['critical_count'],
+                'oldest_due_date': first['due_date'],
+                'items': [
+                    {
+                        'id': item['id'],
+                        'title': item['title'],
+                        'priority': item['priority'],
+                        'due_date': item['due_date'],
+                        'days_overdue': (today - item['due_date']).days,
+                    }
+                    for item in items
+                ],
+            })
+        return digests
+
+    def message(self, digest):
+        lines = [
+            f'Hola {digest["username"]}, tienes {digest["total"]} ítems vencidos '
+            f'({digest["points"]} puntos, {digest["critical"]} de prioridad crítica).',
+            '',
+        ]
+        lines += [
+            f'- {item["title"]} ({item["priority"]}): venció hace {item["days_overdue"]} días'
+            for item in digest['items']
+        ]
+        if digest['total'] > len(digest['items']):
+            lines.append(f'... y {digest["total"] - len(digest["items"])} más')
+        return f'Tienes {digest["total"]} ítems vencidos', '\n'.join(lines)
+
+    def send(self, today=None):
+        """Envía por correo los resúmenes de quienes tienen email; retorna cuántos se enviaron"""
+        messages = [
+            (*self.message(digest), settings.DEFAULT_FROM_EMAIL, [digest['email']])
+            for digest in self.digests(today) if digest['email']
+        ]
+        return send_mass_mail(messages, fail_silently=False) if messages else 0
@@ -1,7 +1,18 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class BacklogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.backlog'
     verbose_name = 'Backlog'
+
+    def ready(self):
+        from apps.backlog.infrastructure import activity, realtime, signals  # noqa: F401
+        from apps.backlog.infrastructure.audit import backlog_item_audit
+        from apps.backlog.infrastructure.labels import backlog_item_labels
+        from apps.backlog.infrastructure.search import backlog_item_index
+        post_migrate.connect(backlog_item_index.install_on_migrate, sender=self)
+        post_migrate.connect(backlog_item_labels.install_on_migrate, sender=self)
+        backlog_item_labels.connect()
+        backlog_item_audit.connect()
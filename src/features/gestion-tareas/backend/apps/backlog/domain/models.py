@@ -1,10 +1,30 @@
 from django.db import models
 from django.contrib.auth.models import User
-from apps.shared.domain.entities import BaseEntity
-from apps.shared.domain.value_objects import Priority, Status, StoryPoints
+from django.utils import timezone
+from apps.shared.domain.entities import BaseEntity, SyncsPriorityRank, TracksLoadedValues
+from apps.shared.domain.fields import PriorityRankField
+from apps.shared.domain.value_objects import OPEN_STATUSES, Priority, Status, StoryPoints
 
 
-class BacklogItem(BaseEntity):
+class BacklogItemQuerySet(models.QuerySet):
+    """Consultas de ítems del backlog con el vencimiento resuelto en SQL"""
+
+    def with_overdue(self, today=None):
+        """Anota ``overdue`` en cada ítem; ``is_overdue`` la usa en lugar de calcularlo"""
+        return self.annotate(overdue=models.Case(
+            models.When(
+                status__in=OPEN_STATUSES, due_date__lt=today or timezone.localdate(), then=models.Value(True)
+            ),
+            default=models.Value(False),
+            output_field=models.BooleanField(),
+        ))
+
+    def overdue(self, today=None):
+        """Ítems vencidos, resueltos por el índice (status, due_date)"""
+        return self.filter(status__in=OPEN_STATUSES, due_date__lt=today or timezone.localdate())
+
+
+class BacklogItem(SyncsPriorityRank, TracksLoadedValues, BaseEntity):
     """Modelo de dominio para ítems del backlog"""
     
     title = models.CharField(max_length=255, verbose_name='Título')
@@ -15,6 +35,7 @@ class BacklogItem(BaseEntity):
         default=Priority.MEDIUM.value,
         verbose_name='Prioridad'
     )
+    priority_rank = PriorityRankField()
     status = models.CharField(
         max_length=20,
         choices=[(s.value, s.name) for s in Status],
@@ -44,22 +65,64 @@ class BacklogItem(BaseEntity):
     )
     labels = models.JSONField(default=list, blank=True, verbose_name='Etiquetas')
     
+    objects = BacklogItemQuerySet.as_manager()
+    
     class Meta:
         db_table = 'backlog_items'
         verbose_name = 'Ítem del Backlog'
         verbose_name_plural = 'Ítems del Backlog'
-        ordering = ['-created_at']
+        ordering = ['-created_at', 'id']
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='backlog_items_keyset_idx'),
+            # Cola de abiertos: la condición coincide con el filtro de la cola y el índice da el orden
+            models.Index(
+                fields=['priority_rank', 'created_at', 'id'],
+                condition=models.Q(status__in=OPEN_STATUSES),
+                name='backlog_items_queue_idx',
+            ),
+            models.Index(
+                fields=['status', 'due_date'],
+                condition=models.Q(due_date__isnull=False),
+                name='backlog_items_overdue_idx',
+            ),
+        ]
     
     def __str__(self):
         return self.title
     
     @property
     def is_overdue(self):
-        """Verifica si el ítem está vencido"""
-        if self.due_date and self.status != Status.DONE.value:
-            from datetime import date
-            return self.due_date < date.today()
-        return False
+        """Verifica si el ítem está vencido (con ``with_overdue`` viene calculado desde la consulta)"""
+        overdue = getattr(self, 'overdue', None)
+        if overdue is not None:
+            return overdue
+        return bool(self.due_date) and self.status in OPEN_STATUSES and self.due_date < timezone.localdate()
+
+
+class BacklogItemLabel(BaseEntity):
+    """Pertenencia indexada de una etiqueta a un ítem del backlog, espejo de BacklogItem.labels"""
+    
+    backlog_item = models.ForeignKey(
+        BacklogItem,
+        on_delete=models.CASCADE,
+        related_name='label_memberships',
+        verbose_name='Ítem del Backlog'
+    )
+    name = models.CharField(max_length=100, verbose_name='Etiqueta')
+    
+    class Meta:
+        db_table = 'backlog_item_labels'
+        verbose_name = 'Etiqueta de Ítem del Backlog'
+        verbose_name_plural = 'Etiquetas de Ítems del Backlog'
+        constraints = [
+            models.UniqueConstraint(fields=['backlog_item', 'name'], name='backlog_item_label_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['name', 'backlog_item'], name='backlog_item_labels_name_idx'),
+        ]
+    
+    def __str__(self):
+        return self.name
 
 
 class BacklogComment(BaseEntity):
@@ -84,6 +147,94 @@ class BacklogComment(BaseEntity):
         verbose_name = 'Comentario del Backlog'
         verbose_name_plural = 'Comentarios del Backlog'
         ordering = ['created_at']
+        indexes = [
+            # Páginas del feed de actividad por ítem y por autor
+            models.Index(fields=['backlog_item', 'created_at', 'id'], name='backlog_comments_feed_idx'),
+            models.Index(fields=['author', 'created_at', 'id'], name='backlog_comments_author_idx'),
+        ]
+    
+    def __str__(self):
+        return f'Comentario de {self.author.username} en {self.backlog_item.title}'
+
+
+class ImportJob(BaseEntity):
+    """Modelo de dominio para importaciones masivas de ítems del backlog o historias"""
+    
+    KINDS = [
+        ('backlog', 'Ítems del Backlog'),
+        ('stories', 'Historias de Usuario'),
+    ]
+    
+    FORMATS = [
+        ('csv', 'CSV'),
+        ('ndjson', 'NDJSON'),
+    ]
+    
+    STATUSES = [
+        ('pending', 'Pendiente'),
+        ('running', 'En ejecución'),
+        ('completed', 'Completado'),
+        ('failed', 'Fallido'),
+    ]
+    
+    kind = models.CharField(max_length=20, choices=KINDS, verbose_name='Tipo')
+    format = models.CharField(max_length=10, choices=FORMATS, verbose_name='Formato')
+    status = models.CharField(
+        max_length=20,
+        choices=STATUSES,
+        default='pending',
+        verbose_name='Estado'
+    )
+    source = models.FileField(upload_to='imports/', verbose_name='Archivo')
+    processed_rows = models.IntegerField(default=0, verbose_name='Filas procesadas')
+    created_rows = models.IntegerField(default=0, verbose_name='Filas creadas')
+    error_count = models.IntegerField(default=0, verbose_name='Filas con errores')
+    message = models.TextField(blank=True, verbose_name='Mensaje')
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name='Iniciado en')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='Finalizado en')
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='import_jobs',
+        verbose_name='Creado por'
+    )
+    
+    class Meta:
+        db_table = 'import_jobs'
+        verbose_name = 'Importación'
+        verbose_name_plural = 'Importaciones'
+        ordering = ['-created_at', 'id']
+    
+    def __str__(self):
+        return f'Importación {self.get_kind_display()} ({self.get_status_display()})'
+    
+    @property
+    def is_finished(self):
+        """Verifica si la importación terminó"""
+        return self.status in ('completed', 'failed')
+
+
+class ImportRowError(BaseEntity):
+    """Modelo de dominio para errores por fila de una importación"""
+    
+    job = models.ForeignKey(
+        ImportJob,
+        on_delete=models.CASCADE,
+        related_name='row_errors',
+        verbose_name='Importación'
+    )
+    row_number = models.IntegerField(verbose_name='Fila')
+    field = models.CharField(max_length=100, blank=True, verbose_name='Campo')
+    message = models.TextField(verbose_name='Mensaje')
+    
+    class Meta:
+        db_table = 'import_row_errors'
+        verbose_name = 'Error de Importación'
+        verbose_name_plural = 'Errores de Importación'
+        ordering = ['row_number', 'id']
+        indexes = [
+            models.Index(fields=['job', 'row_number'], name='import_row_errors_job_idx'),
+        ]
     
     def __str__(self):
-        return f'Comentario de {self.author.username} en {self.backlog_item.title}'
\ No newline at end of file
+        return f'Fila {self.row_number}: {self.message}'
@@ -0,0 +1,20 @@
+from apps.backlog.domain.models import BacklogComment
+from apps.shared.infrastructure.activity import ActivitySource, register_activity_source
+
+
+def sprint_items(sprint_id):
+    """Ítems con tarea en el sprint: el feed lee una página de comentarios por ítem"""
+    from apps.sprint.domain.models import SprintTask
+
+    return 'backlog_item_id', list(
+        SprintTask.objects.filter(sprint_id=sprint_id).values_list('backlog_item_id', flat=True)
+    )
+
+
+backlog_comment_activity = register_activity_source(ActivitySource(
+    'backlog_comment',
+    BacklogComment,
+    'backlog_item',
+    {'actor_id': 'author_id', 'target_id': 'backlog_item_id', 'content': 'content'},
+    {'sprint': sprint_items, 'user': lambda user_id: ('author_id', user_id)},
+))
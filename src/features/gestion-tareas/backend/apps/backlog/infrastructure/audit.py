@@ -0,0 +1,5 @@
+from apps.backlog.domain.models import BacklogItem
+from apps.shared.infrastructure.audit import AuditLog, register_audit_log
+
+
+backlog_item_audit = register_audit_log(AuditLog(BacklogItem))
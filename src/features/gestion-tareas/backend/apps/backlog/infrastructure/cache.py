@@ -0,0 +1,4 @@
+from apps.shared.infrastructure.cache import CachedAggregate, register_cached_aggregate
+
+
+backlog_stats_cache = register_cached_aggregate(CachedAggregate('backlog_stats', tags=['backlog']))
@@ -0,0 +1,26 @@
+from apps.shared.infrastructure.export import StreamingExport
+
+
+class BacklogItemExport(StreamingExport):
+    """Exportación de ítems del backlog con su historia de usuario asociada"""
+
+    fields = (
+        'id', 'title', 'description', 'priority', 'status', 'assigned_to',
+        'created_by', 'due_date', 'story_points', 'labels', 'created_at', 'updated_at',
+    )
+    user_fields = ('assigned_to', 'created_by')
+
+    @property
+    def headers(self):
+        return [*self.fields, 'user_story']
+
+    def resolve(self, rows):
+        from apps.historias.domain.models import UserStory
+        rows = super().resolve(rows)
+        stories = dict(
+            UserStory.objects.filter(backlog_item_id__in=[row['id'] for row in rows])
+            .values_list('backlog_item_id', 'id')
+        )
+        for row in rows:
+            row['user_story'] = stories.get(row['id'])
+        return rows
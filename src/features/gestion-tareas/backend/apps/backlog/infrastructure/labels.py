@@ -0,0 +1,10 @@
+from apps.backlog.domain.models import BacklogItem, BacklogItemLabel
+from apps.shared.infrastructure.labels import LabelIndex, register_label_index
+
+
+backlog_item_labels = register_label_index(LabelIndex(
+    model=BacklogItem,
+    membership_model=BacklogItemLabel,
+    owner_field='backlog_item',
+    table='backlog_items',
+))
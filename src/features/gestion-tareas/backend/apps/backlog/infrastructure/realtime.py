@@ -0,0 +1,67 @@
+"""
+Deltas en tiempo real del backlog: ítems y comentarios.
+
+Los cambios de un ítem también llegan a los tableros de sprint que lo
+muestran, porque sus tarjetas usan el título y las etiquetas del ítem.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.backlog.domain.models import BacklogComment, BacklogItem
+from apps.shared.infrastructure.realtime import BACKLOG_CHANNEL, publish
+from apps.sprint.infrastructure.realtime import item_channels
+
+
+def item_delta(item):
+    return {
+        'id': item.pk,
+        'title': item.title,
+        'status': item.status,
+        'priority': item.priority,
+        'assigned_to': item.assigned_to_id,
+        'story_points': item.story_points,
+        'labels': item.labels,
+    }
+
+
+@receiver(post_save, sender=BacklogItem)
+def publish_item_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        publish([BACKLOG_CHANNEL], 'item.added', **item_delta(instance))
+    else:
+        publish([BACKLOG_CHANNEL, *item_channels([instance.pk])], 'item.updated', **item_delta(instance))
+
+
+@receiver(post_delete, sender=BacklogItem)
+def publish_item_deleted(sender, instance, **kwargs):
+    publish([BACKLOG_CHANNEL], 'item.removed', id=instance.pk)
+
+
+@receiver(post_save, sender=BacklogComment)
+def publish_comment_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    publish(
+        [BACKLOG_CHANNEL, *item_channels([instance.backlog_item_id])],
+        'comment.added' if created else 'comment.updated',
+        id=instance.pk, backlog_item=instance.backlog_item_id, author=instance.author_id,
+    )
+
+
+@receiver(post_delete, sender=BacklogComment)
+def publish_comment_deleted(sender, instance, **kwargs):
+    publish(
+        [BACKLOG_CHANNEL, *item_channels([instance.backlog_item_id])],
+        'comment.removed', id=instance.pk, backlog_item=instance.backlog_item_id,
+    )
+
+
+def publish_labels_changed(added, removed, add, remove):
+    """Delta de una edición masiva de etiquetas: ids modificados por operación"""
+    ids = {*added, *removed}
+    if ids:
+        publish(
+            [BACKLOG_CHANNEL, *item_channels(ids)], 'items.labeled',
+            added=added, removed=removed, add=add, remove=remove,
+        )
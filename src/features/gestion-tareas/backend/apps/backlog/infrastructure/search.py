@@ -0,0 +1,7 @@
+from apps.shared.infrastructure.search import SearchIndex, register_search_index
+
+
+backlog_item_index = register_search_index(SearchIndex(
+    table='backlog_items',
+    fields=[('title', 'A'), ('description', 'B')],
+))
@@ -0,0 +1,13 @@
+"""
+Receptores que invalidan los agregados cacheados del backlog.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.backlog.domain.models import BacklogItem
+from apps.shared.infrastructure.cache import invalidate_tags
+
+
+@receiver([post_save, post_delete], sender=BacklogItem)
+def invalidate_backlog_cache(sender, instance, **kwargs):
+    """Los totales del backlog y los tableros muestran datos del ítem"""
+    invalidate_tags('backlog', 'boards')
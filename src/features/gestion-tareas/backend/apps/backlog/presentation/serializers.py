@@ -0,0 +1,74 @@
+from rest_framework import serializers
+from apps.backlog.domain.models import BacklogItem, BacklogComment, ImportJob, ImportRowError
+from apps.shared.domain.value_objects import Priority, Status
+from apps.shared.presentation.serializers import AsOfSerializer
+
+
+class BacklogItemSerializer(serializers.ModelSerializer):
+    """Serializador de ítems del backlog"""
+
+    is_overdue = serializers.BooleanField(read_only=True)
+
+    class Meta:
+        model = BacklogItem
+        fields = [
+            'id', 'title', 'description', 'priority', 'status',
+            'assigned_to', 'created_by', 'due_date', 'story_points',
+            'labels', 'is_overdue', 'created_at', 'updated_at',
+        ]
+        read_only_fields = ['id', 'created_by', 'created_at', 'updated_at']
+
+
+class BacklogCommentSerializer(serializers.ModelSerializer):
+    """Serializador de comentarios del backlog"""
+
+    class Meta:
+        model = BacklogComment
+        fields = ['id', 'backlog_item', 'content', 'author', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'author', 'created_at', 'updated_at']
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    """Serializador de importaciones masivas"""
+
+    class Meta:
+        model = ImportJob
+        fields = [
+            'id', 'kind', 'format', 'status', 'source', 'processed_rows',
+            'created_rows', 'error_count', 'message', 'started_at',
+            'finished_at', 'created_by', 'created_at', 'updated_at',
+        ]
+        read_only_fields = [
+            'id', 'status', 'processed_rows', 'created_rows', 'error_count',
+            'message', 'started_at', 'finished_at', 'created_by',
+            'created_at', 'updated_at',
+        ]
+        extra_kwargs = {'format': {'required': False}}
+
+    def validate(self, attrs):
+        if not attrs.get('format'):
+            extension = attrs['source'].name.rsplit('.', 1)[-1].lower()
+            if extension in ('ndjson', 'jsonl'):
+                attrs['format'] = 'ndjson'
+            elif extension == 'csv':
+                attrs['format'] = 'csv'
+            else:
+                raise serializers.ValidationError({'format': 'No se pudo deducir el formato del archivo'})
+        return attrs
+
+
+class ImportRowErrorSerializer(serializers.ModelSerializer):
+    """Serializador de errores por fila de una importación"""
+
+    class Meta:
+        model = ImportRowError
+        fields = ['id', 'row_number', 'field', 'message']
+
+
+class BacklogAsOfSerializer(AsOfSerializer):
+    """Filtros y página del backlog en un momento (?at=&status=&priority=&offset=&limit=)"""
+
+    status = serializers.ChoiceField(choices=[status.value for status in Status], required=False)
+    priority = serializers.ChoiceField(choices=[priority.value for priority in Priority], required=False)
+    offset = serializers.IntegerField(min_value=0, default=0)
+    limit = serializers.IntegerField(min_value=1, max_value=500, default=100)
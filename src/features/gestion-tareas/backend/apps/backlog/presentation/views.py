@@ -0,0 +1,171 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from rest_framework import mixins, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.response import Response
+from apps.backlog.application.services import BacklogHistoryService, BacklogStatsService
+from apps.backlog.domain.models import BacklogItem, ImportJob
+from apps.backlog.presentation.serializers import (
+    BacklogAsOfSerializer,
+    BacklogItemSerializer,
+    ImportJobSerializer,
+    ImportRowErrorSerializer,
+)
+from apps.backlog.infrastructure.cache import backlog_stats_cache
+from apps.backlog.infrastructure.export import BacklogItemExport
+from apps.backlog.infrastructure.labels import backlog_item_labels
+from apps.backlog.infrastructure.realtime import publish_labels_changed
+from apps.backlog.infrastructure.search import backlog_item_index
+from apps.shared.domain.value_objects import OPEN_STATUSES
+from apps.shared.infrastructure.cache import invalidate_tags
+from apps.shared.infrastructure.export import EXPORT_FORMATS
+from apps.shared.infrastructure.labels import normalize_labels
+from apps.shared.infrastructure.pagination import KeysetPagination, PriorityPagination
+from apps.shared.infrastructure.realtime import BACKLOG_CHANNEL
+from apps.shared.infrastructure.search import ranked_search
+from apps.shared.presentation.mixins import ConditionalGetMixin
+from apps.shared.presentation.serializers import BulkLabelSerializer
+from apps.shared.presentation.streams import event_stream
+
+
+class BacklogItemViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    """API de ítems del backlog"""
+
+    queryset = BacklogItem.objects.all()
+    serializer_class = BacklogItemSerializer
+    pagination_class = KeysetPagination
+    filterset_fields = ['priority', 'status', 'assigned_to']
+    search_index = backlog_item_index
+    label_index = backlog_item_labels
+    search_fields = ['title', 'description']
+    # Consultas por acción, incluida la autenticación (ver QueryBudgetMiddleware)
+    query_budget = {'list': 6, 'retrieve': 5, 'stats': 6, 'as_of': 6, 'overdue': 6, 'queue': 6}
+
+    def get_queryset(self):
+        # El vencimiento se calcula en la consulta con la fecha de cada petición
+        return super().get_queryset().with_overdue()
+
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
+
+    def perform_update(self, serializer):
+        instance = serializer.save()
+        # La anotación de vencimiento se leyó antes del cambio: is_overdue vuelve a calcularlo
+        vars(instance).pop('overdue', None)
+
+    @action(detail=False)
+    def search(self, request):
+        """Resultados más relevantes para el parámetro q"""
+        queryset = ranked_search(self.get_queryset(), self.search_index, request.query_params.get('q', ''))
+        return Response(self.get_serializer(queryset, many=True).data)
+
+    @action(detail=False)
+    def queue(self, request):
+        """
+        Ítems por prioridad (la más alta primero) y antigüedad; sin ?status,
+        sólo los abiertos (índice parcial de la cola).
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        if 'status' not in request.query_params:
+            queryset = queryset.filter(status__in=OPEN_STATUSES)
+        paginator = PriorityPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        return paginator.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    @action(detail=False)
+    def labels(self, request):
+        """Facetas de etiquetas (nombre y cantidad) para el listado filtrado"""
+        return Response(self.label_index.facets(self.filter_queryset(self.get_queryset())))
+
+    @action(detail=False)
+    def stats(self, request):
+        """Totales para las tarjetas de resumen del backlog, cacheados por filtros"""
+        queryset = self.filter_queryset(self.get_queryset())
+        params = sorted((key, request.query_params.getlist(key)) for key in request.query_params)
+        return Response(backlog_stats_cache.get(params, lambda: BacklogStatsService().stats(queryset)))
+
+    @action(detail=False)
+    def overdue(self, request):
+        """Ítems vencidos (fecha límite pasada y sin terminar), paginados por cursor"""
+        queryset = self.filter_queryset(self.get_queryset().overdue())
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    @action(detail=False, url_path='as-of')
+    def as_of(self, request):
+        """Backlog en el momento ?at=, filtrable por status y priority y paginado con offset y limit"""
+        serializer = BacklogAsOfSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        return Response(BacklogHistoryService().as_of(
+            params['at'],
+            status=params.get('status'),
+            priority=params.get('priority'),
+            offset=params['offset'],
+            limit=params['limit'],
+        ))
+
+    @action(detail=False)
+    def export(self, request):
+        """Descarga el listado filtrado en CSV o NDJSON (?export_format=) en streaming"""
+        format = request.query_params.get('export_format', 'csv')
+        if format not in EXPORT_FORMATS:
+            raise ValidationError({'export_format': f'Formatos disponibles: {", ".join(EXPORT_FORMATS)}'})
+        return BacklogItemExport().response(self.filter_queryset(self.get_queryset()), format, 'backlog')
+
+    @action(detail=False, methods=['post'], url_path='bulk-labels')
+    def bulk_labels(self, request):
+        """Agrega y/o quita etiquetas de muchos objetos con un UPDATE por operación"""
+        serializer = BulkLabelSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids, add, remove = (serializer.validated_data[key] for key in ('ids', 'add', 'remove'))
+        try:
+            with transaction.atomic():
+                added = self.label_index.bulk_add(ids, add) if add else []
+                removed = self.label_index.bulk_remove(ids, remove) if remove else []
+                invalidate_tags('backlog', 'boards')
+                publish_labels_changed(added, removed, normalize_labels(add), normalize_labels(remove))
+        except DjangoValidationError as exc:
+            raise ValidationError({'ids': exc.messages})
+        return Response({'added': len(added), 'removed': len(removed)})
+
+
+class ImportRowErrorPagination(KeysetPagination):
+    """Errores de importación en orden de fila"""
+
+    ordering = ('row_number', 'id')
+
+
+class ImportJobViewSet(mixins.CreateModelMixin,
+                       mixins.ListModelMixin,
+                       mixins.RetrieveModelMixin,
+                       viewsets.GenericViewSet):
+    """API de importaciones masivas; el archivo se procesa en segundo plano"""
+
+    serializer_class = ImportJobSerializer
+    pagination_class = KeysetPagination
+    parser_classes = [MultiPartParser, FormParser]
+    filterset_fields = ['kind', 'status']
+
+    def get_queryset(self):
+        return ImportJob.objects.filter(created_by=self.request.user)
+
+    def perform_create(self, serializer):
+        from apps.backlog.tasks import run_import
+        job = serializer.save(created_by=self.request.user)
+        transaction.on_commit(lambda: run_import.delay(str(job.pk)))
+
+    @action(detail=True)
+    def errors(self, request, pk=None):
+        """Errores por fila de la importación, paginados por número de fila"""
+        job = self.get_object()
+        paginator = ImportRowErrorPagination()
+        page = paginator.paginate_queryset(job.row_errors.all(), request, view=self)
+        return paginator.get_paginated_response(ImportRowErrorSerializer(page, many=True).data)
+
+
+async def backlog_events(request):
+    """Deltas del backlog (ítems, checklists, comentarios y etiquetas) por SSE"""
+    return await event_stream(request, [BACKLOG_CHANNEL])
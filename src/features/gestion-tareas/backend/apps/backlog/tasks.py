@@ -0,0 +1,19 @@
+from celery import shared_task
+
+from apps.backlog.application.services import ImportService, OverdueDigestService
+from apps.backlog.domain.models import ImportJob
+
+
+@shared_task
+def run_import(job_id):
+    """Ejecuta una importación pendiente fuera del ciclo de la petición"""
+    job = ImportJob.objects.filter(pk=job_id, status='pending').first()
+    if job is None:
+        return
+    ImportService().run(job)
+
+
+@shared_task
+def send_overdue_digests():
+    """Envía a cada responsable el resumen de sus ítems vencidos"""
+    return OverdueDigestService().send()
@@ -0,0 +1,569 @@
+import csv
+import datetime
+import io
+import json
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.backlog.application.services import ImportService, OverdueDigestService
+from apps.backlog.domain.models import BacklogItem, BacklogItemLabel, ImportJob
+from apps.backlog.infrastructure.cache import backlog_stats_cache
+from apps.backlog.infrastructure.search import backlog_item_index
+from apps.historias.domain.models import UserStory
+from apps.shared.domain.value_objects import Priority, Status, priority_rank
+from apps.shared.infrastructure.search import ranked_search
+
+
+class BacklogConditionalGetTests(TestCase):
+    """El listado responde 304 con un validador de la página, sin contar ni recorrer toda la tabla"""
+
+    url = '/api/v1/backlog/items/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        today = timezone.localdate()
+        cls.items = [
+            BacklogItem.objects.create(title=f'Ítem {index}', created_by=cls.user, due_date=today)
+            for index in range(3)
+        ]
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def get(self, etag=None, **params):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.client.get(self.url, params, HTTP_ACCEPT='application/json', **headers)
+
+    def test_unchanged_page_is_not_modified_without_counting(self):
+        etag = self.get()['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get(etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse([query['sql'] for query in queries if 'COUNT(' in query['sql'].upper()])
+
+    def test_edit_and_delete_on_the_page_change_the_etag(self):
+        etag = self.get()['ETag']
+        item = BacklogItem.objects.get(pk=self.items[0].pk)
+        item.title = 'Editado'
+        item.save()
+        response = self.get(etag)
+        self.assertEqual(response.status_code, 200)
+
+        etag = response['ETag']
+        BacklogItem.objects.filter(pk=self.items[1].pk).delete()
+        self.assertEqual(self.get(etag).status_code, 200)
+
+    def test_etag_changes_with_the_date(self):
+        response = self.get()
+        self.assertFalse(any(item['is_overdue'] for item in response.json()['results']))
+
+        tomorrow = timezone.localdate() + datetime.timedelta(days=1)
+        with mock.patch('django.utils.timezone.localdate', return_value=tomorrow):
+            response = self.get(response['ETag'])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(all(item['is_overdue'] for item in response.json()['results']))
+
+    def test_requested_count_is_part_of_the_validator(self):
+        # La primera página de un ítem muestra el más reciente; se elimina el más antiguo
+        counted = self.get(with_count='1', page_size='1')['ETag']
+        plain = self.get(page_size='1')['ETag']
+        BacklogItem.objects.filter(pk=self.items[0].pk).delete()
+
+        self.assertEqual(self.get(counted, with_count='1', page_size='1').status_code, 200)
+        self.assertEqual(self.get(plain, page_size='1').status_code, 304)
+
+
+class BacklogKeysetPaginationTests(TestCase):
+    """El listado se recorre por cursor en ambos sentidos, sin saltos ni repetidos"""
+
+    url = '/api/v1/backlog/items/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        cls.items = [BacklogItem.objects.create(title=f'Ítem {index}', created_by=cls.user) for index in range(7)]
+        # Empates en created_at: el id decide el orden dentro del mismo instante
+        BacklogItem.objects.filter(pk__in=[item.pk for item in cls.items[2:5]]).update(
+            created_at=cls.items[2].created_at,
+        )
+        cls.expected = [
+            str(item.pk) for item in BacklogItem.objects.order_by('-created_at', 'id')
+        ]
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def get(self, url=None, **params):
+        response = self.client.get(url or self.url, params, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def walk(self, page, direction):
+        pages = [[row['id'] for row in page['results']]]
+        while page[direction]:
+            page = self.get(page[direction])
+            pages.append([row['id'] for row in page['results']])
+        return pages, page
+
+    def test_forward_and_backward_walks_cover_every_row_once(self):
+        pages, last = self.walk(self.get(page_size='3'), 'next')
+        self.assertEqual([pk for page in pages for pk in page], self.expected)
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+
+        pages, first = self.walk(last, 'previous')
+        self.assertEqual([pk for page in reversed(pages) for pk in page], self.expected)
+        self.assertIsNone(first['previous'])
+
+    def test_rows_created_while_walking_do_not_shift_the_pages(self):
+        page = self.get(page_size='3')
+        BacklogItem.objects.create(title='Nuevo', created_by=self.user)
+
+        pages, _ = self.walk(page, 'next')
+
+        self.assertEqual([pk for page in pages for pk in page], self.expected)
+
+    def test_count_only_when_requested(self):
+        self.assertNotIn('count', self.get())
+        self.assertEqual(self.get(with_count='1')['count'], len(self.items))
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get(self.url, {'cursor': 'no-es-un-cursor'}, HTTP_ACCEPT='application/json')
+
+        self.assertEqual(response.status_code, 404)
+
+
+class BacklogSearchIndexTests(TestCase):
+    """El índice de texto completo sigue a las filas por su id, también después de un VACUUM"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        cls.first = BacklogItem.objects.create(title='Migrar facturación', created_by=cls.user)
+        cls.second = BacklogItem.objects.create(title='Revisar facturas', created_by=cls.user)
+        cls.other = BacklogItem.objects.create(title='Ajustar permisos', created_by=cls.user)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def search(self, query):
+        return ranked_search(BacklogItem.objects.all(), backlog_item_index, query)
+
+    def test_search_follows_updates_and_deletes(self):
+        self.other.title = 'Permisos de facturación'
+        self.other.save()
+        self.first.delete()
+
+        self.assertEqual({item.pk for item in self.search('facturación')}, {self.other.pk})
+        self.assertFalse(self.search('migrar'))
+
+    def test_rebuild_keeps_matches_on_their_rows(self):
+        backlog_item_index.backend(connection).rebuild()
+
+        self.assertEqual([item.pk for item in self.search('permisos')], [self.other.pk])
+
+    def test_list_filter_keeps_the_list_order(self):
+        response = self.client.get(
+            '/api/v1/backlog/items/', {'search': 'factur'}, HTTP_ACCEPT='application/json',
+        )
+
+        ids = [row['id'] for row in response.json()['results']]
+        self.assertCountEqual(ids, [str(self.first.pk), str(self.second.pk)])
+
+
+class BacklogSearchVacuumTests(TransactionTestCase):
+    """VACUUM puede renumerar el rowid implícito de una tabla con clave UUID"""
+
+    def test_matches_survive_rowid_renumbering(self):
+        user = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        items = [BacklogItem.objects.create(title=f'Tarea {index}', created_by=user) for index in range(5)]
+        target = BacklogItem.objects.create(title='Conciliar pagos', created_by=user)
+        items[0].delete()
+        with connection.cursor() as cursor:
+            # Lo que VACUUM puede hacer con las filas de una tabla sin INTEGER PRIMARY KEY
+            cursor.execute('UPDATE backlog_items SET rowid = rowid + 1000')
+            cursor.execute('VACUUM')
+
+        found = ranked_search(BacklogItem.objects.all(), backlog_item_index, 'conciliar')
+
+        self.assertEqual([item.pk for item in found], [target.pk])
+
+
+class BacklogLabelIndexTests(TestCase):
+    """Filtro y facetas de etiquetas sobre la tabla de pertenencia sincronizada con el JSON"""
+
+    url = '/api/v1/backlog/items/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        cls.api = BacklogItem.objects.create(title='API', created_by=cls.user, labels=['backend', ' api ', 'api'])
+        cls.web = BacklogItem.objects.create(title='Web', created_by=cls.user, labels=['frontend'])
+        cls.both = BacklogItem.objects.create(title='Ambos', created_by=cls.user, labels=['backend', 'frontend'])
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def ids(self, **params):
+        response = self.client.get(self.url, params, HTTP_ACCEPT='application/json')
+        return {row['id'] for row in response.json()['results']}
+
+    def facets(self, **params):
+        response = self.client.get(f'{self.url}labels/', params, HTTP_ACCEPT='application/json')
+        return {row['name']: row['count'] for row in response.json()}
+
+    def test_facets_count_normalized_labels(self):
+        self.assertEqual(self.facets(), {'backend': 2, 'frontend': 2, 'api': 1})
+
+    def test_facets_follow_the_filtered_list(self):
+        self.assertEqual(self.facets(label='frontend'), {'backend': 1, 'frontend': 2})
+
+    def test_filter_by_any_or_all_labels(self):
+        self.assertEqual(
+            self.ids(label=['backend', 'frontend']), {str(self.api.pk), str(self.web.pk), str(self.both.pk)}
+        )
+        self.assertEqual(self.ids(label=['backend', 'frontend'], label_match='all'), {str(self.both.pk)})
+
+    def test_saving_labels_resyncs_the_index(self):
+        self.web.labels = ['backend']
+        self.web.save()
+
+        self.assertEqual(self.facets(), {'backend': 3, 'frontend': 1, 'api': 1})
+
+
+class BacklogBulkLabelTests(TestCase):
+    """Las etiquetas masivas se editan en la base de datos y mantienen el índice al día"""
+
+    url = '/api/v1/backlog/items/bulk-labels/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        cls.tagged = BacklogItem.objects.create(title='Etiquetado', created_by=cls.user, labels=['backend', 'urgente'])
+        cls.plain = BacklogItem.objects.create(title='Sin etiquetas', created_by=cls.user)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def post(self, **data):
+        return self.client.post(self.url, {'ids': [str(self.tagged.pk), str(self.plain.pk)], **data},
+                                content_type='application/json', HTTP_ACCEPT='application/json')
+
+    def labels(self, item):
+        return BacklogItem.objects.get(pk=item.pk).labels
+
+    def members(self, name):
+        return set(BacklogItemLabel.objects.filter(name=name).values_list('backlog_item_id', flat=True))
+
+    def test_add_appends_only_where_missing(self):
+        response = self.post(add=['urgente', 'api'])
+
+        self.assertEqual(response.json(), {'added': 2, 'removed': 0})
+        self.assertEqual(self.labels(self.tagged), ['backend', 'urgente', 'api'])
+        self.assertEqual(self.labels(self.plain), ['urgente', 'api'])
+        self.assertEqual(self.members('urgente'), {self.tagged.pk, self.plain.pk})
+        self.assertEqual(self.post(add=['api']).json(), {'added': 0, 'removed': 0})
+
+    def test_remove_keeps_the_other_labels(self):
+        response = self.post(remove=['urgente'])
+
+        self.assertEqual(response.json(), {'added': 0, 'removed': 1})
+        self.assertEqual(self.labels(self.tagged), ['backend'])
+        self.assertEqual(self.labels(self.plain), [])
+        self.assertEqual(self.members('urgente'), set())
+        self.assertEqual(self.members('backend'), {self.tagged.pk})
+
+    def test_concurrent_label_edits_are_not_lost(self):
+        # Otra escritura agrega una etiqueta después de que el cliente leyó la lista
+        BacklogItem.objects.filter(pk=self.tagged.pk).update(labels=['backend', 'urgente', 'externa'])
+
+        self.post(add=['api'])
+
+        self.assertEqual(self.labels(self.tagged), ['backend', 'urgente', 'externa', 'api'])
+
+    def test_requires_labels_and_valid_ids(self):
+        self.assertEqual(self.post().status_code, 400)
+        response = self.client.post(self.url, {'ids': ['no-es-un-id'], 'add': ['api']},
+                                    content_type='application/json', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(STORAGES={
+    'default': {'BACKEND': 'django.core.files.storage.InMemoryStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+})
+class ImportPipelineTests(TestCase):
+    """Importación por lotes: las filas válidas se crean y las inválidas quedan registradas por fila"""
+
+    url = '/api/v1/backlog/imports/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        cls.dev = User.objects.create_user('luis', 'luis@example.com', 'secreta')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def upload(self, name, content, kind='backlog'):
+        source = SimpleUploadedFile(name, content.encode('utf-8'))
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, {'kind': kind, 'source': source}, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return ImportJob.objects.get(pk=response.json()['id'])
+
+    def test_csv_rows_are_created_and_errors_logged_per_row(self):
+        content = (
+            'title,priority,story_points,labels,assigned_to,due_date\n'
+            'Primero,Alta,3,backend;api,luis,2026-01-31\n'
+            ',Alta,3,,,\n'
+            'Tercero,Urgentísima,40,,nadie,\n'
+            'Cuarto,LOW,,,,\n'
+        )
+        with mock.patch.object(ImportService, 'chunk_size', 2):
+            job = self.upload('items.csv', content)
+
+        self.assertEqual(
+            (job.status, job.format, job.processed_rows, job.created_rows, job.error_count),
+            ('completed', 'csv', 4, 2, 2),
+        )
+        first = BacklogItem.objects.get(title='Primero')
+        self.assertEqual(
+            (first.priority, first.story_points, first.assigned_to, first.due_date),
+            ('Alta', 3, self.dev, datetime.date(2026, 1, 31)),
+        )
+        self.assertEqual(BacklogItem.objects.get(title='Cuarto').priority, 'Baja')
+        self.assertEqual(
+            set(BacklogItemLabel.objects.filter(backlog_item=first).values_list('name', flat=True)), {'backend', 'api'}
+        )
+
+        response = self.client.get(f'{self.url}{job.pk}/errors/', HTTP_ACCEPT='application/json')
+        rows = [row['row_number'] for row in response.json()['results']]
+        fields = {(row['row_number'], row['field']) for row in response.json()['results']}
+        self.assertEqual(rows, [3, 4, 4])
+        self.assertEqual(fields, {(3, 'title'), (4, 'priority'), (4, 'story_points')})
+
+    def test_ndjson_stories_create_their_backlog_items(self):
+        story = {'title': 'Pagar', 'description': 'Pago en línea', 'as_a': 'cliente', 'i_want': 'pagar',
+                 'so_that': 'no hacer fila', 'story_points': 5, 'labels': ['pagos']}
+        content = '\n'.join([json.dumps(story), '{no es json', '', json.dumps(['lista'])]) + '\n'
+
+        job = self.upload('historias.ndjson', content, kind='stories')
+
+        self.assertEqual((job.status, job.created_rows, job.error_count), ('completed', 1, 2))
+        created = UserStory.objects.select_related('backlog_item').get()
+        self.assertEqual((created.title, created.story_points, created.labels), ('Pagar', 5, ['pagos']))
+        self.assertEqual(created.backlog_item.title, 'Pagar')
+        self.assertEqual(list(job.row_errors.values_list('row_number', flat=True)), [2, 4])
+
+    def test_jobs_are_private_to_their_author(self):
+        job = self.upload('items.csv', 'title\nUno\n')
+        self.client.force_login(self.dev)
+
+        response = self.client.get(f'{self.url}{job.pk}/', HTTP_ACCEPT='application/json')
+
+        self.assertEqual(response.status_code, 404)
+
+
+class BacklogExportTests(TestCase):
+    """La exportación resuelve las relaciones por lote: las consultas no crecen con las filas"""
+
+    url = '/api/v1/backlog/items/export/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        cls.dev = User.objects.create_user('luis', 'luis@example.com', 'secreta')
+        cls.item = BacklogItem.objects.create(
+            title='Exportar', created_by=cls.user, assigned_to=cls.dev, labels=['backend', 'api'], story_points=3,
+        )
+        cls.story = UserStory.objects.create(
+            title='Historia', description='', as_a='usuario', i_want='exportar', so_that='analizar',
+            backlog_item=cls.item, author=cls.user,
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def export(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        with CaptureQueriesContext(connection) as queries:
+            content = b''.join(response.streaming_content).decode('utf-8')
+        return response, content, len(queries)
+
+    def test_csv_rows_resolve_users_labels_and_story(self):
+        response, content, _ = self.export()
+
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="backlog.csv"')
+        rows = list(csv.DictReader(io.StringIO(content.lstrip('\ufeff'))))
+        self.assertEqual(len(rows), 1)
+        columns = ('title', 'assigned_to', 'created_by', 'labels', 'story_points', 'user_story')
+        self.assertEqual(
+            {key: rows[0][key] for key in columns},
+            {'title': 'Exportar', 'assigned_to': 'luis', 'created_by': 'ana', 'labels': 'backend;api',
+             'story_points': '3', 'user_story': str(self.story.pk)},
+        )
+
+    def test_ndjson_keeps_labels_as_lists(self):
+        response, content, _ = self.export(export_format='ndjson')
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        row = json.loads(content.splitlines()[0])
+        self.assertEqual((row['labels'], row['due_date'], row['id']), (['backend', 'api'], None, str(self.item.pk)))
+
+    def test_queries_do_not_grow_with_rows(self):
+        _, _, few = self.export()
+        for index in range(20):
+            BacklogItem.objects.create(title=f'Ítem {index}', created_by=self.user, assigned_to=self.dev)
+
+        _, content, many = self.export()
+
+        self.assertEqual(len(content.strip().splitlines()), 22)
+        self.assertEqual(many, few)
+
+    def test_unknown_format_is_rejected(self):
+        response = self.client.get(self.url, {'export_format': 'xlsx'}, HTTP_ACCEPT='application/json')
+
+        self.assertEqual(response.status_code, 400)
+
+
+class OverdueDigestTests(TestCase):
+    """Vencidos resueltos en SQL y un resumen por responsable con totales de todos sus ítems"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.today = datetime.date(2026, 3, 10)
+        cls.ana = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        cls.luis = User.objects.create_user('luis', '', 'secreta')
+        cls.gone = User.objects.create_user('eva', 'eva@example.com', 'secreta', is_active=False)
+
+        def item(title, assignee, days, status=Status.TODO.value, priority=Priority.MEDIUM.value, points=None):
+            due = cls.today - datetime.timedelta(days=days) if days is not None else None
+            return BacklogItem.objects.create(
+                title=title, created_by=cls.ana, assigned_to=assignee, due_date=due,
+                status=status, priority=priority, story_points=points,
+            )
+
+        item('Más antiguo', cls.ana, 9, priority=Priority.CRITICAL.value, points=5)
+        item('Intermedio', cls.ana, 4, status=Status.IN_PROGRESS.value, points=3)
+        item('Reciente', cls.ana, 1)
+        item('Terminado', cls.ana, 20, status=Status.DONE.value)
+        item('Vence hoy', cls.ana, 0)
+        item('Sin fecha', cls.ana, None)
+        item('De alguien sin correo', cls.luis, 2, points=2)
+        item('De alguien inactivo', cls.gone, 3)
+
+    def test_overdue_excludes_done_undated_and_due_today(self):
+        overdue = set(BacklogItem.objects.overdue(self.today).values_list('title', flat=True))
+
+        self.assertEqual(overdue, {
+            'Más antiguo', 'Intermedio', 'Reciente', 'De alguien sin correo', 'De alguien inactivo',
+        })
+
+    def test_digest_totals_cover_items_beyond_the_preview(self):
+        with mock.patch.object(OverdueDigestService, 'preview', 2):
+            digests = {digest['username']: digest for digest in OverdueDigestService().digests(self.today)}
+
+        self.assertEqual(set(digests), {'ana', 'luis'})
+        ana = digests['ana']
+        self.assertEqual((ana['total'], ana['points'], ana['critical']), (3, 8, 1))
+        self.assertEqual([(item['title'], item['days_overdue']) for item in ana['items']],
+                         [('Más antiguo', 9), ('Intermedio', 4)])
+
+    def test_send_mails_only_assignees_with_email(self):
+        sent = OverdueDigestService().send(self.today)
+
+        self.assertEqual(sent, 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['ana@example.com'])
+        self.assertEqual(mail.outbox[0].subject, 'Tienes 3 ítems vencidos')
+
+
+class PriorityQueueTests(TestCase):
+    """La cola ordena por el rango numérico de la prioridad, que se mantiene al guardar"""
+
+    url = '/api/v1/backlog/items/queue/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        cls.items = {
+            title: BacklogItem.objects.create(title=title, created_by=cls.user, priority=priority, status=status)
+            for title, priority, status in [
+                ('Baja', Priority.LOW.value, Status.TODO.value),
+                ('Alta', Priority.HIGH.value, Status.TODO.value),
+                ('Crítica hecha', Priority.CRITICAL.value, Status.DONE.value),
+                ('Media', Priority.MEDIUM.value, Status.IN_PROGRESS.value),
+                ('Crítica', Priority.CRITICAL.value, Status.TODO.value),
+                ('Alta nueva', Priority.HIGH.value, Status.TODO.value),
+            ]
+        }
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def queue(self, **params):
+        response = self.client.get(self.url, params, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return [row['title'] for row in response.json()['results']]
+
+    def test_open_items_by_priority_then_age(self):
+        self.assertEqual(self.queue(), ['Crítica', 'Alta', 'Alta nueva', 'Media', 'Baja'])
+
+    def test_status_filter_includes_done_items(self):
+        self.assertEqual(self.queue(status=Status.DONE.value), ['Crítica hecha'])
+
+    def test_partial_saves_keep_the_rank_in_sync(self):
+        item = self.items['Baja']
+        item.priority = Priority.CRITICAL.value
+        item.save(update_fields=['priority'])
+
+        self.assertEqual(BacklogItem.objects.get(pk=item.pk).priority_rank, priority_rank(Priority.CRITICAL.value))
+        self.assertEqual(self.queue()[:2], ['Baja', 'Crítica'])
+
+
+class BacklogStatsCacheTests(TestCase):
+    """Los totales del backlog se cachean por filtros y se invalidan al confirmar un cambio"""
+
+    url = '/api/v1/backlog/items/stats/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        BacklogItem.objects.create(title='Uno', created_by=cls.user, priority=Priority.HIGH.value)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def total(self, **params):
+        response = self.client.get(self.url, params, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['total']
+
+    def test_cached_until_the_change_commits(self):
+        self.assertEqual(self.total(), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            BacklogItem.objects.create(title='Dos', created_by=self.user)
+            self.assertEqual(self.total(), 1)
+
+        self.assertEqual(self.total(), 2)
+        self.assertEqual(backlog_stats_cache.stats()['misses'], 2)
+
+    def test_each_filter_has_its_own_entry(self):
+        self.assertEqual(self.total(), 1)
+        self.assertEqual(self.total(priority=Priority.LOW.value), 0)
+        self.assertEqual(self.total(), 1)
+
+        self.assertEqual(backlog_stats_cache.stats()['hits'], 1)
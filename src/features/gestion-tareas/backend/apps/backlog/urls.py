@@ -0,0 +1,12 @@
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+from apps.backlog.presentation.views import BacklogItemViewSet, ImportJobViewSet, backlog_events
+
+router = DefaultRouter()
+router.register('items', BacklogItemViewSet, basename='backlog-item')
+router.register('imports', ImportJobViewSet, basename='import-job')
+
+urlpatterns = [
+    path('events/', backlog_events, name='backlog-events'),
+    path('', include(router.urls)),
+]
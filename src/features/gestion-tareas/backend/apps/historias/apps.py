@@ -1,7 +1,20 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class HistoriasConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.historias'
     verbose_name = 'Historias'
+
+    def ready(self):
+        from apps.historias.infrastructure import activity, realtime, signals  # noqa: F401
+        from apps.historias.infrastructure.audit import story_task_audit
+        from apps.historias.infrastructure.labels import user_story_labels
+        from apps.historias.infrastructure.ranking import story_task_ranks
+        from apps.historias.infrastructure.search import user_story_index
+        post_migrate.connect(user_story_index.install_on_migrate, sender=self)
+        post_migrate.connect(user_story_labels.install_on_migrate, sender=self)
+        user_story_labels.connect()
+        story_task_ranks.connect()
+        story_task_audit.connect()
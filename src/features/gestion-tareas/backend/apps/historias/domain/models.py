@@ -1,9 +1,10 @@
 from django.db import models
-from apps.shared.domain.entities import BaseEntity
-from apps.shared.domain.value_objects import Priority, Status, Label
+from apps.shared.domain.entities import BaseEntity, SyncsPriorityRank, TracksLoadedValues
+from apps.shared.domain.fields import PriorityRankField
+from apps.shared.domain.value_objects import OPEN_STATUSES, Priority, Status, Label
 
 
-class UserStory(BaseEntity):
+class UserStory(SyncsPriorityRank, BaseEntity):
     """Entidad UserStory para gestionar historias de usuario"""
     
     title = models.CharField(max_length=255, verbose_name='Título')
@@ -22,6 +23,7 @@ class UserStory(BaseEntity):
         default=Priority.MEDIUM.value,
         verbose_name='Prioridad'
     )
+    priority_rank = PriorityRankField()
     status = models.CharField(
         max_length=20,
         choices=[(s.value, s.name) for s in Status],
@@ -73,7 +75,16 @@ class UserStory(BaseEntity):
         db_table = 'user_stories'
         verbose_name = 'Historia de Usuario'
         verbose_name_plural = 'Historias de Usuario'
-        ordering = ['-created_at']
+        ordering = ['-created_at', 'id']
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='user_stories_keyset_idx'),
+            # Cola de abiertas: la condición coincide con el filtro de la cola y el índice da el orden
+            models.Index(
+                fields=['priority_rank', 'created_at', 'id'],
+                condition=models.Q(status__in=OPEN_STATUSES),
+                name='user_stories_queue_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.get_priority_display()}"
@@ -99,13 +110,41 @@ class UserStory(BaseEntity):
             self.save(update_fields=['status'])
     
     def add_label(self, label):
-        """Agrega una etiqueta a la historia"""
-        if label not in self.labels:
-            self.labels.append(label)
-            self.save(update_fields=['labels'])
+        """Agrega una etiqueta a la historia con un UPDATE atómico en la base de datos"""
+        from apps.historias.infrastructure.labels import user_story_labels
+        name = Label(label).name
+        user_story_labels.bulk_add([self.pk], [name])
+        if name not in self.labels:
+            self.labels.append(name)
 
 
-class StoryTask(BaseEntity):
+class UserStoryLabel(BaseEntity):
+    """Pertenencia indexada de una etiqueta a una historia, espejo de UserStory.labels"""
+    
+    story = models.ForeignKey(
+        'historias.UserStory',
+        on_delete=models.CASCADE,
+        related_name='label_memberships',
+        verbose_name='Historia de Usuario'
+    )
+    name = models.CharField(max_length=100, verbose_name='Etiqueta')
+    
+    class Meta:
+        db_table = 'user_story_labels'
+        verbose_name = 'Etiqueta de Historia'
+        verbose_name_plural = 'Etiquetas de Historias'
+        constraints = [
+            models.UniqueConstraint(fields=['story', 'name'], name='user_story_label_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['name', 'story'], name='user_story_labels_name_idx'),
+        ]
+    
+    def __str__(self):
+        return self.name
+
+
+class StoryTask(TracksLoadedValues, BaseEntity):
     """Entidad StoryTask para gestionar tareas dentro de una historia de usuario"""
     
     story = models.ForeignKey(
@@ -153,13 +192,19 @@ class StoryTask(BaseEntity):
     started_at = models.DateTimeField(null=True, blank=True, verbose_name='Iniciado en')
     completed_at = models.DateTimeField(null=True, blank=True, verbose_name='Completado en')
     
-    order = models.IntegerField(default=0, verbose_name='Orden')
+    rank = models.CharField(max_length=255, blank=True, default='', verbose_name='Orden')
+    # Orden manual anterior a ``rank``: se conserva para no perder el orden de las filas
+    # existentes; ``rebalance_ranks`` lo usa para asignarles sus primeras claves
+    order = models.IntegerField(default=0, verbose_name='Orden anterior')
     
     class Meta:
         db_table = 'story_tasks'
         verbose_name = 'Tarea de Historia'
         verbose_name_plural = 'Tareas de Historia'
-        ordering = ['order', 'created_at']
+        ordering = ['rank', 'created_at']
+        indexes = [
+            models.Index(fields=['story', 'rank', 'created_at'], name='story_tasks_rank_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.story.title[:30]}"
@@ -176,6 +221,11 @@ class StoryTask(BaseEntity):
             return min(int((self.actual_hours / self.estimated_hours) * 100), 100)
         return 0
     
+    def move_between(self, before=None, after=None):
+        """Reordena la tarea dentro de su historia entre dos tareas (por id)"""
+        from apps.historias.infrastructure.ranking import story_task_ranks
+        return story_task_ranks.move(self, before, after)
+    
     def start_task(self):
         """Inicia la tarea"""
         if self.status == Status.TODO.value:
@@ -222,6 +272,11 @@ class StoryComment(BaseEntity):
         verbose_name = 'Comentario de Historia'
         verbose_name_plural = 'Comentarios de Historia'
         ordering = ['created_at']
+        indexes = [
+            # Páginas del feed de actividad por historia y por autor
+            models.Index(fields=['story', 'created_at', 'id'], name='story_comments_feed_idx'),
+            models.Index(fields=['author', 'created_at', 'id'], name='story_comments_author_idx'),
+        ]
     
     def __str__(self):
         return f"Comentario de {self.author.username} en {self.story.title[:30]}"
\ No newline at end of file
@@ -0,0 +1,32 @@
+from apps.historias.domain.models import StoryComment, UserStory
+from apps.historias.infrastructure.audit import story_task_audit
+from apps.shared.infrastructure.activity import ActivitySource, TransitionSource, register_activity_source
+
+
+def sprint_stories(sprint_id):
+    return list(
+        UserStory.objects.filter(backlog_item__sprint_tasks__sprint_id=sprint_id).values_list('pk', flat=True)
+    )
+
+
+story_comment_activity = register_activity_source(ActivitySource(
+    'story_comment',
+    StoryComment,
+    'user_story',
+    {'actor_id': 'author_id', 'target_id': 'story_id', 'content': 'content', 'is_internal': 'is_internal'},
+    {
+        'sprint': lambda sprint_id: ('story_id', sprint_stories(sprint_id)),
+        'user': lambda user_id: ('author_id', user_id),
+    },
+))
+
+# Las entradas de auditoría guardan como contenedor la historia de la tarea
+story_task_activity = register_activity_source(TransitionSource(
+    'story_task_transition',
+    story_task_audit,
+    'story_task',
+    {
+        'sprint': lambda sprint_id: ('container_id', [str(pk) for pk in sprint_stories(sprint_id)]),
+        'user': lambda user_id: ('actor_id', user_id),
+    },
+))
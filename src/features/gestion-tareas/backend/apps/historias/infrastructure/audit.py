@@ -0,0 +1,5 @@
+from apps.historias.domain.models import StoryTask
+from apps.shared.infrastructure.audit import AuditLog, register_audit_log
+
+
+story_task_audit = register_audit_log(AuditLog(StoryTask, container='story'))
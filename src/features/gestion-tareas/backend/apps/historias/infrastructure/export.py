@@ -0,0 +1,12 @@
+from apps.shared.infrastructure.export import StreamingExport
+
+
+class UserStoryExport(StreamingExport):
+    """Exportación de historias de usuario"""
+
+    fields = (
+        'id', 'title', 'description', 'as_a', 'i_want', 'so_that',
+        'acceptance_criteria', 'priority', 'status', 'story_points',
+        'backlog_item', 'author', 'labels', 'epic', 'created_at', 'updated_at',
+    )
+    user_fields = ('author',)
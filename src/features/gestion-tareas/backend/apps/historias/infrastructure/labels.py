@@ -0,0 +1,10 @@
+from apps.historias.domain.models import UserStory, UserStoryLabel
+from apps.shared.infrastructure.labels import LabelIndex, register_label_index
+
+
+user_story_labels = register_label_index(LabelIndex(
+    model=UserStory,
+    membership_model=UserStoryLabel,
+    owner_field='story',
+    table='user_stories',
+))
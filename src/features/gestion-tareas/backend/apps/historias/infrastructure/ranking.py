@@ -0,0 +1,5 @@
+from apps.historias.domain.models import StoryTask
+from apps.shared.infrastructure.ranking import RankIndex, register_rank_index
+
+
+story_task_ranks = register_rank_index(RankIndex(StoryTask, ('story_id',), seed_ordering=('order',)))
@@ -0,0 +1,76 @@
+"""
+Deltas en tiempo real de las historias: tareas, comentarios y etiquetas.
+
+Se publican en el canal del backlog; los tableros que muestran el ítem de
+la historia reciben además un aviso para refrescar su checklist.
+"""
+from collections import defaultdict
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.historias.domain.models import StoryComment, StoryTask
+from apps.shared.domain.signals import tasks_status_changed
+from apps.shared.infrastructure.realtime import BACKLOG_CHANNEL, publish, sprint_channel, task_change
+from apps.sprint.domain.models import SprintTask
+
+
+def publish_checklist_changed(story_ids):
+    """Avisa a los tableros que muestran el ítem de cada historia (una consulta)"""
+    items_by_sprint = defaultdict(list)
+    rows = (
+        SprintTask.objects.filter(backlog_item__user_story__in=story_ids)
+        .order_by().values_list('sprint_id', 'backlog_item_id').distinct()
+    )
+    for sprint_id, item_id in rows:
+        items_by_sprint[sprint_id].append(item_id)
+    for sprint_id, item_ids in items_by_sprint.items():
+        publish([sprint_channel(sprint_id)], 'checklist.changed', backlog_items=item_ids)
+
+
+@receiver(post_save, sender=StoryTask)
+def publish_story_task_saved(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    change = task_change(created, update_fields, 'story')
+    data = {'id': instance.pk, 'story': instance.story_id, 'status': instance.status, 'rank': instance.rank}
+    if change in ('added', 'updated'):
+        data.update(title=instance.title, assigned_to=instance.assigned_to_id)
+    publish([BACKLOG_CHANNEL], f'story_task.{change}', **data)
+    if change != 'moved':
+        publish_checklist_changed([instance.story_id])
+
+
+@receiver(post_delete, sender=StoryTask)
+def publish_story_task_deleted(sender, instance, **kwargs):
+    publish([BACKLOG_CHANNEL], 'story_task.removed', id=instance.pk, story=instance.story_id)
+    publish_checklist_changed([instance.story_id])
+
+
+@receiver(tasks_status_changed, sender=StoryTask)
+def publish_story_tasks_transitioned(sender, tasks, to_status, **kwargs):
+    ids_by_story = defaultdict(list)
+    for task in tasks:
+        ids_by_story[task.story_id].append(task.pk)
+    for story_id, ids in ids_by_story.items():
+        publish([BACKLOG_CHANNEL], 'story_tasks.transitioned', story=story_id, ids=ids, status=to_status)
+    publish_checklist_changed(list(ids_by_story))
+
+
+@receiver(post_save, sender=StoryComment)
+def publish_comment_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    publish(
+        [BACKLOG_CHANNEL], 'story_comment.added' if created else 'story_comment.updated',
+        id=instance.pk, story=instance.story_id, author=instance.author_id, is_internal=instance.is_internal,
+    )
+
+
+@receiver(post_delete, sender=StoryComment)
+def publish_comment_deleted(sender, instance, **kwargs):
+    publish([BACKLOG_CHANNEL], 'story_comment.removed', id=instance.pk, story=instance.story_id)
+
+
+def publish_labels_changed(added, removed, add, remove):
+    """Delta de una edición masiva de etiquetas de historias"""
+    if added or removed:
+        publish([BACKLOG_CHANNEL], 'stories.labeled', added=added, removed=removed, add=add, remove=remove)
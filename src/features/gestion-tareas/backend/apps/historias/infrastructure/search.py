@@ -0,0 +1,13 @@
+from apps.shared.infrastructure.search import SearchIndex, register_search_index
+
+
+user_story_index = register_search_index(SearchIndex(
+    table='user_stories',
+    fields=[
+        ('title', 'A'),
+        ('i_want', 'B'),
+        ('as_a', 'C'),
+        ('so_that', 'C'),
+        ('acceptance_criteria', 'D'),
+    ],
+))
@@ -0,0 +1,20 @@
+"""
+Receptores que invalidan los agregados cacheados que dependen de las historias.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.historias.domain.models import StoryTask
+from apps.shared.domain.signals import tasks_status_changed
+from apps.shared.infrastructure.cache import invalidate_tags
+
+
+@receiver([post_save, post_delete], sender=StoryTask)
+def invalidate_board_cache(sender, instance, **kwargs):
+    """Los checklists de los tableros cuentan las tareas de historia"""
+    invalidate_tags('boards')
+
+
+@receiver(tasks_status_changed, sender=StoryTask)
+def invalidate_board_cache_on_bulk_transition(sender, tasks, **kwargs):
+    """La transición masiva es un UPDATE sin post_save: también cambia los checklists"""
+    invalidate_tags('boards')
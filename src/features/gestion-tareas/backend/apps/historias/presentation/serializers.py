@@ -0,0 +1,18 @@
+from rest_framework import serializers
+from apps.historias.domain.models import UserStory
+
+
+class UserStorySerializer(serializers.ModelSerializer):
+    """Serializador de historias de usuario"""
+
+    full_story = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = UserStory
+        fields = [
+            'id', 'title', 'description', 'as_a', 'i_want', 'so_that',
+            'full_story', 'acceptance_criteria', 'priority', 'status',
+            'story_points', 'backlog_item', 'author', 'labels', 'epic',
+            'created_at', 'updated_at',
+        ]
+        read_only_fields = ['id', 'author', 'created_at', 'updated_at']
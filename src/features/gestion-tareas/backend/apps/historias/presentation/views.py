@@ -0,0 +1,116 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+from apps.historias.domain.models import StoryTask, UserStory
+from apps.historias.presentation.serializers import UserStorySerializer
+from apps.historias.infrastructure.export import UserStoryExport
+from apps.historias.infrastructure.labels import user_story_labels
+from apps.historias.infrastructure.realtime import publish_labels_changed
+from apps.historias.infrastructure.search import user_story_index
+from apps.shared.application.services import BulkTransitionService
+from apps.shared.domain.exceptions import ValidationException
+from apps.shared.domain.value_objects import OPEN_STATUSES
+from apps.shared.infrastructure.export import EXPORT_FORMATS
+from apps.shared.infrastructure.labels import normalize_labels
+from apps.shared.infrastructure.pagination import KeysetPagination, PriorityPagination
+from apps.shared.infrastructure.search import ranked_search
+from apps.shared.presentation.mixins import ConditionalGetMixin
+from apps.shared.presentation.serializers import BulkLabelSerializer, BulkTransitionSerializer, MoveSerializer
+
+
+class UserStoryViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    """API de historias de usuario"""
+
+    queryset = UserStory.objects.all()
+    serializer_class = UserStorySerializer
+    pagination_class = KeysetPagination
+    filterset_fields = ['priority', 'status', 'epic']
+    search_index = user_story_index
+    label_index = user_story_labels
+    search_fields = ['title', 'as_a', 'i_want', 'so_that', 'acceptance_criteria']
+
+    def perform_create(self, serializer):
+        serializer.save(author=self.request.user)
+
+    @action(detail=False)
+    def search(self, request):
+        """Resultados más relevantes para el parámetro q"""
+        queryset = ranked_search(self.get_queryset(), self.search_index, request.query_params.get('q', ''))
+        return Response(self.get_serializer(queryset, many=True).data)
+
+    @action(detail=False)
+    def queue(self, request):
+        """
+        Historias por prioridad (la más alta primero) y antigüedad; sin ?status,
+        sólo las abiertas (índice parcial de la cola).
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        if 'status' not in request.query_params:
+            queryset = queryset.filter(status__in=OPEN_STATUSES)
+        paginator = PriorityPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        return paginator.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    @action(detail=False)
+    def labels(self, request):
+        """Facetas de etiquetas (nombre y cantidad) para el listado filtrado"""
+        return Response(self.label_index.facets(self.filter_queryset(self.get_queryset())))
+
+    @action(detail=False)
+    def export(self, request):
+        """Descarga el listado filtrado en CSV o NDJSON (?export_format=) en streaming"""
+        format = request.query_params.get('export_format', 'csv')
+        if format not in EXPORT_FORMATS:
+            raise ValidationError({'export_format': f'Formatos disponibles: {", ".join(EXPORT_FORMATS)}'})
+        return UserStoryExport().response(self.filter_queryset(self.get_queryset()), format, 'historias')
+
+    @action(detail=False, methods=['post'], url_path='bulk-labels')
+    def bulk_labels(self, request):
+        """Agrega y/o quita etiquetas de muchos objetos con un UPDATE por operación"""
+        serializer = BulkLabelSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids, add, remove = (serializer.validated_data[key] for key in ('ids', 'add', 'remove'))
+        try:
+            with transaction.atomic():
+                added = self.label_index.bulk_add(ids, add) if add else []
+                removed = self.label_index.bulk_remove(ids, remove) if remove else []
+                publish_labels_changed(added, removed, normalize_labels(add), normalize_labels(remove))
+        except DjangoValidationError as exc:
+            raise ValidationError({'ids': exc.messages})
+        return Response({'added': len(added), 'removed': len(removed)})
+
+    @action(detail=True, methods=['post'], url_path='tasks/bulk-transition')
+    def bulk_transition(self, request, pk=None):
+        """Cambia el estado de muchas tareas de la historia; retorna los ids que cambiaron"""
+        story = self.get_object()
+        serializer = BulkTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            changed = BulkTransitionService(StoryTask).transition(
+                story.tasks.all(),
+                serializer.validated_data['ids'],
+                serializer.validated_data['status'],
+                user=request.user,
+            )
+        except DjangoValidationError as exc:
+            raise ValidationError({'ids': exc.messages})
+        except ValidationException as exc:
+            raise ValidationError({exc.field or 'non_field_errors': exc.message})
+        return Response({'changed': changed})
+
+    @action(detail=True, methods=['post'], url_path=r'tasks/(?P<task_id>[^/.]+)/move')
+    def move_task(self, request, pk=None, task_id=None):
+        """Reordena una tarea de la historia entre las tareas before y after"""
+        story = self.get_object()
+        task = get_object_or_404(story.tasks.all(), pk=task_id)
+        serializer = MoveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            rank = task.move_between(serializer.validated_data.get('before'), serializer.validated_data.get('after'))
+        except ValidationException as exc:
+            raise ValidationError({exc.field or 'non_field_errors': exc.message})
+        return Response({'id': task.pk, 'rank': rank})
@@ -0,0 +1,90 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from apps.backlog.domain.models import BacklogItem
+from apps.historias.domain.models import StoryTask, UserStory
+
+
+class StoryTaskMoveTests(TestCase):
+    """Las tareas de una historia se reordenan por la API entre dos vecinas"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        cls.story = UserStory.objects.create(
+            title='Historia', description='', as_a='usuario', i_want='ordenar', so_that='priorizar',
+            backlog_item=BacklogItem.objects.create(title='Ítem', created_by=cls.user), author=cls.user,
+        )
+        cls.tasks = [StoryTask.objects.create(story=cls.story, title=f'Tarea {index}') for index in range(3)]
+
+    def test_move_to_the_top_repeatedly_keeps_short_keys(self):
+        self.client.force_login(self.user)
+        first, second, third = self.tasks
+        for task in [third, second, first] * 20:
+            top = self.story.tasks.order_by('rank').first()
+            if top.pk == task.pk:
+                continue
+            response = self.client.post(
+                f'/api/v1/repo/stories/{self.story.pk}/tasks/{task.pk}/move/',
+                {'after': str(top.pk)}, content_type='application/json',
+            )
+            self.assertEqual(response.status_code, 200)
+
+        ranks = list(self.story.tasks.order_by('rank').values_list('pk', 'rank'))
+        self.assertEqual([pk for pk, _ in ranks], [first.pk, second.pk, third.pk])
+        self.assertTrue(all(len(rank) < 8 for _, rank in ranks))
+
+    def test_task_of_another_story_is_not_found(self):
+        self.client.force_login(self.user)
+        other = UserStory.objects.create(
+            title='Otra', description='', as_a='usuario', i_want='x', so_that='y',
+            backlog_item=BacklogItem.objects.create(title='Otro ítem', created_by=self.user), author=self.user,
+        )
+        response = self.client.post(
+            f'/api/v1/repo/stories/{other.pk}/tasks/{self.tasks[0].pk}/move/', {}, content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+class UserStorySearchTests(TestCase):
+    """La acción search/ ordena por relevancia; el filtro ?search= sólo restringe el listado"""
+
+    url = '/api/v1/repo/stories/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        cls.by_criteria = cls.story('Reportes', acceptance_criteria='Se exporta la facturación del mes')
+        cls.story('Facturación electrónica')
+        cls.story('Permisos')
+
+    @classmethod
+    def story(cls, title, acceptance_criteria=''):
+        return UserStory.objects.create(
+            title=title, description='', as_a='usuario', i_want='gestionar', so_that='avanzar',
+            acceptance_criteria=acceptance_criteria, author=cls.user,
+            backlog_item=BacklogItem.objects.create(title=title, created_by=cls.user),
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def titles(self, url, **params):
+        response = self.client.get(url, params, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        return [row['title'] for row in (data['results'] if isinstance(data, dict) else data)]
+
+    def test_search_ranks_title_matches_first_ignoring_accents(self):
+        self.assertEqual(self.titles(f'{self.url}search/', q='facturacion'), ['Facturación electrónica', 'Reportes'])
+
+    def test_list_filter_restricts_without_ranking(self):
+        titles = self.titles(self.url, search='factur')
+
+        self.assertCountEqual(titles, ['Facturación electrónica', 'Reportes'])
+
+    def test_edited_story_is_reindexed(self):
+        self.by_criteria.acceptance_criteria = 'Sin montos'
+        self.by_criteria.save()
+
+        self.assertEqual(self.titles(f'{self.url}search/', q='facturacion'), ['Facturación electrónica'])
@@ -0,0 +1,10 @@
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+from apps.historias.presentation.views import UserStoryViewSet
+
+router = DefaultRouter()
+router.register('stories', UserStoryViewSet, basename='user-story')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
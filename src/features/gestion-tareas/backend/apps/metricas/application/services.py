@@ -0,0 +1,565 @@
+from datetime import timedelta
+from decimal import Decimal
+from math import sqrt
+from django.db import IntegrityError, connection, transaction
+from django.db.models import (
+    Avg, Case, Count, DecimalField, DurationField, ExpressionWrapper, F, FloatField, Max, Q, Sum, Value, When,
+)
+from django.db.models.functions import Abs, Coalesce, Round, TruncDate
+from django.db.models.lookups import GreaterThan
+from django.utils import timezone
+from apps.metricas.domain.models import BurndownSnapshot, SprintMetric, VelocityHistory
+from apps.shared.domain.value_objects import Status
+from apps.sprint.domain.models import Sprint, SprintTask
+
+
+def percentage(numerator, denominator, current_field):
+    """Expresión SQL de numerator * 100 / denominator, conservando el valor si no hay base"""
+    return Case(
+        When(
+            GreaterThan(denominator, 0),
+            then=Round(
+                ExpressionWrapper(numerator * Value(100.0) / denominator, output_field=FloatField()),
+                2,
+            ),
+        ),
+        default=F(current_field),
+        output_field=DecimalField(max_digits=5, decimal_places=2),
+    )
+
+
+class SprintMetricMaterializer:
+    """Mantiene la fila de SprintMetric de cada sprint aplicando deltas por transición"""
+
+    def task_hours(self, task, sign, previous=None):
+        """
+        Duración que la tarea suma (o resta) al promedio: al salir de Hecha se
+        descuenta la que había sumado, calculada con las marcas previas a la
+        transición, que ya no tienen la fecha de finalización.
+        """
+        hours = task.duration_hours
+        if sign < 0 and previous is not None:
+            hours = task.hours_between(previous['started_at'], previous['completed_at'])
+        return Decimal(str(round(hours, 2)))
+
+    def apply_transition(self, task, from_status, to_status, previous=None):
+        """Aplica el efecto de un cambio de estado de una tarea sobre las métricas"""
+        done = Status.DONE.value
+        sign = int(to_status == done) - int(from_status == done)
+        if not sign:
+            return
+        self.apply_delta(
+            task.sprint_id,
+            completed_tasks=sign,
+            completed_story_points=sign * (task.story_points or 0),
+            task_hours=sign * self.task_hours(task, sign, previous),
+            bugs_resolved=sign if task.is_bug else 0,
+        )
+
+    def apply_transitions(self, tasks, from_status, to_status, previous=None):
+        """Aplica un cambio de estado masivo con un único delta por sprint"""
+        done = Status.DONE.value
+        sign = int(to_status == done) - int(from_status == done)
+        if not sign:
+            return
+        previous = previous or {}
+        totals = {}
+        for task in tasks:
+            delta = totals.setdefault(task.sprint_id, {
+                'completed_tasks': 0, 'completed_story_points': 0, 'task_hours': Decimal(0), 'bugs_resolved': 0,
+            })
+            delta['completed_tasks'] += sign
+            delta['completed_story_points'] += sign * (task.story_points or 0)
+            delta['task_hours'] += sign * self.task_hours(task, sign, previous.get(task.pk))
+            delta['bugs_resolved'] += sign if task.is_bug else 0
+        for sprint_id, delta in totals.items():
+            self.apply_delta(sprint_id, **delta)
+
+    def apply_move(self, task, from_sprint_id, to_sprint_id):
+        """Traslada la tarea, con su avance si está terminada, entre las métricas de ambos sprints"""
+        done = int(task.is_completed)
+        hours = self.task_hours(task, 1) if done else Decimal(0)
+        for sprint_id, sign in ((from_sprint_id, -1), (to_sprint_id, 1)):
+            self.apply_delta(
+                sprint_id,
+                total_tasks=sign,
+                completed_tasks=sign * done,
+                completed_story_points=sign * done * (task.story_points or 0),
+                task_hours=sign * hours,
+                bugs_found=sign * int(task.is_bug),
+                bugs_resolved=sign * done * int(task.is_bug),
+                create_missing=sign > 0,
+            )
+
+    def apply_points_change(self, task, from_points, to_points):
+        """Sólo los puntos de una tarea terminada cuentan en las métricas"""
+        if task.is_completed:
+            self.apply_delta(task.sprint_id, completed_story_points=(to_points or 0) - (from_points or 0))
+
+    def apply_delta(self, sprint_id, total_tasks=0, completed_tasks=0, completed_story_points=0,
+                    task_hours=0, bugs_found=0, bugs_resolved=0, create_missing=True):
+        """Aplica un delta y recalcula las tasas derivadas en un único UPDATE"""
+        changes = self.delta_expressions(
+            total_tasks, completed_tasks, completed_story_points, task_hours, bugs_found, bugs_resolved
+        )
+        updated = SprintMetric.objects.filter(sprint_id=sprint_id).update(**changes)
+        if not updated and create_missing:
+            try:
+                with transaction.atomic():
+                    self.seed(sprint_id)
+            except IntegrityError:
+                # Otra transacción creó la fila antes que nosotros
+                SprintMetric.objects.filter(sprint_id=sprint_id).update(**changes)
+
+    def delta_expressions(self, total_tasks=0, completed_tasks=0, completed_story_points=0,
+                          task_hours=0, bugs_found=0, bugs_resolved=0):
+        """Construye las asignaciones SET del UPDATE; todas leen los valores previos de la fila"""
+        new_completed = F('completed_tasks') + completed_tasks
+        new_points = F('completed_story_points') + completed_story_points
+        new_bugs_found = F('bugs_found') + bugs_found
+        new_bugs_resolved = F('bugs_resolved') + bugs_resolved
+        return {
+            'total_tasks': F('total_tasks') + total_tasks,
+            'completed_tasks': new_completed,
+            'completed_story_points': new_points,
+            'actual_velocity': new_points,
+            'bugs_found': new_bugs_found,
+            'bugs_resolved': new_bugs_resolved,
+            'average_task_duration': Case(
+                When(
+                    GreaterThan(new_completed, 0),
+                    then=Round(
+                        ExpressionWrapper(
+                            (F('average_task_duration') * F('completed_tasks') + Value(task_hours))
+                            / new_completed,
+                            output_field=FloatField(),
+                        ),
+                        2,
+                    ),
+                ),
+                default=Value(0),
+                output_field=DecimalField(max_digits=8, decimal_places=2),
+            ),
+            'velocity_variance': percentage(
+                new_points - F('planned_velocity'), F('planned_velocity'), 'velocity_variance'
+            ),
+            'completion_rate': percentage(new_points, F('planned_story_points'), 'completion_rate'),
+            'bug_resolution_rate': percentage(new_bugs_resolved, new_bugs_found, 'bug_resolution_rate'),
+        }
+
+    def seed(self, sprint_id):
+        """Crea la fila de métricas de un sprint a partir de sus contadores y tareas"""
+        sprint = Sprint.objects.get(pk=sprint_id)
+        tasks = SprintTask.objects.filter(sprint_id=sprint_id).order_by()
+        duration = tasks.filter(status=Status.DONE.value).aggregate(
+            value=Avg(ExpressionWrapper(
+                F('completed_at') - Coalesce('started_at', 'created_at'),
+                output_field=DurationField(),
+            ))
+        )['value']
+
+        bugs_found = bugs_resolved = 0
+        for status, labels in tasks.values_list('status', 'backlog_item__labels').iterator():
+            if any(str(label).strip().lower() == 'bug' for label in labels or []):
+                bugs_found += 1
+                bugs_resolved += status == Status.DONE.value
+
+        metric = SprintMetric(
+            sprint=sprint,
+            planned_velocity=sprint.velocity,
+            actual_velocity=sprint.done_points,
+            planned_story_points=sprint.total_points,
+            completed_story_points=sprint.done_points,
+            total_tasks=sprint.total_tasks,
+            completed_tasks=sprint.done_tasks,
+            average_task_duration=round(Decimal(duration.total_seconds() / 3600), 2) if duration else 0,
+            team_size=sprint.members.count(),
+            bugs_found=bugs_found,
+            bugs_resolved=bugs_resolved,
+        )
+        metric.calculate_rates(save=False)
+        metric.save()
+        return metric
+
+
+class BurndownService:
+    """Mantiene y consulta las instantáneas diarias de burndown por sprint"""
+
+    def apply_transition(self, task, from_status, to_status):
+        """Descuenta (o devuelve) el trabajo restante del día al completar una tarea"""
+        done = Status.DONE.value
+        sign = int(to_status == done) - int(from_status == done)
+        if sign:
+            self.apply_delta(
+                task.sprint_id,
+                remaining_points=-sign * (task.story_points or 0),
+                remaining_tasks=-sign,
+            )
+
+    def apply_transitions(self, tasks, from_status, to_status):
+        """Aplica un cambio de estado masivo con una actualización por sprint"""
+        done = Status.DONE.value
+        sign = int(to_status == done) - int(from_status == done)
+        if not sign:
+            return
+        totals = {}
+        for task in tasks:
+            points, count = totals.get(task.sprint_id, (0, 0))
+            totals[task.sprint_id] = (points + (task.story_points or 0), count + 1)
+        for sprint_id, (points, count) in totals.items():
+            self.apply_delta(sprint_id, remaining_points=-sign * points, remaining_tasks=-sign * count)
+
+    def apply_move(self, task, from_sprint_id, to_sprint_id):
+        """Traslada la tarea de la instantánea de hoy de un sprint a la del otro"""
+        points = task.story_points or 0
+        remaining = int(not task.is_completed)
+        for sprint_id, sign in ((from_sprint_id, -1), (to_sprint_id, 1)):
+            self.apply_delta(
+                sprint_id,
+                total_points=sign * points,
+                remaining_points=sign * points * remaining,
+                total_tasks=sign,
+                remaining_tasks=sign * remaining,
+                create_missing=sign > 0,
+            )
+
+    def apply_points_change(self, task, from_points, to_points):
+        """Ajusta el total y, si la tarea está pendiente, lo que resta"""
+        delta = (to_points or 0) - (from_points or 0)
+        self.apply_delta(
+            task.sprint_id, total_points=delta, remaining_points=delta * int(not task.is_completed)
+        )
+
+    def apply_delta(self, sprint_id, total_points=0, remaining_points=0, total_tasks=0, remaining_tasks=0,
+                    create_missing=True):
+        """Aplica un delta a la instantánea de hoy, creándola desde los contadores si falta"""
+        changes = {
+            'total_points': F('total_points') + total_points,
+            'remaining_points': F('remaining_points') + remaining_points,
+            'total_tasks': F('total_tasks') + total_tasks,
+            'remaining_tasks': F('remaining_tasks') + remaining_tasks,
+        }
+        today = timezone.localdate()
+        snapshots = BurndownSnapshot.objects.filter(sprint_id=sprint_id, date=today)
+        if not snapshots.update(**changes) and create_missing:
+            try:
+                with transaction.atomic():
+                    self.snapshot(Sprint.objects.get(pk=sprint_id), today)
+            except IntegrityError:
+                snapshots.update(**changes)
+
+    def snapshot(self, sprint, day):
+        """Crea la instantánea de un día a partir de los contadores actuales del sprint"""
+        return BurndownSnapshot.objects.create(
+            sprint=sprint,
+            date=day,
+            total_points=sprint.total_points,
+            remaining_points=sprint.total_points - sprint.done_points,
+            total_tasks=sprint.total_tasks,
+            remaining_tasks=sprint.total_tasks - sprint.done_tasks,
+        )
+
+    def backfill(self, sprint):
+        """Reconstruye la serie de un sprint a partir de SprintTask.completed_at"""
+        tasks = SprintTask.objects.filter(sprint=sprint).order_by()
+        totals = tasks.aggregate(points=Coalesce(Sum('story_points'), 0), tasks=Count('id'))
+        completed = {
+            row['day']: row
+            for row in tasks.filter(status=Status.DONE.value, completed_at__isnull=False)
+            .annotate(day=TruncDate('completed_at'))
+            .values('day')
+            .annotate(points=Coalesce(Sum('story_points'), 0), tasks=Count('id'))
+        }
+
+        last_day = min(sprint.end_date, timezone.localdate())
+        snapshots = []
+        remaining_points, remaining_tasks = totals['points'], totals['tasks']
+        # Lo completado antes del inicio del sprint cuenta desde el primer día
+        for day, row in completed.items():
+            if day < sprint.start_date:
+                remaining_points -= row['points']
+                remaining_tasks -= row['tasks']
+        day = sprint.start_date
+        while day <= last_day:
+            if day in completed:
+                remaining_points -= completed[day]['points']
+                remaining_tasks -= completed[day]['tasks']
+            snapshots.append(BurndownSnapshot(
+                sprint=sprint,
+                date=day,
+                total_points=totals['points'],
+                remaining_points=remaining_points,
+                total_tasks=totals['tasks'],
+                remaining_tasks=remaining_tasks,
+            ))
+            day += timedelta(days=1)
+
+        with transaction.atomic():
+            BurndownSnapshot.objects.filter(sprint=sprint).delete()
+            BurndownSnapshot.objects.bulk_create(snapshots, batch_size=500)
+        return len(snapshots)
+
+    def series(self, sprint, start=None, end=None):
+        """Retorna la serie ideal y real del sprint en el rango pedido"""
+        start = max(start or sprint.start_date, sprint.start_date)
+        end = min(end or sprint.end_date, sprint.end_date)
+        snapshots = BurndownSnapshot.objects.filter(sprint=sprint).values_list(
+            'date', 'total_points', 'remaining_points', 'remaining_tasks'
+        )
+        rows = list(snapshots.filter(date__range=(start, end)).order_by('date'))
+        # Un rango que empieza en un día sin instantánea arrastra la última anterior
+        if not rows or rows[0][0] > start:
+            previous = snapshots.filter(date__lt=start).order_by('-date').first()
+            if previous:
+                rows.insert(0, previous)
+
+        sprint_days = max((sprint.end_date - sprint.start_date).days, 1)
+        today = timezone.localdate()
+        labels, ideal, real, tasks = [], [], [], []
+        current = None
+        index = 0
+        day = start
+        while day <= end:
+            # Los días sin cambios conservan el último valor conocido
+            while index < len(rows) and rows[index][0] <= day:
+                current = rows[index]
+                index += 1
+            elapsed = (day - sprint.start_date).days
+            total = current[1] if current else (rows[0][1] if rows else sprint.total_points)
+            labels.append(f'Día {elapsed + 1}')
+            ideal.append(round(total * (1 - elapsed / sprint_days), 2))
+            real.append(current[2] if current and day <= today else None)
+            tasks.append(current[3] if current and day <= today else None)
+            day += timedelta(days=1)
+
+        return {'labels': labels, 'ideal': ideal, 'real': real, 'remaining_tasks': tasks}
+
+
+class VelocityHistoryService:
+    """Mantiene el historial de velocidad entre sprints y responde agregados por rango"""
+
+    counter_fields = ('todo_points', 'in_progress_points', 'in_review_points', 'done_points', 'end_date')
+
+    def record(self, sprint):
+        """
+        Registra la velocidad de un sprint cerrado en su lugar del historial,
+        ordenado por fecha de fin como en ``rebuild``, y recalcula las sumas
+        desde ese lugar (en el caso habitual, sólo la fila nueva).
+        """
+        fresh = Sprint.objects.only(*self.counter_fields).get(pk=sprint.pk)
+        velocity, committed = fresh.done_points, fresh.total_points
+
+        with transaction.atomic():
+            self.lock()
+            existing = VelocityHistory.objects.filter(sprint_id=sprint.pk).first()
+            if existing and existing.end_date == fresh.end_date:
+                # Un sprint reabierto y vuelto a cerrar corrige su fila y las sumas posteriores
+                existing.velocity = velocity
+                existing.committed_points = committed
+                existing.save(update_fields=['velocity', 'committed_points'])
+                self.recompute(existing.position)
+                return existing
+            if existing:
+                # Cerrado de nuevo con otra fecha de fin: cambia de lugar
+                existing.delete()
+                self.shift(existing.position + 1, -1)
+
+            position = VelocityHistory.objects.filter(
+                Q(end_date__lt=fresh.end_date) | Q(end_date=fresh.end_date, sprint_id__lt=sprint.pk)
+            ).count() + 1
+            self.shift(position, 1)
+            row = VelocityHistory.objects.create(
+                sprint_id=sprint.pk,
+                position=position,
+                end_date=fresh.end_date,
+                velocity=velocity,
+                committed_points=committed,
+            )
+            self.recompute(min(position, existing.position) if existing else position)
+            row.refresh_from_db(fields=['cumulative_velocity', 'cumulative_squares'])
+            return row
+
+    def lock(self):
+        """
+        Serializa las escrituras del historial hasta el fin de la transacción.
+        Con la tabla vacía un ``select_for_update`` no bloquea ninguna fila y dos
+        cierres simultáneos tomarían la misma posición.
+        """
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                # Excluye a otros escritores (y a sí mismo) sin bloquear las lecturas
+                cursor.execute(
+                    f'LOCK TABLE {connection.ops.quote_name(VelocityHistory._meta.db_table)} '
+                    'IN SHARE ROW EXCLUSIVE MODE'
+                )
+        elif connection.vendor != 'sqlite':
+            # SQLite ya serializa las transacciones de escritura; InnoDB bloquea
+            # también el hueco tras la última fila (next-key lock)
+            list(VelocityHistory.objects.select_for_update().order_by('-position').values_list('pk')[:1])
+
+    def shift(self, from_position, delta):
+        """Desplaza en ``delta`` las posiciones desde ``from_position`` sin chocar con la unicidad"""
+        rows = VelocityHistory.objects.filter(position__gte=from_position)
+        # Un único UPDATE position + delta violaría la restricción fila a fila: primero se
+        # llevan las filas por encima de toda posición existente y luego a su destino
+        offset = (VelocityHistory.objects.aggregate(top=Max('position'))['top'] or 0) + 1
+        if rows.update(position=F('position') + offset):
+            VelocityHistory.objects.filter(position__gte=from_position + offset).update(
+                position=F('position') - offset + delta
+            )
+
+    def rebuild(self):
+        """Reconstruye el historial completo a partir de los sprints cerrados"""
+        sprints = (
+            Sprint.objects.filter(status='completed')
+            .only('id', *self.counter_fields)
+            .order_by('end_date', 'id')
+        )
+        rows = []
+        cumulative_velocity = cumulative_squares = 0
+        for position, sprint in enumerate(sprints.iterator(), start=1):
+            velocity = sprint.done_points
+            cumulative_velocity += velocity
+            cumulative_squares += velocity * velocity
+            rows.append(VelocityHistory(
+                sprint_id=sprint.pk,
+                position=position,
+                end_date=sprint.end_date,
+                velocity=velocity,
+                committed_points=sprint.total_points,
+                cumulative_velocity=cumulative_velocity,
+                cumulative_squares=cumulative_squares,
+            ))
+        with transaction.atomic():
+            VelocityHistory.objects.all().delete()
+            VelocityHistory.objects.bulk_create(rows, batch_size=500)
+        return len(rows)
+
+    def recompute(self, from_position):
+        """Recalcula las sumas acumuladas desde una posición hasta el final"""
+        previous = VelocityHistory.objects.filter(position__lt=from_position).order_by('-position').first()
+        cumulative_velocity = previous.cumulative_velocity if previous else 0
+        cumulative_squares = previous.cumulative_squares if previous else 0
+        rows = list(VelocityHistory.objects.filter(position__gte=from_position).order_by('position'))
+        for row in rows:
+            cumulative_velocity += row.velocity
+            cumulative_squares += row.velocity * row.velocity
+            row.cumulative_velocity = cumulative_velocity
+            row.cumulative_squares = cumulative_squares
+        VelocityHistory.objects.bulk_update(
+            rows, ['cumulative_velocity', 'cumulative_squares'], batch_size=500
+        )
+
+    def history(self, last=6, window=3):
+        """Serie de los últimos N sprints con media móvil y resumen, en O(N + ventana)"""
+        window = max(window, 1)
+        rows = list(
+            VelocityHistory.objects.select_related('sprint')
+            .order_by('-position')[:last + window]
+        )
+        rows.reverse()
+        offset = max(len(rows) - last, 0)
+
+        def cumulative_before(index, distance, field):
+            # Suma acumulada en la posición rows[index].position - distance
+            base = index - distance
+            if base >= 0:
+                return getattr(rows[base], field)
+            return 0
+
+        labels, values, committed, rolling = [], [], [], []
+        for index in range(offset, len(rows)):
+            row = rows[index]
+            size = min(window, row.position)
+            total = row.cumulative_velocity - cumulative_before(index, size, 'cumulative_velocity')
+            labels.append(row.sprint.name)
+            values.append(row.velocity)
+            committed.append(row.committed_points)
+            rolling.append(round(total / size, 2))
+
+        count = len(values)
+        summary = {'count': count, 'average': 0, 'min': None, 'max': None, 'stddev': 0}
+        if count:
+            first = offset
+            total = rows[-1].cumulative_velocity - cumulative_before(first, 1, 'cumulative_velocity')
+            squares = rows[-1].cumulative_squares - cumulative_before(first, 1, 'cumulative_squares')
+            mean = total / count
+            summary.update({
+                'average': round(mean, 2),
+                'min': min(values),
+                'max': max(values),
+                'stddev': round(sqrt(max(squares / count - mean * mean, 0)), 2),
+            })
+
+        return {
+            'labels': labels,
+            'values': values,
+            'committed': committed,
+            'rolling_average': rolling,
+            'summary': summary,
+        }
+
+
+class MetricsSummaryService:
+    """Indicadores promedio de los últimos sprints cerrados frente a la ventana anterior"""
+
+    def summary(self, last=3):
+        sprint_ids = list(
+            Sprint.objects.filter(status='completed').order_by('-end_date', '-id')
+            .values_list('id', flat=True)[:last * 2]
+        )
+        current = self.window(sprint_ids[:last])
+        previous = self.window(sprint_ids[last:])
+        summary = {key: {'value': value, 'previous': previous[key]} for key, value in current.items()}
+        summary['sprints'] = len(sprint_ids[:last])
+        return summary
+
+    def window(self, sprint_ids):
+        row = SprintMetric.objects.filter(sprint_id__in=sprint_ids).aggregate(
+            velocity=Avg('actual_velocity'),
+            completion_rate=Avg('completion_rate'),
+            average_task_duration=Avg('average_task_duration'),
+            variance=Avg(Abs('velocity_variance')),
+        ) if sprint_ids else {}
+
+        def rounded(value):
+            return round(float(value), 2) if value is not None else None
+
+        variance = rounded(row.get('variance'))
+        return {
+            'velocity': rounded(row.get('velocity')),
+            'completion_rate': rounded(row.get('completion_rate')),
+            'average_task_duration': rounded(row.get('average_task_duration')),
+            'estimation_accuracy': round(max(100 - variance, 0), 2) if variance is not None else None,
+        }
+
+
+class TeamMetricsService:
+    """Carga y entrega por responsable en un grupo de sprints, en una consulta agrupada"""
+
+    def team(self, sprint_ids):
+        done = Q(status=Status.DONE.value)
+        rows = (
+            SprintTask.objects.filter(sprint_id__in=sprint_ids)
+            .order_by()
+            .values('assigned_to', 'assigned_to__username')
+            .annotate(
+                tasks=Count('id'),
+                completed_tasks=Count('id', filter=done),
+                points=Coalesce(Sum('story_points'), 0),
+                completed_points=Coalesce(Sum('story_points', filter=done), 0),
+            )
+            .order_by('-completed_points', 'assigned_to__username')
+        )
+        return [
+            {
+                'user': row['assigned_to'],
+                'username': row['assigned_to__username'],
+                'tasks': row['tasks'],
+                'completed_tasks': row['completed_tasks'],
+                'points': row['points'],
+                'completed_points': row['completed_points'],
+                'completion_rate': round(row['completed_tasks'] * 100 / row['tasks'], 2) if row['tasks'] else 0,
+            }
+            for row in rows
+        ]
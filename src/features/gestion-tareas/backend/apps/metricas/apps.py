@@ -5,3 +5,6 @@ class MetricasConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.metricas'
     verbose_name = 'Metricas'
+
+    def ready(self):
+        from apps.metricas.infrastructure import signals  # noqa: F401
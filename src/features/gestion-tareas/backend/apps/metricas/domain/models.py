@@ -117,6 +117,117 @@ class SprintMetric(BaseEntity):
             rate = (self.bugs_resolved / self.bugs_found) * 100
             self.bug_resolution_rate = round(rate, 2)
             self.save(update_fields=['bug_resolution_rate'])
+    
+    def calculate_rates(self, save=True):
+        """Calcula todas las tasas derivadas y las guarda en un único UPDATE"""
+        if self.planned_velocity > 0:
+            variance = ((self.actual_velocity - self.planned_velocity) / self.planned_velocity) * 100
+            self.velocity_variance = round(variance, 2)
+        if self.planned_story_points > 0:
+            rate = (self.completed_story_points / self.planned_story_points) * 100
+            self.completion_rate = round(rate, 2)
+        if self.bugs_found > 0:
+            rate = (self.bugs_resolved / self.bugs_found) * 100
+            self.bug_resolution_rate = round(rate, 2)
+        if save:
+            self.save(update_fields=['velocity_variance', 'completion_rate', 'bug_resolution_rate'])
+
+
+class BurndownSnapshot(BaseEntity):
+    """Entidad BurndownSnapshot con el trabajo restante de un sprint al cierre de cada día"""
+    
+    sprint = models.ForeignKey(
+        'sprint.Sprint',
+        on_delete=models.CASCADE,
+        related_name='burndown_snapshots',
+        verbose_name='Sprint'
+    )
+    
+    date = models.DateField(verbose_name='Fecha')
+    
+    total_points = models.IntegerField(
+        default=0,
+        verbose_name='Puntos Totales'
+    )
+    remaining_points = models.IntegerField(
+        default=0,
+        verbose_name='Puntos Restantes'
+    )
+    total_tasks = models.IntegerField(
+        default=0,
+        verbose_name='Tareas Totales'
+    )
+    remaining_tasks = models.IntegerField(
+        default=0,
+        verbose_name='Tareas Restantes'
+    )
+    
+    class Meta:
+        db_table = 'burndown_snapshots'
+        verbose_name = 'Instantánea de Burndown'
+        verbose_name_plural = 'Instantáneas de Burndown'
+        ordering = ['sprint', 'date']
+        constraints = [
+            models.UniqueConstraint(fields=['sprint', 'date'], name='burndown_snapshot_sprint_date_uniq'),
+        ]
+    
+    def __str__(self):
+        return f"Burndown de {self.sprint.name} al {self.date}"
+    
+    @property
+    def completed_points(self):
+        """Puntos completados hasta la fecha de la instantánea"""
+        return self.total_points - self.remaining_points
+
+
+class VelocityHistory(BaseEntity):
+    """Entidad VelocityHistory con la velocidad de cada sprint cerrado y sus sumas acumuladas"""
+    
+    sprint = models.OneToOneField(
+        'sprint.Sprint',
+        on_delete=models.CASCADE,
+        related_name='velocity_history',
+        verbose_name='Sprint'
+    )
+    
+    position = models.PositiveIntegerField(
+        unique=True,
+        verbose_name='Posición'
+    )
+    
+    end_date = models.DateField(verbose_name='Fecha de Fin')
+    
+    velocity = models.IntegerField(
+        default=0,
+        verbose_name='Velocidad'
+    )
+    committed_points = models.IntegerField(
+        default=0,
+        verbose_name='Puntos Comprometidos'
+    )
+    
+    # Sumas acumuladas hasta esta posición (inclusive) para ventanas en O(1)
+    cumulative_velocity = models.BigIntegerField(
+        default=0,
+        verbose_name='Velocidad Acumulada'
+    )
+    cumulative_squares = models.BigIntegerField(
+        default=0,
+        verbose_name='Cuadrados Acumulados'
+    )
+    
+    class Meta:
+        db_table = 'velocity_history'
+        verbose_name = 'Historial de Velocidad'
+        verbose_name_plural = 'Historial de Velocidad'
+        ordering = ['position']
+        indexes = [
+            # Lugar de un sprint recién cerrado: el mismo orden (fecha de fin, id) que rebuild
+            models.Index(fields=['end_date', 'sprint'], name='velocity_end_date_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Velocidad de {self.sprint.name}: {self.velocity}"
 
 
 class TeamMetric(BaseEntity):
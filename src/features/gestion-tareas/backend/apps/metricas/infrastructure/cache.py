@@ -0,0 +1,7 @@
+from apps.shared.infrastructure.cache import CachedAggregate, register_cached_aggregate
+
+
+burndown_cache = register_cached_aggregate(CachedAggregate('burndown', tags=['metrics']))
+velocity_history_cache = register_cached_aggregate(CachedAggregate('velocity_history', tags=['metrics']))
+metrics_summary_cache = register_cached_aggregate(CachedAggregate('metrics_summary', tags=['metrics']))
+team_metrics_cache = register_cached_aggregate(CachedAggregate('team_metrics', tags=['metrics']))
@@ -0,0 +1,111 @@
+"""
+Receptores que materializan SprintMetric, el burndown y el historial de
+velocidad, e invalidan los agregados cacheados cuando cambian esas filas.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.metricas.domain.models import BurndownSnapshot, SprintMetric, VelocityHistory
+from apps.metricas.application.services import (
+    BurndownService, SprintMetricMaterializer, VelocityHistoryService,
+)
+from apps.shared.domain.signals import tasks_status_changed
+from apps.shared.infrastructure.cache import invalidate_tags
+from apps.sprint.domain.models import Sprint, SprintTask
+from apps.sprint.domain.signals import (
+    sprint_completed, task_moved, task_points_changed, task_status_changed, tasks_rolled_over,
+)
+
+
+@receiver(task_status_changed, sender=SprintTask)
+def materialize_transition(sender, task, from_status, to_status, previous=None, **kwargs):
+    """Aplica el delta de la transición a la fila de métricas del sprint"""
+    SprintMetricMaterializer().apply_transition(task, from_status, to_status, previous)
+    BurndownService().apply_transition(task, from_status, to_status)
+
+
+@receiver(tasks_status_changed, sender=SprintTask)
+def materialize_bulk_transition(sender, tasks, from_status, to_status, previous=None, **kwargs):
+    """Aplica un cambio de estado masivo con un delta por sprint"""
+    SprintMetricMaterializer().apply_transitions(tasks, from_status, to_status, previous)
+    BurndownService().apply_transitions(tasks, from_status, to_status)
+
+
+@receiver(post_save, sender=SprintTask)
+def materialize_created_task(sender, instance, created, raw=False, **kwargs):
+    """Cuenta la tarea nueva en las métricas del sprint"""
+    if created and not raw:
+        SprintMetricMaterializer().apply_delta(
+            instance.sprint_id, total_tasks=1, bugs_found=int(instance.is_bug)
+        )
+        remaining = not instance.is_completed
+        BurndownService().apply_delta(
+            instance.sprint_id,
+            total_points=instance.story_points or 0,
+            remaining_points=(instance.story_points or 0) * remaining,
+            total_tasks=1,
+            remaining_tasks=int(remaining),
+        )
+
+
+@receiver(post_delete, sender=SprintTask)
+def materialize_deleted_task(sender, instance, **kwargs):
+    """Descuenta la tarea eliminada de las métricas del sprint sin crear filas nuevas"""
+    SprintMetricMaterializer().apply_delta(
+        instance.sprint_id, total_tasks=-1, bugs_found=-int(instance.is_bug), create_missing=False
+    )
+    remaining = not instance.is_completed
+    BurndownService().apply_delta(
+        instance.sprint_id,
+        total_points=-(instance.story_points or 0),
+        remaining_points=-(instance.story_points or 0) * remaining,
+        total_tasks=-1,
+        remaining_tasks=-int(remaining),
+        create_missing=False,
+    )
+
+
+@receiver(tasks_rolled_over, sender=Sprint)
+def materialize_rollover(sender, from_sprint_id, to_sprint_id, tasks, **kwargs):
+    """Traslada las tareas pendientes entre las métricas de ambos sprints, un delta por sprint"""
+    count = len(tasks)
+    points = sum(task.story_points or 0 for task in tasks)
+    bugs = sum(task.is_bug for task in tasks)
+    for sprint_id, sign in ((from_sprint_id, -1), (to_sprint_id, 1)):
+        SprintMetricMaterializer().apply_delta(
+            sprint_id, total_tasks=sign * count, bugs_found=sign * bugs, create_missing=sign > 0
+        )
+        BurndownService().apply_delta(
+            sprint_id,
+            total_points=sign * points,
+            remaining_points=sign * points,
+            total_tasks=sign * count,
+            remaining_tasks=sign * count,
+            create_missing=sign > 0,
+        )
+
+
+@receiver(task_moved, sender=SprintTask)
+def materialize_moved_task(sender, task, from_sprint_id, to_sprint_id, **kwargs):
+    """Traslada la tarea entre las métricas y el burndown de ambos sprints, como el traspaso"""
+    SprintMetricMaterializer().apply_move(task, from_sprint_id, to_sprint_id)
+    BurndownService().apply_move(task, from_sprint_id, to_sprint_id)
+
+
+@receiver(task_points_changed, sender=SprintTask)
+def materialize_points_change(sender, task, from_points, to_points, **kwargs):
+    """Aplica la diferencia de puntos de una tarea editada"""
+    SprintMetricMaterializer().apply_points_change(task, from_points, to_points)
+    BurndownService().apply_points_change(task, from_points, to_points)
+
+
+@receiver(sprint_completed, sender=Sprint)
+def record_velocity(sender, sprint, **kwargs):
+    """Agrega el sprint cerrado al historial de velocidad"""
+    VelocityHistoryService().record(sprint)
+
+
+@receiver([post_save, post_delete], sender=SprintMetric)
+@receiver([post_save, post_delete], sender=BurndownSnapshot)
+@receiver([post_save, post_delete], sender=VelocityHistory)
+def invalidate_metrics_cache(sender, instance, **kwargs):
+    invalidate_tags('metrics', f'sprint:{instance.sprint_id}')
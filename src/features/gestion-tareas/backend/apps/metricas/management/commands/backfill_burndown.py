@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from apps.metricas.application.services import BurndownService
+from apps.sprint.domain.models import Sprint
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye las instantáneas diarias de burndown a partir de SprintTask.completed_at'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sprint',
+            action='append',
+            dest='sprint_ids',
+            help='Limita el backfill a un sprint (se puede repetir)',
+        )
+
+    def handle(self, *args, **options):
+        sprints = Sprint.objects.all()
+        if options['sprint_ids']:
+            sprints = sprints.filter(pk__in=options['sprint_ids'])
+
+        service = BurndownService()
+        total = 0
+        for sprint in sprints.iterator():
+            total += service.backfill(sprint)
+        self.stdout.write(self.style.SUCCESS(f'{total} instantáneas de burndown generadas'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from apps.metricas.application.services import VelocityHistoryService
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye el historial de velocidad y sus sumas acumuladas desde los sprints cerrados'
+
+    def handle(self, *args, **options):
+        total = VelocityHistoryService().rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Historial de velocidad reconstruido con {total} sprints'))
@@ -0,0 +1,18 @@
+from rest_framework import serializers
+from apps.metricas.domain.models import SprintMetric
+
+
+class SprintMetricSerializer(serializers.ModelSerializer):
+    """Serializador de métricas de sprint"""
+
+    class Meta:
+        model = SprintMetric
+        fields = [
+            'id', 'sprint', 'planned_velocity', 'actual_velocity', 'velocity_variance',
+            'planned_story_points', 'completed_story_points', 'completion_rate',
+            'total_tasks', 'completed_tasks', 'average_task_duration',
+            'team_size', 'average_tasks_per_member',
+            'bugs_found', 'bugs_resolved', 'bug_resolution_rate',
+            'created_at', 'updated_at',
+        ]
+        read_only_fields = fields
@@ -0,0 +1,121 @@
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from apps.metricas.application.services import (
+    BurndownService, MetricsSummaryService, TeamMetricsService, VelocityHistoryService,
+)
+from apps.metricas.domain.models import SprintMetric
+from apps.metricas.infrastructure.cache import (
+    burndown_cache, metrics_summary_cache, team_metrics_cache, velocity_history_cache,
+)
+from apps.metricas.presentation.serializers import SprintMetricSerializer
+from apps.shared.infrastructure.cache import cached_aggregates
+from apps.sprint.domain.models import Sprint
+
+
+class SprintMetricViewSet(viewsets.ReadOnlyModelViewSet):
+    """API de métricas materializadas por sprint"""
+
+    queryset = SprintMetric.objects.all()
+    serializer_class = SprintMetricSerializer
+    lookup_field = 'sprint'
+    filterset_fields = ['sprint']
+
+
+class SprintBurndownView(APIView):
+    """Serie de burndown ideal y real de un sprint"""
+
+    def get(self, request, sprint_id):
+        sprint = get_object_or_404(Sprint, pk=sprint_id)
+        start = self.get_date_param(request, 'from')
+        end = self.get_date_param(request, 'to')
+        return Response(burndown_cache.get(
+            [sprint.pk, start, end, timezone.localdate()],
+            lambda: BurndownService().series(sprint, start, end),
+            tags=[f'sprint:{sprint.pk}'],
+        ))
+
+    def get_date_param(self, request, name):
+        value = request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ValidationError({name: 'Fecha inválida, se espera AAAA-MM-DD'})
+        return parsed
+
+
+class SprintRangeView(APIView):
+    """Base de las vistas que reciben cantidades de sprints por parámetro"""
+
+    max_sprints = 100
+
+    def get_int_param(self, request, name, default):
+        value = request.query_params.get(name)
+        if not value:
+            return default
+        try:
+            parsed = int(value)
+        except ValueError:
+            parsed = 0
+        if not 1 <= parsed <= self.max_sprints:
+            raise ValidationError({name: f'Debe ser un entero entre 1 y {self.max_sprints}'})
+        return parsed
+
+
+class VelocityHistoryView(SprintRangeView):
+    """Historial de velocidad de los últimos sprints con agregados móviles"""
+
+    def get(self, request):
+        last = self.get_int_param(request, 'last', 6)
+        window = self.get_int_param(request, 'window', 3)
+        return Response(velocity_history_cache.get(
+            [last, window], lambda: VelocityHistoryService().history(last, window), tags=['sprints']
+        ))
+
+
+class MetricsSummaryView(SprintRangeView):
+    """Promedios de los últimos sprints cerrados con la ventana anterior para la tendencia"""
+
+    def get(self, request):
+        last = self.get_int_param(request, 'last', 3)
+        return Response(metrics_summary_cache.get(
+            [last], lambda: MetricsSummaryService().summary(last), tags=['sprints']
+        ))
+
+
+class TeamMetricsView(SprintRangeView):
+    """Tareas y puntos por responsable en un sprint (?sprint=) o en los últimos cerrados (?last=)"""
+
+    def get(self, request):
+        sprint_id = request.query_params.get('sprint')
+        if sprint_id:
+            sprint_ids = [get_object_or_404(Sprint, pk=sprint_id).pk]
+        else:
+            last = self.get_int_param(request, 'last', 3)
+            sprint_ids = list(
+                Sprint.objects.filter(status='completed').order_by('-end_date', '-id')
+                .values_list('id', flat=True)[:last]
+            )
+        return Response(team_metrics_cache.get(
+            sorted(map(str, sprint_ids)),
+            lambda: TeamMetricsService().team(sprint_ids),
+            tags=[f'sprint:{pk}' for pk in sprint_ids],
+        ))
+
+
+class CacheStatsView(APIView):
+    """Aciertos y fallos de cada agregado cacheado, para monitoreo"""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({name: aggregate.stats() for name, aggregate in sorted(cached_aggregates.items())})
@@ -0,0 +1,131 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.backlog.domain.models import BacklogItem
+from apps.metricas.application.services import VelocityHistoryService
+from apps.metricas.domain.models import BurndownSnapshot, SprintMetric, VelocityHistory
+from apps.sprint.domain.models import Sprint, SprintTask
+
+
+class SprintMetricMaterializerTests(TestCase):
+    """Las métricas y el burndown materializados siguen a las tareas que cambian de sprint o de puntos"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        today = timezone.localdate()
+        cls.source, cls.target = [
+            Sprint.objects.create(
+                name=name, goal='Métricas', start_date=today,
+                end_date=today + datetime.timedelta(days=14), created_by=cls.user,
+            )
+            for name in ('Sprint 1', 'Sprint 2')
+        ]
+        cls.pending = cls.task(cls.source, 'Pendiente', 3)
+        cls.done = cls.task(cls.source, 'Terminada', 5, labels=['bug'])
+        cls.done.start_task()
+        cls.done.complete_task()
+        cls.task(cls.target, 'Otra', 2)
+
+    @classmethod
+    def task(cls, sprint, title, points, labels=()):
+        item = BacklogItem.objects.create(title=title, created_by=cls.user, labels=list(labels))
+        return SprintTask.objects.create(sprint=sprint, backlog_item=item, story_points=points)
+
+    def burndown(self, sprint):
+        return BurndownSnapshot.objects.values(
+            'total_points', 'remaining_points', 'total_tasks', 'remaining_tasks'
+        ).get(sprint=sprint, date=timezone.localdate())
+
+    def assertMatchesCounters(self, sprint):
+        sprint.refresh_from_db()
+        metric = SprintMetric.objects.get(sprint=sprint)
+        self.assertEqual(
+            (metric.total_tasks, metric.completed_tasks, metric.completed_story_points),
+            (sprint.total_tasks, sprint.done_tasks, sprint.done_points),
+        )
+        self.assertEqual(self.burndown(sprint), {
+            'total_points': sprint.total_points,
+            'remaining_points': sprint.total_points - sprint.done_points,
+            'total_tasks': sprint.total_tasks,
+            'remaining_tasks': sprint.total_tasks - sprint.done_tasks,
+        })
+
+    def test_move_to_sprint_updates_both_sprints(self):
+        SprintTask.objects.get(pk=self.pending.pk).move_to_sprint(self.target)
+        SprintTask.objects.get(pk=self.done.pk).move_to_sprint(self.target)
+
+        self.assertMatchesCounters(self.source)
+        self.assertMatchesCounters(self.target)
+        self.assertEqual(SprintMetric.objects.get(sprint=self.source).bugs_found, 0)
+        target = SprintMetric.objects.get(sprint=self.target)
+        self.assertEqual((target.bugs_found, target.bugs_resolved), (1, 1))
+
+    def test_points_edit_updates_totals(self):
+        for pk, points in ((self.pending.pk, 8), (self.done.pk, 13)):
+            task = SprintTask.objects.get(pk=pk)
+            task.story_points = points
+            task.save()
+
+        self.assertMatchesCounters(self.source)
+        self.assertEqual(SprintMetric.objects.get(sprint=self.source).completed_story_points, 13)
+        self.assertEqual(self.burndown(self.source)['remaining_points'], 8)
+
+    def test_partial_save_without_points_leaves_totals(self):
+        task = SprintTask.objects.get(pk=self.pending.pk)
+        task.priority = 'Alta'
+        task.save(update_fields=['priority'])
+
+        self.assertMatchesCounters(self.source)
+
+
+class VelocityHistoryTests(TestCase):
+    """El historial ordena los sprints por fecha de fin aunque se cierren en otro orden"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        cls.start = datetime.date(2026, 1, 5)
+
+    def close(self, number, done_points, pending_points=0):
+        end = self.start + datetime.timedelta(days=14 * number)
+        sprint = Sprint.objects.create(
+            name=f'Sprint {number}', goal='Velocidad', start_date=end - datetime.timedelta(days=13),
+            end_date=end, status='active', created_by=self.user,
+        )
+        Sprint.objects.filter(pk=sprint.pk).update(done_points=done_points, todo_points=pending_points)
+        sprint.complete_sprint()
+        return sprint
+
+    def test_out_of_order_closures_keep_the_rolling_window(self):
+        self.close(1, 10)
+        self.close(3, 30, pending_points=5)
+        self.close(2, 20)
+        self.close(4, 40)
+
+        history = VelocityHistoryService().history(last=3, window=2)
+
+        self.assertEqual(history['labels'], ['Sprint 2', 'Sprint 3', 'Sprint 4'])
+        self.assertEqual(history['values'], [20, 30, 40])
+        self.assertEqual(history['committed'], [20, 35, 40])
+        self.assertEqual(history['rolling_average'], [15.0, 25.0, 35.0])
+        self.assertEqual(history['summary'], {'count': 3, 'average': 30.0, 'min': 20, 'max': 40, 'stddev': 8.16})
+
+    def test_reclosing_a_sprint_corrects_the_later_sums(self):
+        first = self.close(1, 10)
+        self.close(2, 20)
+        Sprint.objects.filter(pk=first.pk).update(status='active', done_points=16)
+        Sprint.objects.get(pk=first.pk).complete_sprint()
+
+        recorded = list(VelocityHistory.objects.order_by('position').values_list(
+            'velocity', 'cumulative_velocity', 'cumulative_squares'
+        ))
+        VelocityHistoryService().rebuild()
+        rebuilt = list(VelocityHistory.objects.order_by('position').values_list(
+            'velocity', 'cumulative_velocity', 'cumulative_squares'
+        ))
+        self.assertEqual(recorded, [(16, 16, 256), (20, 36, 656)])
+        self.assertEqual(recorded, rebuilt)
@@ -0,0 +1,18 @@
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+from apps.metricas.presentation.views import (
+    CacheStatsView, MetricsSummaryView, SprintBurndownView, SprintMetricViewSet, TeamMetricsView,
+    VelocityHistoryView,
+)
+
+router = DefaultRouter()
+router.register('sprints', SprintMetricViewSet, basename='sprint-metric')
+
+urlpatterns = [
+    path('sprints/<sprint_id>/burndown/', SprintBurndownView.as_view(), name='sprint-burndown'),
+    path('velocity/', VelocityHistoryView.as_view(), name='velocity-history'),
+    path('summary/', MetricsSummaryView.as_view(), name='metrics-summary'),
+    path('team/', TeamMetricsView.as_view(), name='team-metrics'),
+    path('cache/', CacheStatsView.as_view(), name='cache-stats'),
+    path('', include(router.urls)),
+]
@@ -0,0 +1,112 @@
+import heapq
+from itertools import islice
+from operator import itemgetter
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.shared.domain.exceptions import ValidationException
+from apps.shared.domain.models import AuditEntry
+from apps.shared.domain.signals import tasks_status_changed
+from apps.shared.domain.value_objects import STATUS_TRANSITIONS, Status
+from apps.shared.infrastructure.activity import activity_sources
+from apps.shared.infrastructure.audit import audit_log_for
+from apps.shared.infrastructure.ranking import rank_index_for
+
+
+class BulkTransitionService:
+    """Cambia el estado de muchas tareas con un UPDATE condicional por estado de origen"""
+
+    def __init__(self, model):
+        self.model = model
+
+    def timestamps(self, from_status, to_status, now):
+        """Marcas de tiempo que acompañan a la transición, como expresiones del UPDATE"""
+        changes = {'updated_at': now}
+        if to_status == Status.IN_PROGRESS.value:
+            changes['started_at'] = Coalesce(F('started_at'), now)
+        if to_status == Status.DONE.value:
+            changes['completed_at'] = now
+        elif from_status == Status.DONE.value:
+            changes['completed_at'] = None
+        return changes
+
+    def transition(self, queryset, ids, to_status, user=None):
+        """Aplica la transición a las tareas de ``queryset`` indicadas; retorna los ids cambiados"""
+        if to_status not in STATUS_TRANSITIONS:
+            raise ValidationException(f'Estado desconocido: {to_status}', 'status')
+        sources = [status for status, targets in STATUS_TRANSITIONS.items() if to_status in targets]
+        now = timezone.now()
+        # Si el estado es parte de la columna, las tarjetas pasan al final de la columna destino
+        ranks = rank_index_for(self.model)
+        if ranks is not None and not ranks.moves_with('status'):
+            ranks = None
+
+        changed = []
+        with transaction.atomic():
+            tasks = list(
+                queryset.select_for_update(of=('self',))
+                .filter(pk__in=ids, status__in=sources)
+                .order_by('pk')
+            )
+            for from_status in sources:
+                group = [task for task in tasks if task.status == from_status]
+                if not group:
+                    continue
+                changes = self.timestamps(from_status, to_status, now)
+                if ranks is not None:
+                    new_ranks = ranks.append(group, status=to_status)
+                    changes['rank'] = ranks.rank_expression(new_ranks)
+                self.model.objects.filter(
+                    pk__in=[task.pk for task in group], status=from_status
+                ).update(status=to_status, **changes)
+
+                previous = {
+                    task.pk: {'started_at': task.started_at, 'completed_at': task.completed_at} for task in group
+                }
+                for task in group:
+                    task.status = to_status
+                    task.updated_at = now
+                    if 'started_at' in changes:
+                        task.started_at = task.started_at or now
+                    if 'completed_at' in changes:
+                        task.completed_at = changes['completed_at']
+                    if ranks is not None:
+                        task.rank = new_ranks[task.pk]
+                tasks_status_changed.send(
+                    sender=self.model, tasks=group, from_status=from_status, to_status=to_status,
+                    previous=previous,
+                )
+                changed.extend(group)
+
+            audit = audit_log_for(self.model)
+            if audit is not None:
+                audit.record(
+                    changed, AuditEntry.UPDATE, ['status', 'started_at', 'completed_at', 'rank'],
+                    actor=user, timestamp=now,
+                )
+        return [task.pk for task in changed]
+
+
+class ActivityFeedService:
+    """Línea de tiempo de un sprint o de un usuario fusionando comentarios y transiciones"""
+
+    def page(self, scope, value, position=None, limit=50):
+        """
+        Eventos posteriores a ``position`` (momento, fuente, id), del más
+        reciente al más antiguo. Cada fuente aporta a lo sumo ``limit + 1``
+        filas y se fusionan con un k-way merge; retorna ``(eventos, hay_más)``.
+        """
+        sources = [source for source in activity_sources.values() if source.supports(scope)]
+        streams = [source.rows(scope, value, position, limit + 1) for source in sources]
+        rows = list(islice(heapq.merge(*streams, key=itemgetter(0, 1, 2), reverse=True), limit + 1))
+        events = [activity_sources[row[1]].event(row) for row in rows[:limit]]
+
+        users = User.objects.only('username').in_bulk({event['actor_id'] for event in events if event['actor_id']})
+        for event in events:
+            actor = users.get(event.pop('actor_id'))
+            event['actor'] = {'id': actor.pk, 'username': actor.username} if actor else None
+        return events, len(rows) > limit
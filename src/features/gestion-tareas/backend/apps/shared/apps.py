@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class SharedConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.shared'
+    verbose_name = 'Compartido'
+
+    def ready(self):
+        from apps.shared.infrastructure import audit  # noqa: F401
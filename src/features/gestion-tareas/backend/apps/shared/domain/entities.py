@@ -1,30 +1,69 @@
 """
 Entidades base compartidas del dominio.
 """
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Optional
-from uuid import UUID, uuid4
+from copy import copy
+from uuid import uuid4
 
+from django.db import models
+from django.utils import timezone
 
-@dataclass
-class BaseEntity:
+
+class BaseEntity(models.Model):
     """Entidad base con identificador único."""
-    id: UUID
-    created_at: datetime
-    updated_at: Optional[datetime] = None
-    
-    def __post_init__(self):
-        if self.id is None:
-            self.id = uuid4()
-        if self.created_at is None:
-            self.created_at = datetime.utcnow()
-
-
-@dataclass
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Creado en')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Actualizado en')
+
+    class Meta:
+        abstract = True
+
+
 class AggregateRoot(BaseEntity):
     """Raíz de agregado base."""
-    
+
+    class Meta:
+        abstract = True
+
     def mark_updated(self):
         """Marcar la entidad como actualizada."""
-        self.updated_at = datetime.utcnow()
\ No newline at end of file
+        self.updated_at = timezone.now()
+
+
+class TracksLoadedValues:
+    """
+    Conserva los valores leídos de la base en ``_loaded_values`` para que la
+    auditoría registre sólo los campos que cambiaron al guardar.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Copia de listas y diccionarios (JSONField) para detectar cambios hechos en el lugar
+        instance._loaded_values = {
+            name: copy(value) if isinstance(value, (list, dict)) else value
+            for name, value in zip(field_names, values)
+        }
+        return instance
+
+    def refresh_loaded_values(self, *fields):
+        """Toma como leídos los valores actuales de ``fields`` tras un UPDATE que no pasó por save"""
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            return
+        for name in fields:
+            attname = self._meta.get_field(name).attname
+            value = getattr(self, attname)
+            loaded[attname] = copy(value) if isinstance(value, (list, dict)) else value
+
+
+class SyncsPriorityRank:
+    """
+    Incluye ``priority_rank`` en los guardados parciales que cambian
+    ``priority``; en los completos y en ``bulk_create`` lo calcula el campo.
+    """
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'priority' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'priority_rank'}
+        super().save(*args, **kwargs)
@@ -0,0 +1,33 @@
+"""
+Campos de modelo compartidos.
+"""
+from django.db import models
+
+from apps.shared.domain.value_objects import Priority, priority_rank
+
+
+class PriorityRankField(models.PositiveSmallIntegerField):
+    """
+    Posición numérica de la prioridad del modelo (1 = Crítica) para ordenar
+    e indexar por prioridad. Como ``auto_now``, se recalcula en ``pre_save``,
+    que corre al guardar y en ``bulk_create`` (no en ``update`` ni
+    ``bulk_update``).
+    """
+
+    def __init__(self, *args, source='priority', **kwargs):
+        self.source = source
+        kwargs.setdefault('editable', False)
+        kwargs.setdefault('default', priority_rank(Priority.MEDIUM.value))
+        kwargs.setdefault('verbose_name', 'Orden de prioridad')
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.source != 'priority':
+            kwargs['source'] = self.source
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = priority_rank(getattr(model_instance, self.source))
+        setattr(model_instance, self.attname, value)
+        return value
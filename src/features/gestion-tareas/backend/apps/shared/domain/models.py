@@ -0,0 +1,104 @@
+from django.db import models
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from apps.shared.domain.entities import BaseEntity
+
+
+class AuditEntry(BaseEntity):
+    """Cambio de una fila auditada: la fila completa al crearla y sólo los campos modificados después"""
+
+    CREATE = 1
+    UPDATE = 2
+    DELETE = 3
+    SNAPSHOT = 4
+    CHECKPOINT = 5
+    ACTIONS = [
+        (CREATE, 'Creación'),
+        (UPDATE, 'Modificación'),
+        (DELETE, 'Eliminación'),
+        (SNAPSHOT, 'Estado compactado'),
+        (CHECKPOINT, 'Punto de control'),
+    ]
+    # Acciones que fijan el estado completo del objeto sin depender de las anteriores
+    FULL_STATE = (CREATE, DELETE, SNAPSHOT, CHECKPOINT)
+
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Modelo'
+    )
+    object_id = models.CharField(max_length=64, verbose_name='Objeto')
+    container_id = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        help_text='Sprint o historia del objeto al momento del cambio',
+        verbose_name='Contenedor'
+    )
+    action = models.PositiveSmallIntegerField(choices=ACTIONS, verbose_name='Acción')
+    changes = models.JSONField(default=dict, blank=True, verbose_name='Campos')
+    actor = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Usuario'
+    )
+    timestamp = models.DateTimeField(verbose_name='Momento')
+
+    class Meta:
+        db_table = 'audit_entries'
+        verbose_name = 'Entrada de Auditoría'
+        verbose_name_plural = 'Entradas de Auditoría'
+        indexes = [
+            models.Index(fields=['content_type', 'object_id', 'timestamp'], name='audit_entries_object_idx'),
+            models.Index(fields=['content_type', 'container_id', 'timestamp'], name='audit_entries_container_idx'),
+            models.Index(fields=['timestamp'], name='audit_entries_timestamp_idx'),
+            # Entradas insertadas después de un punto de control (auditoría asíncrona)
+            models.Index(fields=['content_type', 'created_at'], name='audit_entries_inserted_idx'),
+            # Transiciones de estado (modificaciones con status) para el feed de actividad
+            models.Index(
+                fields=['content_type', 'container_id', 'timestamp', 'id'],
+                condition=models.Q(action=2, changes__has_key='status'),
+                name='audit_entries_transition_idx',
+            ),
+            models.Index(
+                fields=['content_type', 'actor', 'timestamp', 'id'],
+                condition=models.Q(action=2, changes__has_key='status'),
+                name='audit_entries_actor_trans_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.get_action_display()} {self.object_id} ({self.timestamp})'
+
+
+class AuditCheckpoint(BaseEntity):
+    """
+    Punto de control de la auditoría de un modelo: en ``timestamp`` se
+    escribió el estado completo de cada objeto con cambios desde el anterior,
+    acumulando las entradas insertadas hasta ``inserted_through``.
+    """
+
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Modelo'
+    )
+    timestamp = models.DateTimeField(verbose_name='Momento')
+    inserted_through = models.DateTimeField(verbose_name='Entradas insertadas hasta')
+    objects_written = models.IntegerField(default=0, verbose_name='Objetos escritos')
+
+    class Meta:
+        db_table = 'audit_checkpoints'
+        verbose_name = 'Punto de Control de Auditoría'
+        verbose_name_plural = 'Puntos de Control de Auditoría'
+        constraints = [
+            models.UniqueConstraint(fields=['content_type', 'timestamp'], name='audit_checkpoint_uniq'),
+        ]
+
+    def __str__(self):
+        return f'{self.content_type} @ {self.timestamp}'
@@ -0,0 +1,88 @@
+"""
+Claves de orden fraccionarias (lexicográficas) para tarjetas reordenables.
+
+Una clave es una fracción en base 36 escrita sin el "0." inicial y sin
+ceros finales, por lo que el orden de las cadenas coincide con el orden
+numérico. Siempre existe una clave entre dos claves distintas, de modo que
+mover una tarjeta sólo reescribe su propia fila.
+"""
+from typing import List, Optional
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+
+# Largo a partir del cual conviene redistribuir las claves del contenedor
+REBALANCE_LENGTH = 32
+
+
+def _midpoint(lower: str, upper: Optional[str]) -> str:
+    """Clave estrictamente entre ``lower`` y ``upper`` (None es el infinito)."""
+    if upper is not None:
+        prefix = 0
+        while prefix < len(upper) and (lower[prefix] if prefix < len(lower) else '0') == upper[prefix]:
+            prefix += 1
+        if prefix:
+            return upper[:prefix] + _midpoint(lower[prefix:], upper[prefix:])
+
+    low = DIGITS.index(lower[0]) if lower else 0
+    high = DIGITS.index(upper[0]) if upper is not None else BASE
+    if high - low > 1:
+        return DIGITS[(low + high) // 2]
+    if upper is not None and len(upper) > 1:
+        return upper[0]
+    return DIGITS[low] + _midpoint(lower[1:], None)
+
+
+def _successor(lower: str) -> str:
+    """Clave corta mayor que ``lower``: avanza el primer dígito que no sea el máximo."""
+    for position, digit in enumerate(lower):
+        if digit != DIGITS[-1]:
+            return lower[:position] + DIGITS[DIGITS.index(digit) + 1]
+    return lower + DIGITS[1]
+
+
+def _predecessor(upper: str) -> str:
+    """Clave corta menor que ``upper``: retrocede el primer dígito mayor que ``1``."""
+    upper = upper.rstrip(DIGITS[0])
+    for position, digit in enumerate(upper):
+        if DIGITS.index(digit) > 1:
+            return upper[:position] + DIGITS[DIGITS.index(digit) - 1]
+    # Sólo ceros y unos (termina en 1): se baja el último y se agrega el dígito máximo
+    return upper[:-1] + DIGITS[0] + DIGITS[-1]
+
+
+def rank_between(before: Optional[str] = None, after: Optional[str] = None) -> str:
+    """Clave para ubicar un elemento entre ``before`` y ``after`` (None = extremo)."""
+    before = before or ''
+    if after is None:
+        # Agregar al final es lo más común; así las claves crecen un dígito cada 35 altas
+        return _successor(before)
+    if after <= before:
+        raise ValueError(f'Claves fuera de orden: {before!r} >= {after!r}')
+    if not before:
+        # Llevar al principio también: el simétrico de agregar al final
+        return _predecessor(after)
+    return _midpoint(before, after)
+
+
+def even_ranks(count: int) -> List[str]:
+    """Claves cortas y equiespaciadas para ``count`` elementos."""
+    width = 1
+    while BASE ** width <= count:
+        width += 1
+    width += 1
+    step = BASE ** width // (count + 1)
+    ranks = []
+    for position in range(1, count + 1):
+        value = position * step
+        digits = []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        ranks.append(''.join(reversed(digits)).rstrip('0'))
+    return ranks
+
+
+def needs_rebalance(rank: str) -> bool:
+    """Indica si la clave creció lo suficiente como para redistribuir."""
+    return len(rank) > REBALANCE_LENGTH
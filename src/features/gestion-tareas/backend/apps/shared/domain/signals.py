@@ -0,0 +1,11 @@
+"""
+Eventos de dominio compartidos.
+"""
+from django.dispatch import Signal
+
+
+# Emitida dentro de la transacción de un cambio de estado masivo, una vez por
+# estado de origen. El emisor es el modelo de tarea; las tareas ya tienen los
+# valores nuevos y ``previous`` guarda, por id, los valores de antes.
+# Argumentos: tasks, from_status, to_status, previous
+tasks_status_changed = Signal()
@@ -22,6 +22,28 @@ class Status(str, Enum):
     DONE = "Hecha"
 
 
+# Estados sin terminar: los vencidos y las colas por prioridad sólo consideran estos
+OPEN_STATUSES = [status.value for status in Status if status != Status.DONE]
+
+
+# Transiciones de estado permitidas para las tareas (origen -> destinos)
+STATUS_TRANSITIONS = {
+    Status.TODO.value: {Status.IN_PROGRESS.value},
+    Status.IN_PROGRESS.value: {Status.TODO.value, Status.IN_REVIEW.value, Status.DONE.value},
+    Status.IN_REVIEW.value: {Status.IN_PROGRESS.value, Status.DONE.value},
+    Status.DONE.value: {Status.IN_PROGRESS.value},
+}
+
+
+# Orden numérico de las prioridades (1 = Crítica): el orden de los textos no sirve para ordenar
+PRIORITY_RANKS = {priority.value: rank for rank, priority in enumerate(Priority, start=1)}
+
+
+def priority_rank(priority) -> int:
+    """Posición de la prioridad; las desconocidas quedan al final"""
+    return PRIORITY_RANKS.get(priority, len(PRIORITY_RANKS) + 1)
+
+
 @dataclass
 class StoryPoints:
     """Objeto de valor para puntos de historia."""
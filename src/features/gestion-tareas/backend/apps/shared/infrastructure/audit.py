@@ -0,0 +1,548 @@
+"""
+Auditoría compacta de los modelos de alta rotación.
+
+En lugar de copiar la fila completa en cada guardado, cada cambio es una
+entrada con sólo los campos modificados; la creación y las instantáneas de
+compactación llevan la fila completa. El estado de un objeto en cualquier
+momento se obtiene acumulando en orden sus entradas hasta ese momento.
+
+Las entradas se juntan durante la transacción y se insertan con un único
+``bulk_create`` al confirmarla; si se revierte (o se revierte el punto de
+guardado en que se registraron) se descartan. Con ``AUDIT_LOG['ASYNC']`` la
+inserción se delega a Celery. La compactación pliega las entradas
+anteriores a ``RETENTION_DAYS`` en una instantánea por objeto.
+
+Para no acumular toda la historia en cada consulta, un trabajo periódico
+escribe puntos de control: el estado completo de cada objeto con cambios
+desde el punto anterior. Así el estado en un momento es, por objeto, su
+última entrada completa hasta el punto de control previo más las entradas
+posteriores hasta ese momento.
+
+Los puntos de control no se toman según el reloj sino según lo insertado:
+cubren las entradas insertadas (``created_at``) hasta la última ya asentada
+(insertada hace más de ``CHECKPOINT_SETTLE`` segundos, cuando su INSERT ya
+se confirmó). Una entrada de un momento ya cubierto insertada después (la
+auditoría asíncrona, una cola de Celery demorada) no se pierde: sólo ese
+objeto se reconstruye desde su historia completa y entra en el punto
+siguiente.
+
+Las filas anteriores a la auditoría no tienen entradas: el primer punto de
+control (o el comando ``seed_audit_log``) les escribe una instantánea en su
+fecha de creación con sus valores actuales, que no cambiaron desde entonces
+(cualquier cambio posterior habría dejado una entrada).
+"""
+import datetime
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from copy import copy
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery, Window
+from django.db.models.fields.json import KT
+from django.db.models.functions import FirstValue, RowNumber
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+from apps.shared.domain.models import AuditCheckpoint, AuditEntry
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ENABLED': True,
+    'ASYNC': False,
+    'BATCH_SIZE': 1000,
+    'RETENTION_DAYS': 365,
+    # Un punto de control cubre las entradas insertadas hace al menos este margen (segundos):
+    # una inserción en curso no puede quedar antes de lo cubierto sin haberse leído
+    'CHECKPOINT_SETTLE': 5,
+}
+
+ENTRY_ROW = ('object_id', 'action', 'changes', 'timestamp')
+
+# Usuario o petición a quien se atribuyen los cambios (la petición se resuelve al registrar)
+_actor = ContextVar('audit_actor', default=None)
+
+
+def audit_settings():
+    return {**DEFAULTS, **getattr(settings, 'AUDIT_LOG', {})}
+
+
+@contextmanager
+def audit_actor(actor):
+    """Atribuye a ``actor`` (usuario o petición) los cambios registrados dentro del bloque"""
+    token = _actor.set(actor)
+    try:
+        yield
+    finally:
+        _actor.reset(token)
+
+
+def user_id(user):
+    return user.pk if getattr(user, 'is_authenticated', False) else None
+
+
+def current_actor_id():
+    actor = _actor.get()
+    return user_id(getattr(actor, 'user', actor))
+
+
+def jsonable(value):
+    """Valor de un campo apto para JSON; ``Field.to_python`` lo revierte al reconstruir"""
+    if value is None or isinstance(value, (bool, int, float, str, list, dict)):
+        return value
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+def insert(rows, batch_size=None):
+    """Inserta filas de entradas (diccionarios serializables) con un bulk_create"""
+    entries = [AuditEntry(**{**row, 'timestamp': parse_datetime(row['timestamp'])}) for row in rows]
+    AuditEntry.objects.bulk_create(entries, batch_size=batch_size or audit_settings()['BATCH_SIZE'])
+    return len(entries)
+
+
+def write(rows):
+    if not rows:
+        return
+    if audit_settings()['ASYNC']:
+        from apps.shared.tasks import write_audit_entries
+        try:
+            write_audit_entries.delay(rows)
+            return
+        except Exception:
+            logger.exception('No se pudo encolar la auditoría; se escribe en línea')
+    insert(rows)
+
+
+class PendingEntries:
+    """Entradas registradas en un mismo punto de guardado, escritas juntas al confirmar"""
+
+    def __init__(self):
+        self.rows = []
+        self.flushed = False
+
+    def flush(self):
+        rows, self.rows = self.rows, []
+        self.flushed = True
+        write(rows)
+
+
+def pending_entries(connection):
+    """
+    Búfer del punto de guardado actual. ``on_commit`` descarta el callback
+    de un punto de guardado revertido y con él sus entradas; un búfer cuyo
+    callback ya no está pendiente (o que ya se escribió) pertenece a una
+    transacción terminada.
+    """
+    registered = [item[1] for item in connection.run_on_commit]
+    buffers = connection.__dict__.setdefault('audit_buffers', {})
+    key = tuple(connection.savepoint_ids)
+    pending = buffers.get(key)
+    if pending is None or pending.flushed or pending.flush not in registered:
+        for stale in [stale for stale, other in buffers.items() if other.flushed or other.flush not in registered]:
+            del buffers[stale]
+        pending = buffers[key] = PendingEntries()
+        transaction.on_commit(pending.flush, robust=True)
+    return pending
+
+
+def enqueue(rows):
+    connection = transaction.get_connection()
+    if connection.in_atomic_block:
+        pending_entries(connection).rows.extend(rows)
+    else:
+        write(rows)
+
+
+def fold(rows):
+    """
+    Acumula entradas ``(objeto, acción, campos, momento)`` ordenadas por
+    objeto y momento. Retorna ``{objeto: [campos, primer momento, último
+    momento]}``, o ``None`` para los objetos eliminados.
+    """
+    states = {}
+    for object_id, action, changes, timestamp in rows:
+        state = states.get(object_id)
+        if action == AuditEntry.DELETE:
+            states[object_id] = None
+        elif action in (AuditEntry.CREATE, AuditEntry.SNAPSHOT) or state is None:
+            states[object_id] = [dict(changes), timestamp, timestamp]
+        else:
+            state[0].update(changes)
+            state[2] = timestamp
+    return states
+
+
+class AuditLog:
+    """Auditoría de un modelo; ``container`` es la FK que agrupa sus filas (sprint, historia)"""
+
+    # La fecha de modificación se deduce del momento de cada entrada y el orden de prioridad, de priority
+    exclude = ('updated_at', 'priority_rank')
+
+    def __init__(self, model, container=None, exclude=None):
+        self.model = model
+        self.container = model._meta.get_field(container).attname if container else None
+        if exclude is not None:
+            self.exclude = tuple(exclude)
+
+    @property
+    def label(self):
+        return self.model._meta.label
+
+    @property
+    def content_type(self):
+        return ContentType.objects.get_for_model(self.model)
+
+    @cached_property
+    def fields(self):
+        return [
+            field for field in self.model._meta.concrete_fields
+            if not field.primary_key and field.name not in self.exclude
+        ]
+
+    def connect(self):
+        post_save.connect(self.record_save, sender=self.model, weak=False, dispatch_uid=f'audit:{self.label}')
+        post_delete.connect(self.record_delete, sender=self.model, weak=False, dispatch_uid=f'audit:{self.label}')
+
+    def entries(self):
+        return AuditEntry.objects.filter(content_type=self.content_type)
+
+    def select(self, names):
+        """Campos auditados entre ``names`` (nombres o attnames)"""
+        names = set(names)
+        return [field for field in self.fields if field.name in names or field.attname in names]
+
+    def values(self, instance, fields=None):
+        return {field.attname: jsonable(field.value_from_object(instance)) for field in fields or self.fields}
+
+    def container_of(self, instance):
+        value = getattr(instance, self.container) if self.container else None
+        return '' if value is None else str(value)
+
+    def changed_fields(self, instance, update_fields=None):
+        """Campos a registrar: los de ``update_fields`` (o todos) cuyo valor difiere del leído"""
+        fields = self.fields if update_fields is None else self.select(update_fields)
+        loaded = getattr(instance, '_loaded_values', None)
+        if loaded is None:
+            return fields
+        return [
+            field for field in fields
+            if field.attname not in loaded or loaded[field.attname] != field.value_from_object(instance)
+        ]
+
+    def remember(self, instance):
+        """Actualiza los valores de referencia tras guardar para que el próximo guardado sólo vea lo nuevo"""
+        loaded = getattr(instance, '_loaded_values', None) or {}
+        for field in self.fields:
+            value = field.value_from_object(instance)
+            loaded[field.attname] = copy(value) if isinstance(value, (list, dict)) else value
+        instance._loaded_values = loaded
+
+    def record(self, instances, action, fields=None, actor=None, timestamp=None):
+        """
+        Registra un cambio de cada instancia; ``fields`` limita los campos de
+        una modificación (p. ej. tras un UPDATE en bloque). Sin ``actor`` se
+        usa el de la petición en curso.
+        """
+        if not instances or not audit_settings()['ENABLED']:
+            return
+        if fields is not None:
+            fields = self.select(fields)
+            if not fields:
+                return
+        content_type_id = self.content_type.pk
+        actor_id = user_id(actor) if actor is not None else current_actor_id()
+        when = (timestamp or timezone.now()).isoformat()
+        enqueue([
+            {
+                'content_type_id': content_type_id,
+                'object_id': str(instance.pk),
+                'container_id': self.container_of(instance),
+                'action': action,
+                'changes': {} if action == AuditEntry.DELETE else self.values(instance, fields),
+                'actor_id': actor_id,
+                'timestamp': when,
+            }
+            for instance in instances
+        ])
+
+    def record_save(self, sender, instance, created, update_fields=None, raw=False, **kwargs):
+        if raw:
+            return
+        if created:
+            self.record([instance], AuditEntry.CREATE)
+        else:
+            fields = self.changed_fields(instance, update_fields)
+            if fields:
+                self.record([instance], AuditEntry.UPDATE, [field.name for field in fields])
+        self.remember(instance)
+
+    def record_delete(self, sender, instance, **kwargs):
+        self.record([instance], AuditEntry.DELETE)
+
+    def restore(self, object_id, state):
+        """Instancia (sin guardar) con los campos acumulados de ``fold``"""
+        values, created, modified = state
+        instance = self.model(**{
+            field.attname: field.to_python(values[field.attname])
+            for field in self.fields if field.attname in values
+        })
+        instance.pk = self.model._meta.pk.to_python(object_id)
+        instance.updated_at = modified
+        instance._state.adding = False
+        return instance
+
+    def last_checkpoint(self, when):
+        """``(momento, insertadas hasta)`` del último punto de control hasta ``when``"""
+        return (
+            AuditCheckpoint.objects.filter(content_type=self.content_type, timestamp__lte=when)
+            .order_by('-timestamp').values_list('timestamp', 'inserted_through').first()
+        )
+
+    def late_entries(self, entries, checkpoint):
+        """Entradas de momentos cubiertos por el punto de control que no acumuló: insertadas después de lo cubierto"""
+        timestamp, inserted_through = checkpoint
+        return entries.filter(timestamp__lte=timestamp, created_at__gt=inserted_through).exclude(
+            action=AuditEntry.CHECKPOINT
+        )
+
+    def reconstruct(self, when, containers=None, object_ids=None):
+        """
+        Estado en ``when`` de los objetos de ``containers`` (o de ``object_ids``,
+        o de todos), indexado por id; omite los que no existían o estaban
+        eliminados. Con un punto de control previo es una sola lectura: la
+        última entrada completa de cada objeto hasta el punto de control y las
+        entradas posteriores hasta ``when``, acumuladas en una pasada. Los
+        objetos con entradas tardías se acumulan desde su historia completa.
+        """
+        entries = self.entries()
+        if containers is not None:
+            containers = {str(container) for container in containers}
+            entries = entries.filter(object_id__in=(
+                entries.filter(container_id__in=containers, timestamp__lte=when).values('object_id')
+            ))
+        elif object_ids is not None:
+            entries = entries.filter(object_id__in=[str(pk) for pk in object_ids])
+
+        checkpoint = self.last_checkpoint(when)
+        if checkpoint is None:
+            rows = entries.filter(timestamp__lte=when)
+        else:
+            late = self.late_entries(entries, checkpoint).values('object_id')
+            base = (
+                entries.filter(action__in=AuditEntry.FULL_STATE, timestamp__lte=checkpoint[0])
+                .annotate(latest=Window(
+                    RowNumber(), partition_by=[F('object_id')], order_by=[F('timestamp').desc(), F('pk').desc()],
+                ))
+                .filter(latest=1)
+                .values('pk')
+            )
+            covered = entries.filter(
+                Q(pk__in=base) | Q(timestamp__gt=checkpoint[0], timestamp__lte=when)
+            ).exclude(object_id__in=late)
+            # El punto de control de un objeto con entradas tardías no las incluye: se ignora
+            history = entries.filter(object_id__in=late, timestamp__lte=when).exclude(action=AuditEntry.CHECKPOINT)
+            rows = covered | history
+        # En cada objeto la base (hasta el punto de control) queda antes que sus entradas posteriores
+        rows = rows.order_by('object_id', 'timestamp', 'pk').values_list(*ENTRY_ROW)
+
+        instances = {
+            object_id: self.restore(object_id, state)
+            for object_id, state in fold(rows).items() if state is not None
+        }
+        if containers is not None:
+            instances = {
+                object_id: instance for object_id, instance in instances.items()
+                if self.container_of(instance) in containers
+            }
+        return instances
+
+    def field_at(self, field, when, as_text=True):
+        """
+        Valor de ``field`` en ``when`` del objeto de la fila externa: el de su
+        última entrada que lo incluye, como texto para filtrar y ordenar o,
+        con ``as_text=False``, los campos de esa entrada (ver ``parse``). Los
+        puntos de control no cuentan: una entrada tardía puede ser anterior.
+        """
+        attname = self.model._meta.get_field(field).attname
+        return Subquery(
+            self.entries().filter(object_id=OuterRef('object_id'), timestamp__lte=when, changes__has_key=attname)
+            .exclude(action=AuditEntry.CHECKPOINT)
+            .order_by('-timestamp', '-pk').values_list(KT(f'changes__{attname}') if as_text else 'changes')[:1]
+        )
+
+    def parse(self, field, changes):
+        """Valor de Python de ``field`` en los campos de una entrada leída con ``field_at(as_text=False)``"""
+        field = self.model._meta.get_field(field)
+        return field.to_python((changes or {}).get(field.attname))
+
+    def states(self, when, **fields):
+        """
+        Una fila por objeto existente en ``when`` con su ``object_id`` y, por
+        cada alias de ``fields``, el valor del campo en ``when``: una consulta
+        para filtrar, contar, ordenar y paginar en la base sin reconstruir los
+        objetos. Un objeto existe si su última creación, instantánea o
+        eliminación hasta ``when`` no es una eliminación.
+        """
+        latest = [F('timestamp').desc(), F('pk').desc()]
+        return (
+            self.entries()
+            .filter(action__in=(AuditEntry.CREATE, AuditEntry.SNAPSHOT, AuditEntry.DELETE), timestamp__lte=when)
+            .annotate(
+                latest=Window(RowNumber(), partition_by=[F('object_id')], order_by=latest),
+                last_action=Window(FirstValue('action'), partition_by=[F('object_id')], order_by=latest),
+                **{alias: self.field_at(field, when) for alias, field in fields.items()},
+            )
+            # Ambas condiciones son sobre ventanas: se aplican después de numerar las filas
+            .filter(latest=1, last_action__in=(AuditEntry.CREATE, AuditEntry.SNAPSHOT))
+        )
+
+    def seed(self, batch_size=1000):
+        """
+        Escribe una instantánea de las filas sin entradas (anteriores a la
+        auditoría) fechada en su creación; retorna cuántas escribió.
+        """
+        written = 0
+        rows = self.model._default_manager.order_by('pk').iterator(chunk_size=batch_size)
+        while True:
+            chunk = list(islice(rows, batch_size))
+            if not chunk:
+                return written
+            audited = set(
+                self.entries().filter(object_id__in=[str(row.pk) for row in chunk])
+                .order_by().values_list('object_id', flat=True).distinct()
+            )
+            snapshots = AuditEntry.objects.bulk_create([
+                AuditEntry(
+                    content_type=self.content_type, object_id=str(row.pk), container_id=self.container_of(row),
+                    action=AuditEntry.SNAPSHOT, changes=self.values(row), timestamp=row.created_at,
+                )
+                for row in chunk if str(row.pk) not in audited
+            ], batch_size=batch_size)
+            # Como si se hubieran auditado al crearse: ya asentadas para el punto de control
+            AuditEntry.objects.filter(pk__in=[entry.pk for entry in snapshots]).update(created_at=F('timestamp'))
+            written += len(snapshots)
+
+    def state_at(self, object_ids, when):
+        """Estado de cada objeto en el momento ``when``; omite los que no existían o estaban eliminados"""
+        return self.reconstruct(when, object_ids=object_ids)
+
+    def checkpoint(self, batch_size=1000):
+        """
+        Escribe el estado completo de los objetos con entradas insertadas
+        desde el punto de control anterior (de todos en el primero, tras
+        sembrar las filas anteriores a la auditoría) y registra
+        el punto de control; retorna cuántos objetos escribió. El momento del
+        punto de control es el de la última entrada asentada, no el reloj: lo
+        que todavía no llegó se detecta como tardío al reconstruir.
+        """
+        previous = (
+            AuditCheckpoint.objects.filter(content_type=self.content_type)
+            .order_by('-timestamp').values_list('timestamp', 'inserted_through').first()
+        )
+        if previous is None:
+            self.seed(batch_size)
+        settled = timezone.now() - datetime.timedelta(seconds=audit_settings()['CHECKPOINT_SETTLE'])
+        entries = self.entries().exclude(action=AuditEntry.CHECKPOINT).filter(created_at__lte=settled)
+        latest = entries.aggregate(at=Max('timestamp'), inserted_through=Max('created_at'))
+        at, inserted_through = latest['at'], latest['inserted_through']
+        if at is None:
+            return 0
+        changed = entries.filter(created_at__lte=inserted_through)
+        if previous is not None:
+            if previous[1] >= inserted_through:
+                return 0
+            changed = changed.filter(created_at__gt=previous[1])
+            # Una entrada tardía puede ser anterior al punto previo: el nuevo no retrocede
+            at = max(at, previous[0] + datetime.timedelta(microseconds=1))
+        object_ids = sorted(set(changed.order_by().values_list('object_id', flat=True).distinct()))
+
+        written = 0
+        with transaction.atomic():
+            for start in range(0, len(object_ids), batch_size):
+                states = self.reconstruct(at, object_ids=object_ids[start:start + batch_size])
+                written += len(AuditEntry.objects.bulk_create([
+                    AuditEntry(
+                        content_type=self.content_type, object_id=object_id,
+                        container_id=self.container_of(instance), action=AuditEntry.CHECKPOINT,
+                        changes=self.values(instance), timestamp=at,
+                    )
+                    for object_id, instance in states.items()
+                ], batch_size=batch_size))
+            AuditCheckpoint.objects.create(
+                content_type=self.content_type, timestamp=at, inserted_through=inserted_through,
+                objects_written=written,
+            )
+        return written
+
+    def compact(self, cutoff, batch_size=500):
+        """
+        Pliega las entradas anteriores a ``cutoff`` en una instantánea por
+        objeto (o las elimina si el objeto ya no existía). El estado sigue
+        siendo exacto desde el último cambio plegado; retorna cuántas
+        entradas menos quedaron.
+        """
+        old = self.entries().filter(timestamp__lt=cutoff)
+        object_ids = set(
+            old.order_by().values('object_id').annotate(count=Count('pk')).filter(count__gt=1)
+            .values_list('object_id', flat=True)
+        )
+        object_ids.update(old.filter(action=AuditEntry.DELETE).values_list('object_id', flat=True))
+        object_ids = sorted(object_ids)
+
+        removed = 0
+        for start in range(0, len(object_ids), batch_size):
+            chunk = object_ids[start:start + batch_size]
+            with transaction.atomic():
+                rows = list(
+                    old.filter(object_id__in=chunk).select_for_update()
+                    .order_by('object_id', 'timestamp', 'pk')
+                    .values_list('object_id', 'action', 'changes', 'timestamp', 'container_id')
+                )
+                containers = {row[0]: row[4] for row in rows}
+                snapshots = [
+                    AuditEntry(
+                        content_type=self.content_type, object_id=object_id, container_id=containers[object_id],
+                        action=AuditEntry.SNAPSHOT, changes=state[0], timestamp=state[2],
+                    )
+                    for object_id, state in fold(row[:4] for row in rows).items() if state is not None
+                ]
+                removed += old.filter(object_id__in=chunk).delete()[0]
+                AuditEntry.objects.bulk_create(snapshots, batch_size=batch_size)
+                removed -= len(snapshots)
+        # Los puntos de control anteriores ya no tienen sus entradas completas
+        AuditCheckpoint.objects.filter(content_type=self.content_type, timestamp__lt=cutoff).delete()
+        return removed
+
+
+# Auditorías declaradas por las apps, por etiqueta de modelo
+audit_logs = {}
+
+
+def register_audit_log(log):
+    """Registra la auditoría de un modelo para los servicios en bloque y la compactación"""
+    audit_logs[log.label] = log
+    return log
+
+
+def audit_log_for(model):
+    return audit_logs.get(model._meta.label)
+
+
+def compact_audit_logs(days=None):
+    """Aplica la retención a todos los modelos auditados; retorna {modelo: entradas eliminadas}"""
+    days = audit_settings()['RETENTION_DAYS'] if days is None else days
+    cutoff = timezone.now() - datetime.timedelta(days=days)
+    return {label: log.compact(cutoff) for label, log in audit_logs.items()}
+
+
+def checkpoint_audit_logs():
+    """Toma un punto de control de cada modelo auditado; retorna {modelo: objetos escritos}"""
+    return {label: log.checkpoint() for label, log in audit_logs.items()}
@@ -0,0 +1,126 @@
+"""
+Caché de resultados para agregados de lectura costosos.
+
+Cada agregado declara etiquetas (``backlog``, ``sprint:<id>``, ...). La
+clave de una entrada incluye la versión actual de sus etiquetas, así que
+invalidar una etiqueta es cambiar su versión: las entradas viejas dejan
+de leerse y expiran solas. Las invalidaciones se aplican al confirmar la
+transacción para que ningún lector guarde datos anteriores al cambio.
+
+Un solo proceso recalcula una entrada ausente (los demás esperan su
+resultado) y cada agregado cuenta aciertos y fallos en la propia caché.
+"""
+import hashlib
+import json
+import time
+from uuid import uuid4
+
+from django.core.cache import caches
+from django.db import transaction
+
+
+MISSING = object()
+
+
+def tag_key(tag):
+    return f'cache-tag:{tag}'
+
+
+def tag_versions(cache, tags):
+    """Versiones actuales de las etiquetas; crea las que falten"""
+    keys = [tag_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, uuid4().hex, timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def invalidate_tags(*tags, alias='default'):
+    """Invalida las entradas de las etiquetas cuando se confirme la transacción actual"""
+    tags = {str(tag) for tag in tags if tag}
+    if tags:
+        transaction.on_commit(
+            lambda: caches[alias].set_many({tag_key(tag): uuid4().hex for tag in tags}, timeout=None)
+        )
+
+
+class CachedAggregate:
+    """Resultado cacheado de un agregado, invalidado por etiquetas y recalculado por un solo proceso"""
+
+    def __init__(self, name, tags=(), timeout=300, lock_timeout=30, wait=5.0, alias='default'):
+        self.name = name
+        self.tags = tuple(tags)
+        self.timeout = timeout
+        self.lock_timeout = lock_timeout
+        self.wait = wait
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def stats_key(self, kind):
+        return f'cache-stats:{self.name}:{kind}'
+
+    def record(self, kind):
+        key = self.stats_key(kind)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            if not self.cache.add(key, 1, timeout=None):
+                self.cache.incr(key)
+
+    def stats(self):
+        values = self.cache.get_many([self.stats_key('hits'), self.stats_key('misses')])
+        hits = values.get(self.stats_key('hits'), 0)
+        misses = values.get(self.stats_key('misses'), 0)
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits * 100 / total, 2) if total else 0,
+        }
+
+    def key(self, params, tags):
+        versions = tag_versions(self.cache, tags)
+        payload = json.dumps([self.name, params, versions], sort_keys=True, default=str)
+        return f'cache-entry:{self.name}:{hashlib.md5(payload.encode("utf-8")).hexdigest()}'
+
+    def get(self, params, compute, tags=()):
+        """Retorna el valor cacheado para ``params`` o lo calcula con ``compute()``"""
+        key = self.key(params, [*self.tags, *tags])
+        value = self.cache.get(key, MISSING)
+        if value is not MISSING:
+            self.record('hits')
+            return value
+
+        self.record('misses')
+        lock = f'{key}:lock'
+        if self.cache.add(lock, 1, timeout=self.lock_timeout):
+            try:
+                value = compute()
+                self.cache.set(key, value, timeout=self.timeout)
+            finally:
+                self.cache.delete(lock)
+            return value
+
+        # Otro proceso está recalculando la misma entrada: se espera su resultado
+        deadline = time.monotonic() + self.wait
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            value = self.cache.get(key, MISSING)
+            if value is not MISSING:
+                return value
+        return compute()
+
+
+# Agregados declarados por las apps, por nombre
+cached_aggregates = {}
+
+
+def register_cached_aggregate(aggregate):
+    """Registra un agregado para exponer sus contadores de aciertos y fallos"""
+    cached_aggregates[aggregate.name] = aggregate
+    return aggregate
@@ -0,0 +1,97 @@
+"""
+Exportaciones CSV y NDJSON en streaming con memoria constante.
+
+Las filas se leen con ``values()`` e ``iterator()`` (cursor del lado del
+servidor en PostgreSQL) proyectando sólo las columnas exportadas, y se
+agrupan en lotes; por cada lote las claves foráneas se resuelven con una
+consulta ``IN`` en lugar de una por fila. La respuesta se escribe a medida
+que se generan las filas, así que el primer byte sale de inmediato.
+"""
+import csv
+import json
+from datetime import date, datetime
+from itertools import islice
+from uuid import UUID
+
+from django.contrib.auth.models import User
+from django.http import StreamingHttpResponse
+
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class Echo:
+    """Pseudo archivo que retorna lo escrito para usar csv.writer en streaming"""
+
+    def write(self, value):
+        return value
+
+
+def export_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+class StreamingExport:
+    """Exportación de un queryset por lotes; las subclases declaran columnas y relaciones"""
+
+    # Columnas leídas de la tabla, en el orden de salida
+    fields = ()
+    # Columnas FK a usuarios que se exportan como nombre de usuario
+    user_fields = ()
+    chunk_size = 2000
+
+    def resolve(self, rows):
+        """Completa un lote de filas con datos relacionados (una consulta por relación)"""
+        user_ids = {row[field] for row in rows for field in self.user_fields if row[field]}
+        usernames = dict(User.objects.filter(pk__in=user_ids).values_list('pk', 'username')) if user_ids else {}
+        for row in rows:
+            for field in self.user_fields:
+                row[field] = usernames.get(row[field])
+        return rows
+
+    @property
+    def headers(self):
+        return list(self.fields)
+
+    def rows(self, queryset):
+        iterator = queryset.values(*self.fields).iterator(chunk_size=self.chunk_size)
+        while True:
+            chunk = list(islice(iterator, self.chunk_size))
+            if not chunk:
+                return
+            yield from self.resolve(chunk)
+
+    def render_csv(self, queryset):
+        writer = csv.writer(Echo())
+        headers = self.headers
+        yield '\ufeff' + writer.writerow(headers)
+        for row in self.rows(queryset):
+            values = []
+            for header in headers:
+                value = export_value(row.get(header))
+                if isinstance(value, list):
+                    value = ';'.join(str(item) for item in value)
+                values.append('' if value is None else value)
+            yield writer.writerow(values)
+
+    def render_ndjson(self, queryset):
+        headers = self.headers
+        for row in self.rows(queryset):
+            yield json.dumps(
+                {header: export_value(row.get(header)) for header in headers},
+                ensure_ascii=False, default=str,
+            ) + '\n'
+
+    def response(self, queryset, format, filename):
+        render = self.render_csv if format == 'csv' else self.render_ndjson
+        response = StreamingHttpResponse(render(queryset), content_type=EXPORT_FORMATS[format])
+        response['Content-Disposition'] = f'attachment; filename="{filename}.{format}"'
+        response['X-Accel-Buffering'] = 'no'
+        return response
@@ -0,0 +1,291 @@
+"""
+Índice normalizado de etiquetas para los campos JSON ``labels``.
+
+Cada modelo etiquetable tiene una tabla de pertenencia (objeto, nombre)
+indexada por nombre que se mantiene sincronizada con su lista JSON. Sobre
+ella se filtra por etiqueta y se calculan facetas con una sola consulta
+agrupada. En PostgreSQL puede usarse en su lugar la contención JSON sobre
+un índice GIN ``jsonb_path_ops`` (``LABEL_FILTER_STRATEGY = 'json'``).
+
+Las operaciones masivas de etiquetas modifican la lista JSON en la base de
+datos (funciones JSON de PostgreSQL o JSON1 de SQLite) en lugar de leerla,
+editarla en Python y guardarla, así que no pierden escrituras concurrentes.
+"""
+import json
+
+from django.conf import settings
+from django.db import connection as default_connection
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.signals import post_save
+from django.utils import timezone
+from rest_framework.filters import BaseFilterBackend
+
+from apps.shared.domain.models import AuditEntry
+from apps.shared.domain.value_objects import Label
+from apps.shared.infrastructure.audit import audit_log_for
+
+
+def normalize_labels(labels):
+    """Limpia y deduplica una lista de etiquetas conservando el orden"""
+    names = []
+    for label in labels or []:
+        try:
+            name = Label(str(label)).name
+        except ValueError:
+            continue
+        if name not in names:
+            names.append(name)
+    return names
+
+
+class LabelIndex:
+    """Tabla de pertenencia de etiquetas de un modelo con campo JSON ``labels``"""
+
+    def __init__(self, model, membership_model, owner_field, table):
+        self.model = model
+        self.membership_model = membership_model
+        self.owner_field = owner_field
+        self.table = table
+
+    @property
+    def owner_id_field(self):
+        return f'{self.owner_field}_id'
+
+    def connect(self):
+        post_save.connect(self.sync_on_save, sender=self.model, weak=False)
+
+    def install_on_migrate(self, using='default', **kwargs):
+        """Receptor de post_migrate que crea el índice GIN de respaldo en PostgreSQL"""
+        from django.db import connections
+        connection = connections[using]
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'CREATE INDEX IF NOT EXISTS {self.table}_labels_gin '
+                    f'ON {self.table} USING gin (labels jsonb_path_ops)'
+                )
+
+    def sync_on_save(self, sender, instance, raw=False, update_fields=None, **kwargs):
+        if raw or (update_fields is not None and 'labels' not in update_fields):
+            return
+        self.sync(instance)
+
+    def sync(self, instance):
+        """Alinea las pertenencias de un objeto con su lista JSON"""
+        wanted = set(normalize_labels(instance.labels))
+        memberships = self.membership_model.objects.filter(**{self.owner_id_field: instance.pk})
+        current = set(memberships.values_list('name', flat=True))
+        with transaction.atomic():
+            if current - wanted:
+                memberships.filter(name__in=current - wanted).delete()
+            if wanted - current:
+                self.membership_model.objects.bulk_create(
+                    [self.membership_model(**{self.owner_id_field: instance.pk, 'name': name})
+                     for name in wanted - current],
+                    ignore_conflicts=True,
+                )
+
+    def index_new(self, instances, batch_size=2000):
+        """Crea las pertenencias de objetos recién insertados con bulk_create"""
+        return self.membership_model.objects.bulk_create(
+            [self.membership_model(**{self.owner_id_field: instance.pk, 'name': name})
+             for instance in instances for name in normalize_labels(instance.labels)],
+            batch_size=batch_size,
+        )
+
+    def rebuild(self, batch_size=2000):
+        """Reconstruye toda la tabla de pertenencia desde los campos JSON"""
+        created = 0
+        with transaction.atomic():
+            self.membership_model.objects.all().delete()
+            batch = []
+            rows = self.model.objects.order_by().values_list('pk', 'labels').iterator(chunk_size=batch_size)
+            for pk, labels in rows:
+                for name in normalize_labels(labels):
+                    batch.append(self.membership_model(**{self.owner_id_field: pk, 'name': name}))
+                if len(batch) >= batch_size:
+                    created += len(self.membership_model.objects.bulk_create(batch))
+                    batch = []
+            if batch:
+                created += len(self.membership_model.objects.bulk_create(batch))
+        return created
+
+    # Tamaño de lote de ids para los UPDATE en SQLite (límite de variables)
+    sqlite_batch_size = 500
+
+    def bulk_add(self, ids, labels):
+        """Agrega etiquetas a muchos objetos; retorna los ids modificados"""
+        return self._bulk_update(ids, normalize_labels(labels), add=True)
+
+    def bulk_remove(self, ids, labels):
+        """Quita etiquetas de muchos objetos; retorna los ids modificados"""
+        return self._bulk_update(ids, normalize_labels(labels), add=False)
+
+    def _bulk_update(self, ids, labels, add):
+        if not ids or not labels:
+            return []
+        connection = default_connection
+        pk_field = self.model._meta.pk
+        db_ids = [pk_field.get_db_prep_value(pk_field.to_python(pk), connection) for pk in ids]
+        now = timezone.now()
+
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                changed = self._postgres_update(connection, db_ids, labels, add, now)
+            else:
+                changed = self._sqlite_update(connection, db_ids, labels, add, now)
+
+            if add:
+                self.membership_model.objects.bulk_create(
+                    [self.membership_model(**{self.owner_id_field: pk, 'name': name})
+                     for pk in changed for name in labels],
+                    batch_size=self.sqlite_batch_size,
+                    ignore_conflicts=True,
+                )
+            elif changed:
+                self.membership_model.objects.filter(
+                    **{f'{self.owner_id_field}__in': changed}, name__in=labels
+                ).delete()
+            self.audit_labels(changed, now)
+        return changed
+
+    def audit_labels(self, ids, now):
+        """Registra las etiquetas resultantes en la auditoría del modelo, si tiene"""
+        audit = audit_log_for(self.model)
+        if audit is None or not ids:
+            return
+        fields = ['pk', 'labels'] + ([audit.container] if audit.container else [])
+        changed = list(self.model.objects.filter(pk__in=ids).only(*fields))
+        audit.record(changed, AuditEntry.UPDATE, ['labels'], timestamp=now)
+
+    def _postgres_update(self, connection, ids, labels, add, now):
+        pk_type = self.model._meta.pk.db_type(connection)
+        payload = json.dumps(labels)
+        if add:
+            sql = f"""
+                UPDATE {self.table} AS t
+                SET labels = coalesce(t.labels, '[]'::jsonb) || (
+                        SELECT coalesce(jsonb_agg(v ORDER BY n), '[]'::jsonb)
+                        FROM jsonb_array_elements(%s::jsonb) WITH ORDINALITY AS x(v, n)
+                        WHERE NOT coalesce(t.labels, '[]'::jsonb) @> jsonb_build_array(v)
+                    ),
+                    updated_at = %s
+                WHERE t.id = ANY(%s::{pk_type}[]) AND NOT coalesce(t.labels, '[]'::jsonb) @> %s::jsonb
+                RETURNING t.id
+            """
+            params = [payload, now, ids, payload]
+        else:
+            sql = f"""
+                UPDATE {self.table} AS t
+                SET labels = (
+                        SELECT coalesce(jsonb_agg(e ORDER BY n), '[]'::jsonb)
+                        FROM jsonb_array_elements(t.labels) WITH ORDINALITY AS x(e, n)
+                        WHERE NOT %s::jsonb @> jsonb_build_array(e)
+                    ),
+                    updated_at = %s
+                WHERE t.id = ANY(%s::{pk_type}[]) AND t.labels ?| %s::text[]
+                RETURNING t.id
+            """
+            params = [payload, now, ids, labels]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+    def _sqlite_update(self, connection, ids, labels, add, now):
+        changed = set()
+        now = self.model._meta.get_field('updated_at').get_db_prep_value(now, connection)
+        with connection.cursor() as cursor:
+            for start in range(0, len(ids), self.sqlite_batch_size):
+                batch = ids[start:start + self.sqlite_batch_size]
+                placeholders = ', '.join(['%s'] * len(batch))
+                if add:
+                    for name in labels:
+                        cursor.execute(f"""
+                            UPDATE {self.table}
+                            SET labels = json_insert(coalesce(labels, '[]'), '$[#]', %s), updated_at = %s
+                            WHERE id IN ({placeholders}) AND NOT EXISTS (
+                                SELECT 1 FROM json_each({self.table}.labels) WHERE value = %s
+                            )
+                            RETURNING id
+                        """, [name, now, *batch, name])
+                        changed.update(row[0] for row in cursor.fetchall())
+                else:
+                    names = ', '.join(['%s'] * len(labels))
+                    cursor.execute(f"""
+                        UPDATE {self.table}
+                        SET labels = (
+                                SELECT json_group_array(value) FROM json_each({self.table}.labels)
+                                WHERE value NOT IN ({names})
+                            ),
+                            updated_at = %s
+                        WHERE id IN ({placeholders}) AND EXISTS (
+                            SELECT 1 FROM json_each({self.table}.labels) WHERE value IN ({names})
+                        )
+                        RETURNING id
+                    """, [*labels, now, *batch, *labels])
+                    changed.update(row[0] for row in cursor.fetchall())
+        return list(changed)
+
+    def uses_json_containment(self, connection=None):
+        connection = connection or default_connection
+        strategy = getattr(settings, 'LABEL_FILTER_STRATEGY', 'table')
+        return strategy == 'json' and connection.vendor == 'postgresql'
+
+    def filter(self, queryset, labels, match='any'):
+        """Filtra por etiquetas: 'any' exige alguna, 'all' exige todas"""
+        labels = normalize_labels(labels)
+        if not labels:
+            return queryset
+
+        if self.uses_json_containment():
+            if match == 'all':
+                return queryset.filter(labels__contains=labels)
+            condition = Q()
+            for name in labels:
+                condition |= Q(labels__contains=[name])
+            return queryset.filter(condition)
+
+        members = self.membership_model.objects.filter(name__in=labels)
+        if match == 'all':
+            members = (
+                members.values(self.owner_id_field)
+                .annotate(matched=Count('name'))
+                .filter(matched=len(labels))
+            )
+        return queryset.filter(pk__in=members.values(self.owner_id_field))
+
+    def facets(self, queryset):
+        """Cuenta de objetos por etiqueta dentro del queryset, en una consulta agrupada"""
+        return list(
+            self.membership_model.objects
+            .filter(**{f'{self.owner_id_field}__in': queryset.order_by().values('pk')})
+            .values('name')
+            .annotate(count=Count(self.owner_id_field))
+            .order_by('-count', 'name')
+        )
+
+
+# Índices declarados por las apps, por nombre de tabla
+label_indexes = {}
+
+
+def register_label_index(index):
+    """Registra un índice para que lo reconstruya rebuild_label_index"""
+    label_indexes[index.table] = index
+    return index
+
+
+class LabelFilterBackend(BaseFilterBackend):
+    """Filtra por ?label=a&label=b (label_match=any|all) si la vista declara label_index"""
+
+    label_param = 'label'
+    match_param = 'label_match'
+
+    def filter_queryset(self, request, queryset, view):
+        index = getattr(view, 'label_index', None)
+        labels = request.query_params.getlist(self.label_param)
+        if index is None or not labels:
+            return queryset
+        match = 'all' if request.query_params.get(self.match_param) == 'all' else 'any'
+        return index.filter(queryset, labels, match)
@@ -0,0 +1,215 @@
+"""
+Paginación por cursor (keyset) compartida por los listados de la API.
+
+A diferencia de ``PageNumberPagination``, cada página se obtiene con un
+``WHERE (clave) < (último valor visto)`` sobre el orden por defecto del
+modelo, por lo que una página profunda cuesta lo mismo que la primera y
+no se ejecuta ``COUNT(*)`` salvo que el cliente lo pida.
+
+El orden lo fija la clave del cursor, por eso ``OrderingFilter`` no está
+entre los filtros por defecto: un ``?ordering=`` quedaría ignorado.
+"""
+import json
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+from datetime import date, datetime
+from uuid import UUID
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from apps.shared.infrastructure.activity import activity_sources
+
+
+class KeysetPagination(BasePagination):
+    """Paginación keyset con cursores opacos y estables."""
+
+    ordering = ('-created_at', 'id')
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'with_count'
+    invalid_cursor_message = 'Cursor inválido'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.count = queryset.count() if self.count_requested(request) else None
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor['r'])
+        keys = self.get_keys(reverse)
+
+        queryset = queryset.order_by(*(
+            f'-{field}' if descending else field for field, descending in keys
+        ))
+        if cursor:
+            queryset = queryset.filter(self.keyset_filter(keys, cursor['p']))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        if reverse:
+            self.has_next, self.has_previous = cursor is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        payload = OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ])
+        if self.count is not None:
+            payload['count'] = self.count
+            payload.move_to_end('count', last=False)
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'count': {'type': 'integer'},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def count_requested(self, request):
+        """Indica si el cliente pidió el total de registros."""
+        value = request.query_params.get(self.count_query_param, '')
+        return value.lower() in ('1', 'true', 'yes')
+
+    def get_keys(self, reverse=False):
+        """Retorna la clave de orden como pares (campo, descendente)."""
+        keys = []
+        for field in self.ordering:
+            descending = field.startswith('-')
+            keys.append((field.lstrip('-'), descending != reverse))
+        return keys
+
+    def keyset_filter(self, keys, position):
+        """Construye la condición de fila ``(k1, k2, ...) > posición``."""
+        condition = Q()
+        for index, (field, descending) in enumerate(keys):
+            lookup = 'lt' if descending else 'gt'
+            equal = {name: position[i] for i, (name, _) in enumerate(keys[:index])}
+            condition |= Q(**equal, **{f'{field}__{lookup}': position[index]})
+        return condition
+
+    def get_position(self, instance):
+        position = []
+        for field, _ in self.get_keys():
+            value = getattr(instance, field)
+            if isinstance(value, (datetime, date)):
+                value = value.isoformat()
+            elif isinstance(value, UUID):
+                value = str(value)
+            position.append(value)
+        return position
+
+    def encode_cursor(self, instance, reverse):
+        payload = json.dumps({'p': self.get_position(instance), 'r': int(reverse)})
+        token = b64encode(payload.encode('utf-8'), altchars=b'-_').decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            cursor = json.loads(b64decode(token.encode('ascii'), altchars=b'-_'))
+            if len(cursor['p']) != len(self.ordering):
+                raise ValueError(token)
+            cursor['r'] = bool(cursor.get('r'))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+
+class PriorityPagination(KeysetPagination):
+    """Cola por prioridad: la más alta primero (``priority_rank``) y, dentro de cada una, la más antigua"""
+
+    ordering = ('priority_rank', 'created_at', 'id')
+
+
+class FeedPagination(KeysetPagination):
+    """
+    Paginación keyset de un feed fusionado de varias tablas, sólo hacia
+    adelante. ``fetch(posición, tamaño)`` retorna ``(eventos, hay_más)`` y la
+    posición es ``(momento, fuente, id)`` del último evento visto.
+    """
+
+    ordering = ('-timestamp', '-source', '-id')
+
+    def paginate_feed(self, fetch, request):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.count = None
+
+        cursor = self.decode_cursor(request)
+        position = None
+        if cursor:
+            timestamp, source, pk = cursor['p']
+            try:
+                timestamp = parse_datetime(timestamp)
+            except (TypeError, ValueError):
+                timestamp = None
+            if cursor['r'] or timestamp is None or not isinstance(source, str) or source not in activity_sources:
+                raise NotFound(self.invalid_cursor_message)
+            # El id se valida con la clave primaria de la fuente (UUID, entero...)
+            try:
+                pk = activity_sources[source].model._meta.pk.to_python(pk)
+            except (TypeError, ValueError, ValidationError):
+                pk = None
+            if pk is None:
+                raise NotFound(self.invalid_cursor_message)
+            position = (timestamp, source, pk)
+
+        self.page, self.has_next = fetch(position, self.page_size)
+        self.has_previous = False
+        return self.page
+
+    def get_position(self, event):
+        pk = event['id']
+        return [event['timestamp'].isoformat(), event['source'], str(pk) if isinstance(pk, UUID) else pk]
@@ -0,0 +1,183 @@
+"""
+Orden manual de tarjetas con claves fraccionarias (``rank``).
+
+Cada modelo reordenable declara qué campos forman su contenedor (la
+columna del tablero) y un índice (contenedor, rank) para leer la columna
+ya ordenada. Mover una tarjeta calcula una clave entre sus vecinas y
+escribe sólo esa fila; cuando las claves se alargan demasiado se programa
+una redistribución del contenedor en segundo plano. Una tarjeta que
+cambia de contenedor (de estado, de sprint) pasa al final del nuevo.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, CharField, F, Value, When
+from django.db.models.signals import pre_save
+
+from apps.shared.domain.exceptions import ValidationException
+from apps.shared.domain.models import AuditEntry
+from apps.shared.domain.ranking import even_ranks, needs_rebalance, rank_between
+from apps.shared.infrastructure.audit import audit_log_for
+
+
+class RankIndex:
+    """Claves de orden de un modelo agrupadas por contenedor"""
+
+    def __init__(self, model, container_fields, seed_ordering=()):
+        self.model = model
+        self.container_fields = tuple(container_fields)
+        # Orden previo a las claves con que la redistribución desempata las filas sin clave
+        self.seed_ordering = tuple(seed_ordering)
+
+    @property
+    def label(self):
+        return self.model._meta.label
+
+    def connect(self):
+        pre_save.connect(self.assign_on_save, sender=self.model, weak=False)
+
+    def container(self, instance):
+        return {field: getattr(instance, field) for field in self.container_fields}
+
+    def queryset(self, container):
+        return self.model.objects.filter(**container)
+
+    def moves_with(self, field):
+        """Si cambiar ``field`` lleva la tarjeta a otro contenedor"""
+        return field in self.container_fields or f'{field}_id' in self.container_fields
+
+    def changed_container(self, instance, update_fields=None):
+        """Si el guardado lleva la tarjeta a otro contenedor respecto de los valores leídos"""
+        loaded = getattr(instance, '_loaded_values', None)
+        if instance._state.adding or not loaded:
+            return False
+        fields = self.container_fields
+        if update_fields is not None:
+            fields = [field for field in fields if self.model._meta.get_field(field).name in update_fields]
+        return any(field in loaded and loaded[field] != getattr(instance, field) for field in fields)
+
+    def assign_on_save(self, sender, instance, raw=False, update_fields=None, **kwargs):
+        """Las tarjetas nuevas, sin clave o que cambian de contenedor van al final de su contenedor"""
+        if raw or (instance.rank and not self.changed_container(instance, update_fields)):
+            return
+        instance.rank = self.append([instance])[instance.pk]
+        if update_fields is not None and 'rank' not in update_fields and not instance._state.adding:
+            # save(update_fields=...) no escribirá la clave: se escribe aparte en la misma transacción
+            self.model.objects.filter(pk=instance.pk).update(rank=instance.rank)
+            audit = audit_log_for(self.model)
+            if audit is not None:
+                audit.record([instance], AuditEntry.UPDATE, ['rank'])
+
+    def last_rank(self, container):
+        return self.queryset(container).order_by('-rank').values_list('rank', flat=True).first() or None
+
+    def append(self, instances, **changes):
+        """
+        Claves al final del contenedor al que pasan ``instances`` con
+        ``changes`` (p. ej. ``status``), conservando su orden relativo.
+        Retorna ``{pk: clave}`` para escribirlas junto con el cambio; una
+        lectura del índice por contenedor destino.
+        """
+        columns = defaultdict(list)
+        for instance in instances:
+            container = {**self.container(instance), **{
+                field: value for field, value in changes.items() if field in self.container_fields
+            }}
+            columns[tuple(container.items())].append(instance)
+
+        ranks = {}
+        for key, members in columns.items():
+            container = dict(key)
+            rank = self.last_rank(container)
+            for instance in sorted(members, key=lambda member: (member.rank, str(member.pk))):
+                rank = ranks[instance.pk] = rank_between(rank, None)
+            if needs_rebalance(rank):
+                self.schedule_rebalance(container)
+        return ranks
+
+    def rank_expression(self, ranks):
+        """Expresión de UPDATE que asigna a cada fila su clave de ``append``"""
+        return Case(
+            *[When(pk=pk, then=Value(rank)) for pk, rank in ranks.items()],
+            default=F('rank'),
+            output_field=CharField(),
+        )
+
+    def move(self, instance, before=None, after=None):
+        """Ubica la tarjeta entre las de id ``before`` y ``after`` (None = extremo); escribe una fila"""
+        container = self.container(instance)
+        lower, upper = self.bounds(instance, container, before, after)
+        if lower is not None and upper is not None and lower == upper:
+            # Claves repetidas por inserciones concurrentes: se redistribuye una vez y se vuelven a leer
+            self.rebalance(container)
+            lower, upper = self.bounds(instance, container, before, after)
+        if lower is not None and upper is not None and lower >= upper:
+            raise ValidationException('La tarjeta de before debe estar antes que la de after', 'after')
+
+        instance.rank = rank_between(lower or None, upper)
+        instance.save(update_fields=['rank', 'updated_at'])
+        if needs_rebalance(instance.rank):
+            self.schedule_rebalance(container)
+        return instance.rank
+
+    def bounds(self, instance, container, before=None, after=None):
+        """Claves entre las que va la tarjeta: las de sus vecinas o, sin una, la contigua en la columna"""
+        others = self.queryset(container).exclude(pk=instance.pk)
+        neighbours = {
+            str(pk): rank
+            for pk, rank in others.filter(pk__in=[pk for pk in (before, after) if pk]).values_list('pk', 'rank')
+        }
+        for field, pk in (('before', before), ('after', after)):
+            if pk and str(pk) not in neighbours:
+                raise ValidationException('La tarjeta vecina no pertenece a la misma columna', field)
+
+        lower = neighbours[str(before)] if before else None
+        upper = neighbours[str(after)] if after else None
+        if before and not after:
+            upper = others.filter(rank__gt=lower).order_by('rank').values_list('rank', flat=True).first()
+        elif after and not before:
+            lower = others.filter(rank__lt=upper).order_by('-rank').values_list('rank', flat=True).first()
+        elif not before and not after:
+            lower = others.order_by('-rank').values_list('rank', flat=True).first()
+        return lower, upper
+
+    def schedule_rebalance(self, container):
+        from apps.shared.tasks import rebalance_ranks
+        payload = {field: str(value) for field, value in container.items()}
+        transaction.on_commit(lambda: rebalance_ranks.delay(self.label, payload))
+
+    def rebalance(self, container, batch_size=500):
+        """Reescribe las claves del contenedor cortas y equiespaciadas conservando el orden"""
+        with transaction.atomic():
+            rows = list(
+                self.queryset(container).select_for_update()
+                .order_by('rank', *self.seed_ordering, 'created_at', 'pk')
+                .only('pk', 'rank', *self.container_fields)
+            )
+            for row, rank in zip(rows, even_ranks(len(rows))):
+                row.rank = rank
+            self.model.objects.bulk_update(rows, ['rank'], batch_size=batch_size)
+            # Las claves nuevas también se auditan: el orden reconstruido no mezcla claves de antes y después
+            audit = audit_log_for(self.model)
+            if audit is not None:
+                audit.record(rows, AuditEntry.UPDATE, ['rank'])
+        return len(rows)
+
+    def rebalance_all(self):
+        """Redistribuye todos los contenedores; retorna la cantidad de filas reescritas"""
+        containers = self.model.objects.order_by().values(*self.container_fields).distinct()
+        return sum(self.rebalance(container) for container in containers)
+
+
+# Índices declarados por las apps, por etiqueta de modelo
+rank_indexes = {}
+
+
+def register_rank_index(index):
+    """Registra un índice para la tarea y el comando de redistribución"""
+    rank_indexes[index.label] = index
+    return index
+
+
+def rank_index_for(model):
+    return rank_indexes.get(model._meta.label)
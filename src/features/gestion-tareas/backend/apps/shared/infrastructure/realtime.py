@@ -0,0 +1,213 @@
+"""
+Canal de novedades en tiempo real para tableros y backlog.
+
+Los cambios se publican como deltas JSON compactos en un canal por
+tablero (``sprint:<id>``) o en el del backlog (``backlog``). La
+publicación ocurre al confirmar la transacción, y cada suscriptor recibe
+los mensajes en una cola propia dentro del loop de su worker ASGI.
+
+``InProcessBroker`` reparte los mensajes dentro del proceso (desarrollo y
+tests). ``RedisBroker`` publica en Redis y mantiene una sola suscripción
+por worker, que reparte localmente a las conexiones abiertas; así varios
+workers comparten los mismos canales.
+"""
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.dispatch import receiver
+from django.test.signals import setting_changed
+from django.utils.module_loading import import_string
+
+
+logger = logging.getLogger(__name__)
+
+BACKLOG_CHANNEL = 'backlog'
+
+# Se envía al suscriptor que no alcanzó a leer su cola: debe recargar el tablero
+RESYNC = json.dumps({'type': 'resync'})
+
+
+def sprint_channel(sprint_id):
+    return f'sprint:{sprint_id}'
+
+
+MOVE_FIELDS = {'rank', 'updated_at'}
+TRANSITION_FIELDS = {'status', 'started_at', 'completed_at', 'updated_at', 'rank'}
+
+
+def task_change(created, update_fields, container_field):
+    """Tipo de cambio de una tarjeta según los campos guardados: added, moved, transitioned o updated"""
+    fields = set(update_fields or ())
+    if created or container_field in fields:
+        return 'added'
+    if fields and fields <= MOVE_FIELDS:
+        return 'moved'
+    if fields and 'status' in fields and fields <= TRANSITION_FIELDS:
+        return 'transitioned'
+    return 'updated'
+
+
+def encode_delta(type, data):
+    return json.dumps({'type': type, **data}, separators=(',', ':'), default=str)
+
+
+class Subscription:
+    """Cola de mensajes de una conexión abierta, atada al loop que la creó"""
+
+    def __init__(self, broker, channels, maxsize):
+        self.broker = broker
+        self.channels = tuple(channels)
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def deliver(self, message):
+        """Encola un mensaje; se ejecuta en el loop de la suscripción"""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout):
+        """Siguiente mensaje, o None si no llegó ninguno en ``timeout`` segundos"""
+        if self.overflowed:
+            self.overflowed = False
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            return RESYNC
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """Reparte los mensajes a las suscripciones del proceso actual"""
+
+    def __init__(self, queue_size=1000):
+        self.queue_size = queue_size
+        self.subscriptions = defaultdict(set)
+        self.lock = threading.Lock()
+
+    def publish(self, channel, message):
+        # Se publica desde hilos de vistas síncronas: cada cola se alimenta en su propio loop
+        with self.lock:
+            targets = list(self.subscriptions.get(channel, ()))
+        for subscription in targets:
+            subscription.loop.call_soon_threadsafe(subscription.deliver, message)
+
+    async def subscribe(self, channels):
+        subscription = Subscription(self, channels, self.queue_size)
+        with self.lock:
+            for channel in subscription.channels:
+                self.subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            for channel in subscription.channels:
+                subscribers = self.subscriptions.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self.subscriptions[channel]
+
+
+class RedisBroker:
+    """Publica en Redis; cada worker escucha todos los canales una vez y reparte localmente"""
+
+    def __init__(self, url, prefix='gestion_tareas:events:', queue_size=1000, reconnect_delay=1.0):
+        self.url = url
+        self.prefix = prefix
+        self.reconnect_delay = reconnect_delay
+        self.local = InProcessBroker(queue_size)
+        self.listener = None
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            import redis
+            self._client = redis.Redis.from_url(self.url)
+        return self._client
+
+    def publish(self, channel, message):
+        self.client.publish(f'{self.prefix}{channel}', message)
+
+    async def subscribe(self, channels):
+        if self.listener is None or self.listener.done():
+            self.listener = asyncio.get_running_loop().create_task(self.listen())
+        return await self.local.subscribe(channels)
+
+    def unsubscribe(self, subscription):
+        self.local.unsubscribe(subscription)
+
+    async def listen(self):
+        """Reenvía a las suscripciones locales todo lo publicado con el prefijo"""
+        import redis.asyncio
+
+        while True:
+            client = redis.asyncio.Redis.from_url(self.url)
+            pubsub = client.pubsub()
+            try:
+                await pubsub.psubscribe(f'{self.prefix}*')
+                async for message in pubsub.listen():
+                    if message['type'] != 'pmessage':
+                        continue
+                    channel = message['channel'].decode('utf-8')[len(self.prefix):]
+                    self.local.publish(channel, message['data'].decode('utf-8'))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception('Se perdió la suscripción de eventos en Redis; reconectando')
+                await asyncio.sleep(self.reconnect_delay)
+            finally:
+                await pubsub.close()
+                await client.close()
+
+
+_broker = None
+
+
+def get_broker():
+    """Broker configurado en ``REALTIME_BROKER`` (uno por proceso)"""
+    global _broker
+    if _broker is None:
+        config = getattr(settings, 'REALTIME_BROKER', {})
+        backend = import_string(config.get('BACKEND', 'apps.shared.infrastructure.realtime.InProcessBroker'))
+        _broker = backend(**config.get('OPTIONS', {}))
+    return _broker
+
+
+@receiver(setting_changed)
+def reset_broker(setting, **kwargs):
+    global _broker
+    if setting == 'REALTIME_BROKER':
+        _broker = None
+
+
+def publish(channels, type, **data):
+    """Publica un delta en los canales cuando se confirme la transacción actual"""
+    channels = {channel for channel in channels if channel}
+    if not channels:
+        return
+    message = encode_delta(type, data)
+
+    def send():
+        broker = get_broker()
+        for channel in channels:
+            try:
+                broker.publish(channel, message)
+            except Exception:
+                # Perder un delta no debe romper la escritura: los clientes se resincronizan al reconectar
+                logger.exception('No se pudo publicar el evento %s en %s', type, channel)
+
+    transaction.on_commit(send)
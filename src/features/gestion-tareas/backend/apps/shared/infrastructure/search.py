@@ -0,0 +1,287 @@
+"""
+Búsqueda de texto completo con ranking para los listados de la API.
+
+En PostgreSQL cada tabla indexada tiene una columna ``search_vector``
+(tsvector) mantenida por un trigger y cubierta por un índice GIN, con la
+configuración ``es_unaccent`` (stemming en español sin acentos). En SQLite
+se usa una tabla FTS5 sincronizada por triggers, con el tokenizador
+``unicode61 remove_diacritics 2``; SQLite no trae stemming en español, así
+que ahí la coincidencia es por prefijo de término.
+
+El filtro ``?search=`` de los listados sólo restringe las filas: conservan
+el orden de la paginación keyset, que es lo que hace estable el cursor. El
+orden por relevancia es el de la acción ``search/`` (``ranked_search``), que
+retorna las mejores coincidencias sin paginar.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+from django.db import connection as default_connection
+from django.db.models import Case, IntegerField, When
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import SearchFilter
+
+
+TERM_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+# Pesos de bm25 (SQLite) equivalentes a los pesos A-D de PostgreSQL
+BM25_WEIGHTS = {'A': 10.0, 'B': 4.0, 'C': 2.0, 'D': 1.0}
+
+
+def search_terms(query):
+    """Extrae los términos de búsqueda descartando la sintaxis del usuario"""
+    return TERM_PATTERN.findall(query or '')[:16]
+
+
+@dataclass
+class SearchIndex:
+    """Índice de texto completo sobre columnas de una tabla con sus pesos"""
+
+    table: str
+    fields: List[Tuple[str, str]] = field(default_factory=list)
+    pk_column: str = 'id'
+
+    @property
+    def fts_table(self):
+        return f'{self.table}_fts'
+
+    def backend(self, connection=None):
+        connection = connection or default_connection
+        backend_class = SEARCH_BACKENDS.get(connection.vendor)
+        return backend_class(self, connection) if backend_class else None
+
+    def install_on_migrate(self, using='default', **kwargs):
+        """Receptor de post_migrate que instala el índice en la base migrada"""
+        from django.db import connections
+        backend = self.backend(connections[using])
+        if backend:
+            backend.install()
+
+
+class PostgresSearchBackend:
+    """tsvector mantenido por trigger más índice GIN"""
+
+    config = 'es_unaccent'
+
+    def __init__(self, index, connection):
+        self.index = index
+        self.connection = connection
+
+    def vector_sql(self, prefix=''):
+        parts = [
+            f"setweight(to_tsvector('{self.config}', coalesce({prefix}{column}, '')), '{weight}')"
+            for column, weight in self.index.fields
+        ]
+        return ' || '.join(parts)
+
+    def install(self):
+        table = self.index.table
+        columns = ', '.join(column for column, _ in self.index.fields)
+        with self.connection.cursor() as cursor:
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+            cursor.execute(f"""
+                DO $$ BEGIN
+                    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = '{self.config}') THEN
+                        CREATE TEXT SEARCH CONFIGURATION {self.config} (COPY = spanish);
+                        ALTER TEXT SEARCH CONFIGURATION {self.config}
+                            ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem;
+                    END IF;
+                END $$
+            """)
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector')
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {table}_search_idx ON {table} USING gin (search_vector)'
+            )
+            cursor.execute(f"""
+                CREATE OR REPLACE FUNCTION {table}_search_update() RETURNS trigger AS $$
+                BEGIN
+                    NEW.search_vector := {self.vector_sql('NEW.')};
+                    RETURN NEW;
+                END
+                $$ LANGUAGE plpgsql
+            """)
+            cursor.execute(f'DROP TRIGGER IF EXISTS {table}_search_trigger ON {table}')
+            cursor.execute(f"""
+                CREATE TRIGGER {table}_search_trigger
+                BEFORE INSERT OR UPDATE OF {columns} ON {table}
+                FOR EACH ROW EXECUTE FUNCTION {table}_search_update()
+            """)
+
+    def rebuild(self):
+        self.install()
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'UPDATE {self.index.table} SET search_vector = {self.vector_sql()}')
+            return cursor.rowcount
+
+    def tsquery(self, terms):
+        return ' & '.join(f'{term}:*' for term in terms)
+
+    def match_sql(self, terms):
+        sql = (
+            f'SELECT {self.index.pk_column} FROM {self.index.table} '
+            f"WHERE search_vector @@ to_tsquery('{self.config}', %s)"
+        )
+        return sql, [self.tsquery(terms)]
+
+    def ranked_ids(self, terms, limit):
+        sql = (
+            f"SELECT {self.index.pk_column} FROM {self.index.table}, "
+            f"to_tsquery('{self.config}', %s) AS query "
+            'WHERE search_vector @@ query '
+            'ORDER BY ts_rank_cd(search_vector, query) DESC LIMIT %s'
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, [self.tsquery(terms), limit])
+            return [row[0] for row in cursor.fetchall()]
+
+
+class SqliteSearchBackend:
+    """
+    Tabla FTS5 sincronizada por triggers. Su ``rowid`` es el de una tabla de
+    claves (``INTEGER PRIMARY KEY`` -> id de la fila) y no el ``rowid``
+    implícito de la tabla indexada, que con una clave primaria UUID puede
+    renumerarse en un VACUUM y desincronizar el índice.
+    """
+
+    tokenizer = 'unicode61 remove_diacritics 2'
+
+    def __init__(self, index, connection):
+        self.index = index
+        self.connection = connection
+
+    @property
+    def keys_table(self):
+        return f'{self.index.fts_table}_keys'
+
+    def install(self):
+        table, fts, keys, pk = self.index.table, self.index.fts_table, self.keys_table, self.index.pk_column
+        columns = [column for column, _ in self.index.fields]
+        names = ', '.join(columns)
+        new_values = ', '.join(f'new.{column}' for column in columns)
+        assignments = ', '.join(f'{column} = new.{column}' for column in columns)
+        key_of = f'(SELECT rowid FROM {keys} WHERE {pk} = old.{pk})'
+        with self.connection.cursor() as cursor:
+            cursor.execute("SELECT sql FROM sqlite_master WHERE name = %s", [fts])
+            row = cursor.fetchone()
+            legacy = row is not None and 'content_rowid' in row[0]
+            if legacy:
+                # Índice de contenido externo sobre el rowid implícito: se reemplaza y se vuelve a llenar
+                cursor.execute(f'DROP TABLE {fts}')
+            cursor.execute(f'CREATE TABLE IF NOT EXISTS {keys} (rowid INTEGER PRIMARY KEY, {pk} TEXT NOT NULL UNIQUE)')
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({names}, tokenize='{self.tokenizer}')"
+            )
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {fts}_{suffix}')
+            cursor.execute(f"""
+                CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN
+                    INSERT INTO {keys}({pk}) VALUES (new.{pk});
+                    INSERT INTO {fts}(rowid, {names}) VALUES (last_insert_rowid(), {new_values});
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN
+                    DELETE FROM {fts} WHERE rowid = {key_of};
+                    DELETE FROM {keys} WHERE {pk} = old.{pk};
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER {fts}_au AFTER UPDATE OF {names} ON {table} BEGIN
+                    UPDATE {fts} SET {assignments} WHERE rowid = {key_of};
+                END
+            """)
+        if legacy:
+            self.populate()
+
+    def populate(self):
+        """Vuelve a llenar la tabla de claves y el índice desde la tabla indexada"""
+        table, fts, keys, pk = self.index.table, self.index.fts_table, self.keys_table, self.index.pk_column
+        names = ', '.join(column for column, _ in self.index.fields)
+        values = ', '.join(f't.{column}' for column, _ in self.index.fields)
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {fts}')
+            cursor.execute(f'DELETE FROM {keys}')
+            cursor.execute(f'INSERT INTO {keys}({pk}) SELECT {pk} FROM {table}')
+            cursor.execute(
+                f'INSERT INTO {fts}(rowid, {names}) '
+                f'SELECT k.rowid, {values} FROM {table} t JOIN {keys} k ON k.{pk} = t.{pk}'
+            )
+            cursor.execute(f'SELECT COUNT(*) FROM {keys}')
+            return cursor.fetchone()[0]
+
+    def rebuild(self):
+        self.install()
+        return self.populate()
+
+    def fts_query(self, terms):
+        return ' '.join(f'"{term}"*' for term in terms)
+
+    def match_sql(self, terms):
+        fts, keys, pk = self.index.fts_table, self.keys_table, self.index.pk_column
+        sql = (
+            f'SELECT k.{pk} FROM {fts} f '
+            f'JOIN {keys} k ON k.rowid = f.rowid WHERE {fts} MATCH %s'
+        )
+        return sql, [self.fts_query(terms)]
+
+    def ranked_ids(self, terms, limit):
+        fts, keys, pk = self.index.fts_table, self.keys_table, self.index.pk_column
+        weights = ', '.join(str(BM25_WEIGHTS[weight]) for _, weight in self.index.fields)
+        sql = (
+            f'SELECT k.{pk} FROM {fts} f '
+            f'JOIN {keys} k ON k.rowid = f.rowid WHERE {fts} MATCH %s '
+            f'ORDER BY bm25({fts}, {weights}) LIMIT %s'
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, [self.fts_query(terms), limit])
+            return [row[0] for row in cursor.fetchall()]
+
+
+SEARCH_BACKENDS = {
+    'postgresql': PostgresSearchBackend,
+    'sqlite': SqliteSearchBackend,
+}
+
+# Índices declarados por las apps, por nombre de tabla
+search_indexes = {}
+
+
+def register_search_index(index):
+    """Registra un índice para que lo reconstruya rebuild_search_index"""
+    search_indexes[index.table] = index
+    return index
+
+
+def ranked_search(queryset, index, query, limit=50):
+    """Retorna los objetos que coinciden con la búsqueda ordenados por relevancia"""
+    terms = search_terms(query)
+    backend = index.backend()
+    if not terms or backend is None:
+        return queryset.none()
+    ids = backend.ranked_ids(terms, limit)
+    ordering = Case(
+        *[When(pk=pk, then=position) for position, pk in enumerate(ids)],
+        output_field=IntegerField(),
+    )
+    return queryset.filter(pk__in=ids).order_by(ordering) if ids else queryset.none()
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    SearchFilter que usa el índice de texto completo de la vista si existe.
+    Filtra sin ordenar por relevancia: el orden es el del listado (ver
+    ``ranked_search`` para los resultados por relevancia).
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        index = getattr(view, 'search_index', None)
+        backend = index.backend() if index else None
+        if backend is None:
+            return super().filter_queryset(request, queryset, view)
+
+        terms = search_terms(request.query_params.get(self.search_param, ''))
+        if not terms:
+            return queryset
+        sql, params = backend.match_sql(terms)
+        return queryset.filter(pk__in=RawSQL(sql, params))
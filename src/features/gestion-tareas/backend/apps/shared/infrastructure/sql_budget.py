@@ -0,0 +1,181 @@
+"""
+Presupuesto de consultas SQL por petición y detector de N+1.
+
+``QueryRecorder`` envuelve la ejecución de SQL de todas las conexiones
+(``execute_wrapper``, sin depender de DEBUG) y registra cantidad, tiempo,
+forma normalizada y duración de cada consulta. Una forma que se repite
+muchas veces en la misma unidad de trabajo es la firma de un N+1.
+
+Las vistas declaran su presupuesto con ``query_budget`` (un número, o un
+diccionario por acción de un viewset); sin declaración rige
+``SQL_BUDGET['DEFAULT_BUDGET']``.
+"""
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+
+metrics_logger = logging.getLogger('apps.sql.metrics')
+logger = logging.getLogger('apps.sql')
+
+DEFAULTS = {
+    'ENABLED': True,
+    'DEFAULT_BUDGET': 50,
+    'N_PLUS_ONE_THRESHOLD': 5,
+    'SLOWEST': 5,
+    'LOG_SAMPLE_RATE': 0.01,
+    'STRICT': False,
+}
+
+_IN_LIST = re.compile(r'\bIN\s*\((?:\s*%s\s*,?)+\)', re.IGNORECASE)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_SPACE = re.compile(r'\s+')
+
+
+def budget_settings():
+    return {**DEFAULTS, **getattr(settings, 'SQL_BUDGET', {})}
+
+
+def query_shape(sql):
+    """SQL sin valores: los literales y las listas IN colapsan en un marcador"""
+    sql = _NUMBER.sub('%s', _STRING.sub('%s', sql))
+    return _SPACE.sub(' ', _IN_LIST.sub('IN (...)', sql)).strip()
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Una unidad de trabajo ejecutó más consultas que su presupuesto"""
+
+
+class QueryRecorder:
+    """Registra las consultas ejecutadas dentro del bloque en todas las conexiones"""
+
+    def __init__(self, label='', budget=None):
+        self.label = label
+        self.budget = budget
+        self.queries = []
+        self.started = None
+        self.elapsed = 0.0
+        self._stack = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - start, context['connection'].alias))
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.elapsed = time.perf_counter() - self.started
+        self._stack.close()
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def db_time(self):
+        return sum(duration for _, duration, _ in self.queries)
+
+    def duplicates(self, threshold=None):
+        """Formas repetidas al menos ``threshold`` veces, de la más repetida a la menos"""
+        threshold = threshold or budget_settings()['N_PLUS_ONE_THRESHOLD']
+        shapes = Counter(query_shape(sql) for sql, _, _ in self.queries)
+        return [{'shape': shape, 'count': count} for shape, count in shapes.most_common() if count >= threshold]
+
+    def slowest(self, limit=None):
+        limit = limit or budget_settings()['SLOWEST']
+        ranked = sorted(self.queries, key=lambda query: query[1], reverse=True)[:limit]
+        return [{'sql': sql, 'ms': round(duration * 1000, 2), 'db': alias} for sql, duration, alias in ranked]
+
+    @property
+    def over_budget(self):
+        return self.budget is not None and self.count > self.budget
+
+    def summary(self):
+        """Métricas de la unidad de trabajo (sin el texto de las consultas)"""
+        return {
+            'endpoint': self.label,
+            'queries': self.count,
+            'budget': self.budget,
+            'db_ms': round(self.db_time * 1000, 2),
+            'total_ms': round(self.elapsed * 1000, 2),
+            'n_plus_one': len(self.duplicates()),
+        }
+
+    def report(self):
+        """Resumen con las firmas N+1 y las consultas más lentas"""
+        return {**self.summary(), 'duplicates': self.duplicates(), 'slowest': self.slowest()}
+
+    def export(self, sample_rate=None):
+        """Emite la métrica estructurada y, muestreado (o siempre si algo anda mal), el detalle"""
+        config = budget_settings()
+        sample_rate = config['LOG_SAMPLE_RATE'] if sample_rate is None else sample_rate
+        summary = self.summary()
+        metrics_logger.info(json.dumps(summary, separators=(',', ':')))
+        if self.over_budget or summary['n_plus_one']:
+            logger.warning('sql budget %s', json.dumps(self.report(), default=str))
+        elif random.random() < sample_rate:
+            logger.info('sql sample %s', json.dumps(self.report(), default=str))
+
+    def check(self):
+        if self.over_budget:
+            raise QueryBudgetExceeded(
+                f'{self.label or "bloque"}: {self.count} consultas, presupuesto {self.budget}\n'
+                + json.dumps(self.report(), indent=2, default=str)
+            )
+
+
+class query_budget(QueryRecorder):
+    """
+    Falla (QueryBudgetExceeded) si el bloque ejecuta más de ``budget`` consultas.
+
+        with query_budget(3):
+            SprintBoardService().snapshot(sprint)
+    """
+
+    def __init__(self, budget, label=''):
+        super().__init__(label=label, budget=budget)
+
+    def __exit__(self, exc_type, *exc_info):
+        super().__exit__(exc_type, *exc_info)
+        if exc_type is None:
+            self.check()
+
+
+def view_budget(view_func, method):
+    """Presupuesto declarado por la vista (``query_budget``) o el de la configuración"""
+    view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+    budget = getattr(view_class, 'query_budget', None)
+    if isinstance(budget, dict):
+        action = (getattr(view_func, 'actions', None) or {}).get(method.lower())
+        budget = budget.get(action)
+    return budget if budget is not None else budget_settings()['DEFAULT_BUDGET']
+
+
+def assert_query_budget(response):
+    """
+    Helper de tests: falla si la petición superó el presupuesto de su vista.
+
+        response = client.get(f'/api/v1/sprint/sprints/{sprint.pk}/board/')
+        assert_query_budget(response)
+    """
+    recorder = getattr(response, 'sql_recorder', None)
+    if recorder is None:
+        raise AssertionError('La respuesta no pasó por QueryBudgetMiddleware')
+    recorder.check()
+    return recorder
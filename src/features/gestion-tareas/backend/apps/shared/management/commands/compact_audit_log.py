@@ -0,0 +1,27 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from apps.shared.infrastructure.audit import audit_logs, audit_settings
+
+
+class Command(BaseCommand):
+    help = 'Pliega en una instantánea por objeto las entradas de auditoría anteriores a la retención'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Días de historia detallada a conservar (AUDIT_LOG por defecto)')
+        parser.add_argument(
+            '--model',
+            action='append',
+            dest='models',
+            help='Limita la compactación a un modelo, p. ej. sprint.SprintTask (se puede repetir)',
+        )
+
+    def handle(self, *args, **options):
+        days = options['days'] if options['days'] is not None else audit_settings()['RETENTION_DAYS']
+        cutoff = timezone.now() - datetime.timedelta(days=days)
+        for label in options['models'] or list(audit_logs):
+            if label not in audit_logs:
+                raise CommandError(f'El modelo {label} no está auditado')
+            removed = audit_logs[label].compact(cutoff)
+            self.stdout.write(self.style.SUCCESS(f'{label}: {removed} entradas compactadas'))
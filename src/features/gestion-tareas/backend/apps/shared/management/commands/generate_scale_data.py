@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from benchmarks.scale_data import PRESETS, ScaleDataGenerator, scaled
+
+
+class Command(BaseCommand):
+    help = (
+        'Genera organizaciones sintéticas reproducibles (usuarios, sprints, backlog, historias '
+        'y años de métricas) en la base configurada, con bulk_create en lotes grandes'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--preset', choices=list(PRESETS), default='small', help='Tamaño de cada organización')
+        parser.add_argument('--organisations', type=int, default=1, help='Cantidad de organizaciones')
+        parser.add_argument('--seed', type=int, default=42, help='Semilla de los datos')
+        parser.add_argument('--prefix', default='carga', help='Prefijo de los nombres de usuario generados')
+        parser.add_argument('--users', type=int, help='Usuarios por organización')
+        parser.add_argument('--years', type=int, help='Años de historia (26 sprints por año)')
+        parser.add_argument('--backlog-items', type=int, help='Ítems de backlog por organización')
+        parser.add_argument('--tasks-per-sprint', type=int, help='Tareas por sprint')
+        parser.add_argument('--batch-size', type=int, default=ScaleDataGenerator.batch_size, help='Filas por INSERT')
+        parser.add_argument(
+            '--skip-search-index', action='store_true', help='No reconstruye los índices de búsqueda al terminar'
+        )
+
+    def handle(self, *args, **options):
+        size = scaled(
+            PRESETS[options['preset']],
+            users=options['users'],
+            years=options['years'],
+            backlog_items=options['backlog_items'],
+            tasks_per_sprint=options['tasks_per_sprint'],
+        )
+        if min(size.users, size.years, size.backlog_items, options['organisations'], options['batch_size']) < 1:
+            raise CommandError('Los tamaños deben ser mayores que cero')
+
+        generator = ScaleDataGenerator(
+            size,
+            organisations=options['organisations'],
+            seed=options['seed'],
+            prefix=options['prefix'],
+            batch_size=options['batch_size'],
+            search_index=not options['skip_search_index'],
+            log=self.stdout.write,
+        )
+        if generator.existing_users():
+            raise CommandError(f'Ya hay usuarios con el prefijo "{options["prefix"]}-"; use otro --prefix')
+
+        started = time.perf_counter()
+        counts = generator.generate()
+        elapsed = time.perf_counter() - started
+        total = sum(counts.values())
+        for label, count in sorted(counts.items()):
+            self.stdout.write(f'{label}: {count}')
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} filas en {elapsed:.1f} s ({total / elapsed:,.0f} filas/s)'
+        ))
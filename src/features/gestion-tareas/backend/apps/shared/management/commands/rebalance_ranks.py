@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.shared.infrastructure.ranking import rank_indexes
+
+
+class Command(BaseCommand):
+    help = 'Redistribuye las claves de orden (rank) de las tarjetas reordenables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            action='append',
+            dest='models',
+            help='Limita la redistribución a un modelo, p. ej. sprint.SprintTask (se puede repetir)',
+        )
+
+    def handle(self, *args, **options):
+        models = options['models'] or list(rank_indexes)
+        for label in models:
+            if label not in rank_indexes:
+                raise CommandError(f'No hay claves de orden para el modelo {label}')
+            total = rank_indexes[label].rebalance_all()
+            self.stdout.write(self.style.SUCCESS(f'{label}: {total} tarjetas redistribuidas'))
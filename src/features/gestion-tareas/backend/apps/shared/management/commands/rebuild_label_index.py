@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.shared.infrastructure.labels import label_indexes
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye las tablas de pertenencia de etiquetas desde los campos JSON labels'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--table',
+            action='append',
+            dest='tables',
+            help='Limita la reconstrucción a una tabla etiquetable (se puede repetir)',
+        )
+
+    def handle(self, *args, **options):
+        tables = options['tables'] or list(label_indexes)
+        for table in tables:
+            if table not in label_indexes:
+                raise CommandError(f'No hay índice de etiquetas para la tabla {table}')
+            total = label_indexes[table].rebuild()
+            self.stdout.write(self.style.SUCCESS(f'{table}: {total} etiquetas indexadas'))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from apps.shared.infrastructure.search import search_indexes
+
+
+class Command(BaseCommand):
+    help = 'Instala y reconstruye los índices de texto completo de backlog e historias'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Alias de la base de datos')
+        parser.add_argument(
+            '--table',
+            action='append',
+            dest='tables',
+            help='Limita la reconstrucción a una tabla indexada (se puede repetir)',
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        tables = options['tables'] or list(search_indexes)
+        for table in tables:
+            if table not in search_indexes:
+                raise CommandError(f'No hay índice de búsqueda para la tabla {table}')
+            backend = search_indexes[table].backend(connection)
+            if backend is None:
+                raise CommandError(f'El motor {connection.vendor} no soporta búsqueda de texto completo')
+            total = backend.rebuild()
+            self.stdout.write(self.style.SUCCESS(f'{table}: {total} documentos indexados'))
@@ -0,0 +1,84 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_databases, teardown_databases
+from apps.backlog.domain.models import BacklogItem
+from benchmarks.datasets import SCALES, Dataset, DatasetBuilder
+from benchmarks.runner import compare, dump, load, run_suite
+
+BENCHMARKS_DIR = Path(settings.BASE_DIR) / 'benchmarks'
+
+
+class Command(BaseCommand):
+    help = (
+        'Ejecuta la suite de benchmarks sobre un dataset reproducible en la base de test '
+        'y compara los resultados con la línea base (usar --settings=config.settings.benchmark)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=list(SCALES), default='smoke', help='Tamaño del dataset')
+        parser.add_argument('--seed', type=int, default=20240101, help='Semilla de las factories')
+        parser.add_argument(
+            '--only',
+            action='append',
+            dest='only',
+            help='Ejecuta sólo el caso indicado, p. ej. sprint.board (se puede repetir)',
+        )
+        parser.add_argument(
+            '--output', help='Archivo JSON de resultados (por defecto benchmarks/results/<escala>.json)',
+        )
+        parser.add_argument('--baseline', help='Línea base (por defecto benchmarks/baselines/<escala>.json)')
+        parser.add_argument('--save-baseline', action='store_true', help='Guarda los resultados como nueva línea base')
+        parser.add_argument('--tolerance', type=float, default=0.2, help='Margen relativo antes de marcar regresión')
+        parser.add_argument('--keepdb', action='store_true', help='Conserva la base de test y reutiliza su dataset')
+        parser.add_argument('--fail-on-regression', action='store_true', help='Termina con error si hay regresiones')
+
+    def handle(self, *args, **options):
+        scale = options['scale']
+        output = Path(options['output'] or BENCHMARKS_DIR / 'results' / f'{scale}.json')
+        baseline_path = Path(options['baseline'] or BENCHMARKS_DIR / 'baselines' / f'{scale}.json')
+        verbosity = options['verbosity']
+
+        old_config = setup_databases(verbosity, interactive=False, keepdb=options['keepdb'])
+        try:
+            if options['keepdb'] and BacklogItem.objects.exists():
+                self.stdout.write('Reutilizando el dataset de la base de test')
+                dataset = Dataset.load(scale, options['seed'])
+            else:
+                self.stdout.write(f'Construyendo el dataset {scale} (semilla {options["seed"]})')
+                dataset = DatasetBuilder(scale, options['seed'], log=self.stdout.write).build()
+            user = User.objects.filter(pk__in=dataset.user_ids).order_by('username').first()
+            results = run_suite(dataset, user, options['only'], log=self.stdout.write)
+        finally:
+            teardown_databases(old_config, verbosity, keepdb=options['keepdb'])
+
+        regressions = []
+        if baseline_path.exists() and not options['save_baseline']:
+            try:
+                results['comparison'] = compare(results, load(baseline_path), options['tolerance'])
+            except ValueError as exc:
+                raise CommandError(str(exc))
+            self.report(results['comparison'])
+            regressions = [name for name, row in results['comparison'].items() if row['status'] == 'regression']
+
+        dump(results, output)
+        self.stdout.write(self.style.SUCCESS(f'Resultados en {output}'))
+        if options['save_baseline']:
+            dump(results, baseline_path)
+            self.stdout.write(self.style.SUCCESS(f'Línea base actualizada en {baseline_path}'))
+        if regressions and options['fail_on_regression']:
+            raise CommandError(f'Regresiones: {", ".join(regressions)}')
+
+    def report(self, comparison):
+        for name, row in comparison.items():
+            if row['status'] == 'new':
+                self.stdout.write(f'{name}: nuevo, sin línea base')
+                continue
+            line = (
+                f'{name}: {row["baseline_ms"]} -> {row["median_ms"]} ms (x{row["ratio"]}), '
+                f'{row["baseline_queries"]} -> {row["queries"]} consultas'
+            )
+            style = {'regression': self.style.ERROR, 'improvement': self.style.SUCCESS}.get(row['status'])
+            self.stdout.write(style(line) if style else line)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.shared.infrastructure.audit import audit_logs
+
+
+class Command(BaseCommand):
+    help = 'Escribe una instantánea de las filas auditadas que no tienen entradas (anteriores a la auditoría)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Filas por lote')
+        parser.add_argument(
+            '--model',
+            action='append',
+            dest='models',
+            help='Limita la siembra a un modelo, p. ej. backlog.BacklogItem (se puede repetir)',
+        )
+
+    def handle(self, *args, **options):
+        for label in options['models'] or list(audit_logs):
+            if label not in audit_logs:
+                raise CommandError(f'El modelo {label} no está auditado')
+            written = audit_logs[label].seed(options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'{label}: {written} filas sembradas'))
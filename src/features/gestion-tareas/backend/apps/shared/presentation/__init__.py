@@ -0,0 +1 @@
+# Shared Presentation Package
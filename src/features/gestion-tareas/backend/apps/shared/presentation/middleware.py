@@ -0,0 +1,54 @@
+"""
+Middleware que mide las consultas SQL de cada petición contra el presupuesto de su
+vista y que atribuye los cambios auditados al usuario de la petición.
+"""
+from apps.shared.infrastructure.audit import audit_actor
+from apps.shared.infrastructure.sql_budget import QueryRecorder, budget_settings, view_budget
+
+
+class QueryBudgetMiddleware:
+    """
+    Registra cantidad, tiempo, N+1 y consultas más lentas por endpoint; los
+    exporta como métrica estructurada y log muestreado y agrega la cabecera
+    ``Server-Timing``. Con ``SQL_BUDGET['STRICT']`` (testing) exceder el
+    presupuesto es un error.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        config = budget_settings()
+        if not config['ENABLED']:
+            return self.get_response(request)
+
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+
+        match = request.resolver_match
+        if match is not None:
+            recorder.label = f'{request.method} {match.view_name or match._func_path}'
+            recorder.budget = view_budget(match.func, request.method)
+        else:
+            recorder.label = f'{request.method} <sin ruta>'
+
+        response['Server-Timing'] = f'db;dur={recorder.db_time * 1000:.1f};desc="{recorder.count} queries"'
+        response.sql_recorder = recorder
+        recorder.export()
+        if config['STRICT']:
+            recorder.check()
+        return response
+
+
+class AuditActorMiddleware:
+    """
+    Deja la petición como autora de los cambios auditados; el usuario se
+    resuelve sólo si la petición registra alguna entrada.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with audit_actor(request):
+            return self.get_response(request)
@@ -0,0 +1,78 @@
+"""
+Peticiones GET condicionales (ETag / Last-Modified) para las vistas de la API.
+
+El validador de un listado son los ids y ``updated_at`` de la página que se
+va a mostrar (la misma lectura por índice de la paginación keyset, sin
+``COUNT`` ni ``MAX`` sobre toda la tabla); el de un detalle es el
+``updated_at`` del objeto. Ambos incluyen la fecha del día, porque hay
+campos que dependen de ella (``is_overdue``). Si el cliente envía
+``If-None-Match`` o ``If-Modified-Since`` y el validador no cambió se
+responde 304 sin serializar.
+"""
+import datetime
+import hashlib
+
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+
+def conditional_response(request, parts, last_modified, render):
+    """Retorna 304 si el validador coincide; si no, la respuesta de ``render()`` con sus cabeceras"""
+    renderer = getattr(request, 'accepted_renderer', None)
+    today = timezone.localdate()
+    key = ':'.join([request.get_full_path(), getattr(renderer, 'format', ''), today.isoformat(), *map(str, parts)])
+    etag = quote_etag(hashlib.md5(key.encode('utf-8')).hexdigest())
+    if last_modified is not None:
+        # Lo calculado con la fecha del día cambia a medianoche aunque las filas no cambien
+        midnight = timezone.make_aware(datetime.datetime.combine(today, datetime.time.min))
+        last_modified = max(last_modified, midnight)
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = render()
+        if response.status_code != 200:
+            return response
+    response['ETag'] = etag
+    if timestamp is not None:
+        response['Last-Modified'] = http_date(timestamp)
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+class ConditionalGetMixin:
+    """Agrega ETag y Last-Modified a list y retrieve y responde 304 cuando no hubo cambios"""
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            rows = list(queryset)
+            return conditional_response(
+                request,
+                [(row.pk, row.updated_at) for row in rows],
+                max((row.updated_at for row in rows), default=None),
+                lambda: Response(self.get_serializer(rows, many=True).data),
+            )
+        paginator = self.paginator
+        parts = [
+            getattr(paginator, 'count', None), getattr(paginator, 'has_next', None),
+            getattr(paginator, 'has_previous', None), *((row.pk, row.updated_at) for row in page),
+        ]
+        return conditional_response(
+            request,
+            parts,
+            max((row.updated_at for row in page), default=None),
+            lambda: self.get_paginated_response(self.get_serializer(page, many=True).data),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        return conditional_response(
+            request,
+            [instance.pk, instance.updated_at],
+            instance.updated_at,
+            lambda: Response(self.get_serializer(instance).data),
+        )
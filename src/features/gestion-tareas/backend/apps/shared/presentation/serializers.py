@@ -0,0 +1,44 @@
+from rest_framework import serializers
+from apps.shared.domain.value_objects import Status
+
+
+class BulkLabelSerializer(serializers.Serializer):
+    """Entrada de una operación masiva de etiquetas"""
+
+    ids = serializers.ListField(child=serializers.CharField(), allow_empty=False, max_length=10000)
+    add = serializers.ListField(
+        child=serializers.CharField(max_length=100), required=False, default=list
+    )
+    remove = serializers.ListField(
+        child=serializers.CharField(max_length=100), required=False, default=list
+    )
+
+    def validate(self, attrs):
+        if not attrs['add'] and not attrs['remove']:
+            raise serializers.ValidationError('Indica etiquetas en add o remove')
+        return attrs
+
+
+class BulkTransitionSerializer(serializers.Serializer):
+    """Entrada de un cambio de estado masivo de tareas"""
+
+    ids = serializers.ListField(child=serializers.CharField(), allow_empty=False, max_length=10000)
+    status = serializers.ChoiceField(choices=[status.value for status in Status])
+
+
+class MoveSerializer(serializers.Serializer):
+    """Vecinas entre las que se ubica una tarjeta; sin ninguna, pasa al final de su columna"""
+
+    before = serializers.UUIDField(required=False, allow_null=True)
+    after = serializers.UUIDField(required=False, allow_null=True)
+
+    def validate(self, attrs):
+        if attrs.get('before') and attrs.get('before') == attrs.get('after'):
+            raise serializers.ValidationError('before y after deben ser tarjetas distintas')
+        return attrs
+
+
+class AsOfSerializer(serializers.Serializer):
+    """Momento de una consulta histórica (?at=2024-05-14T10:00:00Z)"""
+
+    at = serializers.DateTimeField()
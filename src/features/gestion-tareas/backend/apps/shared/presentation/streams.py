@@ -0,0 +1,79 @@
+"""
+Server-Sent Events sobre la aplicación ASGI de Django.
+
+Cada conexión se suscribe a sus canales en el broker y recibe los deltas
+como eventos ``event: <tipo>`` apenas se publican. Un comentario periódico
+mantiene viva la conexión a través de proxies, y el stream se cierra tras
+``max_age`` segundos para que el navegador reconecte (``EventSource`` lo
+hace solo) y no queden suscripciones de clientes desconectados.
+"""
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, StreamingHttpResponse
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+
+from apps.shared.infrastructure.realtime import get_broker
+
+
+def authenticate(request):
+    """Usuario de la sesión o del token ``Authorization``; None si no hay credenciales válidas"""
+    if request.user.is_authenticated:
+        return request.user
+    try:
+        result = TokenAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return None
+    return result[0] if result else None
+
+
+def format_event(message):
+    type = json.loads(message).get('type', 'message')
+    return f'event: {type}\ndata: {message}\n\n'
+
+
+class EventStream:
+    """Respuesta SSE para una lista de canales"""
+
+    keepalive = 15
+    max_age = 300
+    retry = 1000
+
+    def __init__(self, channels):
+        self.channels = list(channels)
+
+    async def events(self):
+        # La suscripción se abre al empezar a enviar, así el finally siempre la cierra
+        subscription = await get_broker().subscribe(self.channels)
+        try:
+            yield f'retry: {self.retry}\n: conectado\n\n'
+            deadline = time.monotonic() + self.max_age
+            while time.monotonic() < deadline:
+                message = await subscription.get(timeout=self.keepalive)
+                yield format_event(message) if message is not None else ': keepalive\n\n'
+        finally:
+            subscription.close()
+
+    def response(self):
+        response = StreamingHttpResponse(self.events(), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
+async def event_stream(request, channels):
+    """
+    Autentica y abre el stream. ``channels`` puede ser una función síncrona
+    ``channels(user)`` (puede consultar la base) que retorna None si el
+    recurso no existe.
+    """
+    user = await sync_to_async(authenticate)(request)
+    if user is None:
+        return HttpResponse(status=401)
+    if callable(channels):
+        channels = await sync_to_async(channels)(user)
+        if channels is None:
+            return HttpResponse(status=404)
+    return EventStream(channels).response()
@@ -0,0 +1,19 @@
+from django.contrib.auth.models import User
+from django.shortcuts import get_object_or_404
+from rest_framework.views import APIView
+from apps.shared.application.services import ActivityFeedService
+from apps.shared.infrastructure.pagination import FeedPagination
+
+
+class UserActivityView(APIView):
+    """Comentarios y transiciones de un usuario, del más reciente al más antiguo (paginación por cursor)"""
+
+    query_budget = 12
+
+    def get(self, request, user_id):
+        user = get_object_or_404(User.objects.only('pk'), pk=user_id)
+        paginator = FeedPagination()
+        events = paginator.paginate_feed(
+            lambda position, size: ActivityFeedService().page('user', user.pk, position, size), request
+        )
+        return paginator.get_paginated_response(events)
@@ -0,0 +1,31 @@
+from celery import shared_task
+
+from apps.shared.infrastructure.audit import checkpoint_audit_logs, compact_audit_logs, insert
+from apps.shared.infrastructure.ranking import rank_indexes
+
+
+@shared_task
+def rebalance_ranks(model_label, container):
+    """Redistribuye las claves de orden de un contenedor cuyas claves crecieron demasiado"""
+    index = rank_indexes.get(model_label)
+    if index is None:
+        return 0
+    return index.rebalance(container)
+
+
+@shared_task
+def write_audit_entries(rows):
+    """Inserta las entradas de auditoría de una transacción confirmada (AUDIT_LOG['ASYNC'])"""
+    return insert(rows)
+
+
+@shared_task
+def compact_audit_log(days=None):
+    """Pliega en instantáneas las entradas de auditoría anteriores a la retención"""
+    return compact_audit_logs(days)
+
+
+@shared_task
+def checkpoint_audit_log():
+    """Guarda el estado completo de lo modificado desde el último punto de control"""
+    return checkpoint_audit_logs()
@@ -0,0 +1,179 @@
+import asyncio
+import datetime
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from apps.backlog.domain.models import BacklogItem
+from apps.backlog.infrastructure.audit import backlog_item_audit
+from apps.shared.domain.models import AuditEntry
+from apps.shared.domain.ranking import even_ranks, needs_rebalance, rank_between
+from apps.shared.infrastructure.realtime import RESYNC, InProcessBroker, task_change
+from apps.shared.infrastructure.sql_budget import (
+    QueryBudgetExceeded, assert_query_budget, query_budget, query_shape,
+)
+
+
+class RankBetweenTests(SimpleTestCase):
+    """Las claves fraccionarias se mantienen cortas en los movimientos más comunes"""
+
+    def test_key_between_neighbours_keeps_order(self):
+        lower, upper = even_ranks(2)
+        rank = rank_between(lower, upper)
+        self.assertLess(lower, rank)
+        self.assertLess(rank, upper)
+
+    def test_repeated_moves_to_the_top_stay_short(self):
+        first = rank = even_ranks(1)[0]
+        for _ in range(300):
+            top = rank_between(None, rank)
+            self.assertLess('', top)
+            self.assertLess(top, rank)
+            self.assertFalse(top.endswith('0'))
+            rank = top
+        self.assertLessEqual(len(rank), len(first) + 10)
+        self.assertFalse(needs_rebalance(rank))
+
+    def test_repeated_appends_stay_short(self):
+        rank = None
+        for _ in range(300):
+            last = rank_between(rank, None)
+            self.assertTrue(rank is None or rank < last)
+            rank = last
+        self.assertLessEqual(len(rank), 10)
+
+    def test_out_of_order_neighbours_are_rejected(self):
+        lower, upper = even_ranks(2)
+        with self.assertRaises(ValueError):
+            rank_between(upper, lower)
+
+
+@override_settings(AUDIT_LOG={**settings.AUDIT_LOG, 'CHECKPOINT_SETTLE': 0})
+class AuditCheckpointTests(TestCase):
+    """La reconstrucción parte del punto de control y sólo repasa la historia de los objetos con entradas tardías"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item = BacklogItem.objects.create(title='Original', created_by=self.user)
+            self.item.title = 'Antes del punto de control'
+            self.item.save()
+            # La última entrada fija el momento del punto de control
+            self.other = BacklogItem.objects.create(title='Otro', created_by=self.user)
+        backlog_item_audit.checkpoint()
+        self.checkpoint = backlog_item_audit.last_checkpoint(timezone.now())
+
+    def late(self):
+        entries = backlog_item_audit.entries()
+        return set(backlog_item_audit.late_entries(entries, self.checkpoint).values_list('object_id', flat=True))
+
+    def reconstruct(self, when=None):
+        return backlog_item_audit.reconstruct(when or timezone.now(), object_ids=[self.item.pk, self.other.pk])
+
+    def test_entries_folded_into_the_checkpoint_are_not_late(self):
+        self.assertEqual(self.late(), set())
+        states = self.reconstruct()
+        self.assertEqual(states[str(self.item.pk)].title, 'Antes del punto de control')
+        self.assertEqual(states[str(self.other.pk)].title, 'Otro')
+
+    def test_changes_after_the_checkpoint_accumulate_on_it(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item.title = 'Después del punto de control'
+            self.item.save()
+
+        self.assertEqual(self.late(), set())
+        self.assertEqual(self.reconstruct()[str(self.item.pk)].title, 'Después del punto de control')
+        self.assertEqual(self.reconstruct(self.checkpoint[0])[str(self.item.pk)].title, 'Antes del punto de control')
+
+    def test_late_entry_replays_only_its_object(self):
+        self.item.description = 'Llegó tarde'
+        with self.captureOnCommitCallbacks(execute=True):
+            backlog_item_audit.record(
+                [self.item], AuditEntry.UPDATE, ['description'],
+                timestamp=self.checkpoint[0] - datetime.timedelta(microseconds=1),
+            )
+
+        self.assertEqual(self.late(), {str(self.item.pk)})
+        states = self.reconstruct()
+        self.assertEqual(states[str(self.item.pk)].description, 'Llegó tarde')
+        self.assertEqual(states[str(self.item.pk)].title, 'Antes del punto de control')
+        self.assertEqual(states[str(self.other.pk)].title, 'Otro')
+
+        # El punto siguiente la acumula y el objeto deja de ser tardío
+        backlog_item_audit.checkpoint()
+        self.checkpoint = backlog_item_audit.last_checkpoint(timezone.now())
+        self.assertEqual(self.late(), set())
+        self.assertEqual(self.reconstruct()[str(self.item.pk)].description, 'Llegó tarde')
+
+
+class InProcessBrokerTests(SimpleTestCase):
+    """Cada suscripción recibe sólo sus canales; la que se atrasa recibe un aviso de resincronizar"""
+
+    async def test_delivers_to_subscribed_channels(self):
+        broker = InProcessBroker()
+        board = await broker.subscribe(['sprint:1'])
+        backlog = await broker.subscribe(['backlog'])
+
+        broker.publish('sprint:1', 'tablero')
+
+        self.assertEqual(await board.get(timeout=1), 'tablero')
+        self.assertIsNone(await backlog.get(timeout=0.01))
+
+    async def test_overflow_asks_to_resync(self):
+        broker = InProcessBroker(queue_size=1)
+        subscription = await broker.subscribe(['sprint:1'])
+        for message in ('uno', 'dos', 'tres'):
+            broker.publish('sprint:1', message)
+        await asyncio.sleep(0)
+
+        self.assertEqual(await subscription.get(timeout=1), RESYNC)
+        self.assertIsNone(await subscription.get(timeout=0.01))
+
+    def test_task_change_kinds(self):
+        self.assertEqual(task_change(True, None, 'sprint'), 'added')
+        self.assertEqual(task_change(False, ['sprint', 'rank'], 'sprint'), 'added')
+        self.assertEqual(task_change(False, ['rank'], 'sprint'), 'moved')
+        self.assertEqual(task_change(False, ['status', 'rank', 'started_at'], 'sprint'), 'transitioned')
+        self.assertEqual(task_change(False, None, 'sprint'), 'updated')
+
+
+class QueryBudgetTests(TestCase):
+    """Cada petición se mide contra el presupuesto de su acción y las consultas repetidas se señalan"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        for index in range(6):
+            BacklogItem.objects.create(title=f'Ítem {index}', created_by=cls.user)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_query_shape_drops_values(self):
+        self.assertEqual(
+            query_shape("SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'ana' LIMIT 21"),
+            'SELECT * FROM t WHERE id IN (...) AND name = %s LIMIT %s',
+        )
+
+    def test_repeated_queries_exceed_the_budget_as_n_plus_one(self):
+        with self.assertRaises(QueryBudgetExceeded) as raised:
+            with query_budget(2, label='ítems uno por uno'):
+                for pk in BacklogItem.objects.values_list('pk', flat=True):
+                    BacklogItem.objects.get(pk=pk)
+
+        self.assertIn('ítems uno por uno: 7 consultas, presupuesto 2', str(raised.exception))
+        self.assertIn('"n_plus_one": 1', str(raised.exception))
+
+    def test_requests_are_measured_against_their_action_budget(self):
+        response = self.client.get('/api/v1/backlog/items/', HTTP_ACCEPT='application/json')
+
+        recorder = assert_query_budget(response)
+        self.assertEqual((recorder.label, recorder.budget), ('GET backlog-item-list', 6))
+        self.assertIn(f'desc="{recorder.count} queries"', response['Server-Timing'])
+
+    @override_settings(SQL_BUDGET={**settings.SQL_BUDGET, 'DEFAULT_BUDGET': 1})
+    def test_strict_mode_fails_requests_over_the_default_budget(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get('/api/v1/backlog/items/labels/', HTTP_ACCEPT='application/json')
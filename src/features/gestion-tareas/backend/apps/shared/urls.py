@@ -0,0 +1,6 @@
+from django.urls import path
+from apps.shared.presentation.views import UserActivityView
+
+urlpatterns = [
+    path('users/<int:user_id>/', UserActivityView.as_view(), name='user-activity'),
+]
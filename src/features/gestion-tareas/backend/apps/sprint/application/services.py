@@ -0,0 +1,270 @@
+from collections import defaultdict
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count, Max, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from apps.shared.domain.exceptions import BusinessRuleException
+from apps.shared.domain.models import AuditEntry
+from apps.shared.domain.value_objects import Status
+from apps.sprint.domain.models import Sprint, SprintTask, TASK_COUNTER_FIELDS
+from apps.sprint.domain.signals import tasks_rolled_over
+from apps.sprint.infrastructure.audit import sprint_task_audit
+from apps.sprint.infrastructure.ranking import sprint_task_ranks
+
+
+class SprintCounterService:
+    """Casos de uso sobre los contadores desnormalizados de Sprint"""
+
+    batch_size = 500
+
+    def reconcile(self, sprint_ids=None):
+        """Reconstruye desde cero los contadores de tareas y puntos por estado"""
+        sprints = Sprint.objects.all()
+        tasks = SprintTask.objects.all()
+        if sprint_ids:
+            sprints = sprints.filter(pk__in=sprint_ids)
+            tasks = tasks.filter(sprint_id__in=sprint_ids)
+
+        totals = {}
+        rows = (
+            tasks.order_by()
+            .values('sprint_id', 'status')
+            .annotate(tasks=Count('id'), points=Coalesce(Sum('story_points'), 0))
+        )
+        for row in rows:
+            tasks_field, points_field = TASK_COUNTER_FIELDS[row['status']]
+            counters = totals.setdefault(row['sprint_id'], {})
+            counters[tasks_field] = row['tasks']
+            counters[points_field] = row['points']
+
+        fields = [field for pair in TASK_COUNTER_FIELDS.values() for field in pair]
+        updated = 0
+        with transaction.atomic():
+            batch = []
+            for sprint in sprints.only('id', *fields).iterator(chunk_size=self.batch_size):
+                counters = totals.get(sprint.pk, {})
+                for field in fields:
+                    setattr(sprint, field, counters.get(field, 0))
+                batch.append(sprint)
+                if len(batch) >= self.batch_size:
+                    updated += Sprint.objects.bulk_update(batch, fields)
+                    batch = []
+            if batch:
+                updated += Sprint.objects.bulk_update(batch, fields)
+        return updated
+
+
+class SprintRolloverService:
+    """Traspasa las tareas sin terminar de un sprint al siguiente en bloque"""
+
+    def rollover(self, sprint, target, user=None):
+        """
+        Mueve las tareas no hechas de ``sprint`` a ``target`` con un único UPDATE.
+
+        Si el ítem del backlog ya tiene tarea en ``target`` la tarea se omite y
+        queda en el sprint original, así el resultado no depende del orden.
+        Cada tarea conserva su responsable y su orden relativo y pasa al final
+        de su columna en ``target`` con claves nuevas tras la última de la columna.
+        """
+        if sprint.pk == target.pk:
+            raise BusinessRuleException('El sprint destino debe ser distinto del original')
+
+        with transaction.atomic():
+            # Bloquea ambos sprints en orden fijo para evitar interbloqueos entre traspasos
+            list(Sprint.objects.select_for_update().filter(pk__in=[sprint.pk, target.pk]).order_by('pk'))
+            taken = SprintTask.objects.filter(sprint_id=target.pk).values('backlog_item_id')
+            pending = SprintTask.objects.filter(sprint_id=sprint.pk).exclude(status=Status.DONE.value)
+            tasks = list(
+                pending.exclude(backlog_item_id__in=taken)
+                .select_related('backlog_item')
+                .select_for_update(of=('self',))
+                .order_by('rank', 'created_at', 'pk')
+            )
+            skipped = list(pending.filter(backlog_item_id__in=taken).order_by('pk').values_list('pk', flat=True))
+            if not tasks:
+                return {'moved': [], 'skipped': skipped}
+
+            ranks = sprint_task_ranks.append(tasks, sprint_id=target.pk)
+            now = timezone.now()
+            SprintTask.objects.filter(pk__in=[task.pk for task in tasks]).update(
+                sprint_id=target.pk, rank=sprint_task_ranks.rank_expression(ranks), updated_at=now
+            )
+
+            totals = defaultdict(int)
+            for task in tasks:
+                task.sprint_id = target.pk
+                task.rank = ranks[task.pk]
+                task.updated_at = now
+                tasks_field, points_field = TASK_COUNTER_FIELDS[task.status]
+                totals[tasks_field] += 1
+                totals[points_field] += task.story_points or 0
+            Sprint.apply_task_counters(sprint.pk, {field: -value for field, value in totals.items()})
+            Sprint.apply_task_counters(target.pk, totals)
+            tasks_rolled_over.send(
+                sender=Sprint, from_sprint_id=sprint.pk, to_sprint_id=target.pk, tasks=tasks
+            )
+
+            sprint_task_audit.record(tasks, AuditEntry.UPDATE, ['sprint', 'rank'], actor=user, timestamp=now)
+        return {'moved': [task.pk for task in tasks], 'skipped': skipped}
+
+
+class SprintBoardService:
+    """Arma el tablero completo de un sprint con un número fijo de consultas"""
+
+    @staticmethod
+    def aggregate_of(queryset, path, aggregate, outer='pk'):
+        """Agregado de las filas de ``queryset`` cuyo ``path`` es ``outer`` de la fila externa, como subconsulta"""
+        return Subquery(
+            queryset.filter(**{path: OuterRef(outer)}).order_by()
+            .values(path).annotate(value=aggregate).values('value')
+        )
+
+    def snapshot(self, sprint):
+        """
+        Tablero agrupado por estado en una sola consulta: las tarjetas con ítem
+        del backlog y responsable por JOIN y su checklist como subconsultas por
+        ítem (índice de historias por ítem), sin importar el tamaño del tablero.
+        """
+        from apps.historias.domain.models import StoryTask
+
+        def checklist(aggregate):
+            return Coalesce(
+                self.aggregate_of(StoryTask.objects, 'story__backlog_item_id', aggregate, outer='backlog_item_id'), 0
+            )
+
+        tasks = (
+            SprintTask.objects.filter(sprint_id=sprint.pk)
+            .select_related('backlog_item', 'assigned_to')
+            .annotate(
+                checklist_total=checklist(Count('id')),
+                checklist_done=checklist(Count('id', filter=Q(status=Status.DONE.value))),
+            )
+            .order_by('status', 'rank', 'created_at')
+        )
+
+        columns = {status.value: [] for status in Status}
+        for task in tasks:
+            columns[task.status].append(self.card(
+                task, task.backlog_item, task.assigned_to,
+                {'total': task.checklist_total, 'done': task.checklist_done},
+            ))
+
+        return {
+            'sprint': {
+                'id': sprint.pk,
+                'name': sprint.name,
+                'status': sprint.status,
+                'goal': sprint.goal,
+                'velocity': sprint.velocity,
+                'progress_percentage': sprint.progress_percentage,
+                'total_tasks': sprint.total_tasks,
+                'total_points': sprint.total_points,
+                'done_points': sprint.done_points,
+            },
+            'columns': [
+                {'status': status.value, 'key': status.name, 'tasks': columns[status.value]}
+                for status in Status
+            ],
+        }
+
+    def as_of(self, sprint, when):
+        """
+        Tablero del sprint tal como estaba en ``when``, reconstruido desde la
+        auditoría de tareas, ítems y checklists (lecturas acotadas por los
+        puntos de control, sin repasar toda la historia). Los totales salen de
+        las tareas reconstruidas; el resto de los datos del sprint son actuales.
+        """
+        from apps.backlog.domain.models import BacklogItem
+        from apps.backlog.infrastructure.audit import backlog_item_audit
+        from apps.historias.domain.models import UserStory
+        from apps.historias.infrastructure.audit import story_task_audit
+
+        tasks = sorted(
+            sprint_task_audit.reconstruct(when, containers=[sprint.pk]).values(),
+            key=lambda task: (task.rank, task.created_at or when),
+        )
+        item_ids = {task.backlog_item_id for task in tasks}
+        items = {item.pk: item for item in backlog_item_audit.reconstruct(when, object_ids=item_ids).values()}
+        # Ítems sin historia (anteriores a la auditoría): se muestran con sus datos actuales
+        items.update(BacklogItem.objects.in_bulk(item_ids - set(items)))
+        stories = dict(UserStory.objects.filter(backlog_item_id__in=item_ids).values_list('pk', 'backlog_item_id'))
+        checklists = defaultdict(lambda: {'done': 0, 'total': 0})
+        for story_task in story_task_audit.reconstruct(when, containers=stories).values():
+            checklist = checklists[stories[story_task.story_id]]
+            checklist['total'] += 1
+            checklist['done'] += story_task.status == Status.DONE.value
+        users = User.objects.in_bulk({task.assigned_to_id for task in tasks if task.assigned_to_id})
+
+        columns = {status.value: [] for status in Status}
+        for task in tasks:
+            columns[task.status].append(self.card(
+                task, items.get(task.backlog_item_id), users.get(task.assigned_to_id),
+                checklists.get(task.backlog_item_id, {}),
+            ))
+        done = columns[Status.DONE.value]
+        total_points = sum(task.story_points or 0 for task in tasks)
+        return {
+            'as_of': when,
+            'sprint': {
+                'id': sprint.pk,
+                'name': sprint.name,
+                'goal': sprint.goal,
+                'progress_percentage': int(len(done) / len(tasks) * 100) if tasks else 0,
+                'total_tasks': len(tasks),
+                'total_points': total_points,
+                'done_points': sum(card['story_points'] or 0 for card in done),
+            },
+            'columns': [
+                {'status': status.value, 'key': status.name, 'tasks': columns[status.value]}
+                for status in Status
+            ],
+        }
+
+    def card(self, task, item, assignee, checklist):
+        return {
+            'id': task.pk,
+            'rank': task.rank,
+            'priority': task.priority,
+            'story_points': task.story_points,
+            'started_at': task.started_at,
+            'completed_at': task.completed_at,
+            'backlog_item': {
+                'id': task.backlog_item_id,
+                'title': item.title if item else None,
+                'labels': item.labels if item else [],
+            },
+            'assignee': self.member(assignee),
+            'checklist': {'done': checklist.get('done', 0), 'total': checklist.get('total', 0)},
+        }
+
+    def version(self, sprint):
+        """
+        Validador barato del tablero: fechas máximas y cantidades de lo que
+        muestra, como subconsultas de una única lectura del sprint.
+        """
+        from apps.historias.domain.models import StoryTask
+        # Un ítem tiene a lo sumo una tarea por sprint: el JOIN no repite tareas de checklist
+        checklist, path = StoryTask.objects, 'story__backlog_item__sprint_tasks__sprint_id'
+        row = Sprint.objects.filter(pk=sprint.pk).values(
+            cards=self.aggregate_of(SprintTask.objects, 'sprint_id', Count('id')),
+            last=self.aggregate_of(SprintTask.objects, 'sprint_id', Max('updated_at')),
+            items=self.aggregate_of(SprintTask.objects, 'sprint_id', Max('backlog_item__updated_at')),
+            checklist=self.aggregate_of(checklist, path, Count('id')),
+            checklist_last=self.aggregate_of(checklist, path, Max('updated_at')),
+        ).first() or {}
+        dates = [
+            date for date in (sprint.updated_at, row.get('last'), row.get('items'), row.get('checklist_last')) if date
+        ]
+        parts = [
+            sprint.pk, *dates, row.get('cards') or 0, row.get('checklist') or 0,
+            sprint.total_tasks, sprint.total_points, sprint.done_tasks, sprint.done_points,
+        ]
+        return parts, max(dates) if dates else None
+
+    def member(self, user):
+        if user is None:
+            return None
+        name = user.get_full_name() or user.username
+        initials = ''.join(part[0] for part in name.split()[:2]).upper()
+        return {'id': user.pk, 'username': user.username, 'name': name, 'initials': initials}
@@ -5,3 +5,10 @@ class SprintConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.sprint'
     verbose_name = 'Sprint'
+
+    def ready(self):
+        from apps.sprint.infrastructure import activity, realtime, signals  # noqa: F401
+        from apps.sprint.infrastructure.audit import sprint_task_audit
+        from apps.sprint.infrastructure.ranking import sprint_task_ranks
+        sprint_task_ranks.connect()
+        sprint_task_audit.connect()
@@ -1,6 +1,19 @@
-from django.db import models
-from apps.shared.domain.entities import BaseEntity
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+from apps.shared.domain.entities import BaseEntity, SyncsPriorityRank, TracksLoadedValues
+from apps.shared.domain.fields import PriorityRankField
 from apps.shared.domain.value_objects import Priority, Status
+from apps.sprint.domain.signals import sprint_completed, task_moved, task_status_changed
+
+
+# Contadores desnormalizados de Sprint por estado de tarea: (tareas, puntos)
+TASK_COUNTER_FIELDS = {
+    Status.TODO.value: ('todo_tasks', 'todo_points'),
+    Status.IN_PROGRESS.value: ('in_progress_tasks', 'in_progress_points'),
+    Status.IN_REVIEW.value: ('in_review_tasks', 'in_review_points'),
+    Status.DONE.value: ('done_tasks', 'done_points'),
+}
 
 
 class Sprint(BaseEntity):
@@ -24,6 +37,16 @@ class Sprint(BaseEntity):
         verbose_name='Estado'
     )
     velocity = models.IntegerField(default=0, verbose_name='Velocidad')
+    
+    # Contadores de tareas por estado, mantenidos por SprintTask
+    todo_tasks = models.IntegerField(default=0, verbose_name='Tareas por hacer')
+    in_progress_tasks = models.IntegerField(default=0, verbose_name='Tareas en progreso')
+    in_review_tasks = models.IntegerField(default=0, verbose_name='Tareas en revisión')
+    done_tasks = models.IntegerField(default=0, verbose_name='Tareas hechas')
+    todo_points = models.IntegerField(default=0, verbose_name='Puntos por hacer')
+    in_progress_points = models.IntegerField(default=0, verbose_name='Puntos en progreso')
+    in_review_points = models.IntegerField(default=0, verbose_name='Puntos en revisión')
+    done_points = models.IntegerField(default=0, verbose_name='Puntos hechos')
     created_by = models.ForeignKey(
         'auth.User',
         on_delete=models.CASCADE,
@@ -35,7 +58,10 @@ class Sprint(BaseEntity):
         db_table = 'sprints'
         verbose_name = 'Sprint'
         verbose_name_plural = 'Sprints'
-        ordering = ['-start_date']
+        ordering = ['-start_date', 'id']
+        indexes = [
+            models.Index(fields=['-start_date', 'id'], name='sprints_keyset_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.start_date} - {self.end_date})"
@@ -57,12 +83,38 @@ class Sprint(BaseEntity):
         if self.status == 'completed':
             return 100
         
-        total_tasks = self.tasks.count()
+        total_tasks = self.total_tasks
         if total_tasks == 0:
             return 0
         
-        completed_tasks = self.tasks.filter(status=Status.DONE.value).count()
-        return int((completed_tasks / total_tasks) * 100)
+        return int((self.done_tasks / total_tasks) * 100)
+    
+    @property
+    def total_tasks(self):
+        """Total de tareas del sprint según los contadores"""
+        return self.todo_tasks + self.in_progress_tasks + self.in_review_tasks + self.done_tasks
+    
+    @property
+    def total_points(self):
+        """Total de puntos del sprint según los contadores"""
+        return self.todo_points + self.in_progress_points + self.in_review_points + self.done_points
+    
+    @staticmethod
+    def task_counter_delta(status, story_points, sign=1):
+        """Retorna el ajuste de contadores que aporta una tarea en un estado"""
+        tasks_field, points_field = TASK_COUNTER_FIELDS[status]
+        return {tasks_field: sign, points_field: sign * (story_points or 0)}
+    
+    @classmethod
+    def apply_task_counters(cls, sprint_id, *deltas):
+        """Aplica uno o varios ajustes de contadores en un único UPDATE (que cambia la versión del sprint)"""
+        changes = {}
+        for delta in deltas:
+            for field, value in delta.items():
+                changes[field] = changes.get(field, 0) + value
+        changes = {field: F(field) + value for field, value in changes.items() if value}
+        if changes:
+            cls.objects.filter(pk=sprint_id).update(**changes, updated_at=timezone.now())
     
     def start_sprint(self):
         """Inicia el sprint"""
@@ -73,11 +125,13 @@ class Sprint(BaseEntity):
     def complete_sprint(self):
         """Completa el sprint"""
         if self.status in ['active', 'review']:
-            self.status = 'completed'
-            self.save(update_fields=['status'])
+            with transaction.atomic():
+                self.status = 'completed'
+                self.save(update_fields=['status'])
+                sprint_completed.send(sender=Sprint, sprint=self)
 
 
-class SprintTask(BaseEntity):
+class SprintTask(SyncsPriorityRank, TracksLoadedValues, BaseEntity):
     """Entidad SprintTask para gestionar tareas dentro de un sprint"""
     
     sprint = models.ForeignKey(
@@ -126,15 +180,21 @@ class SprintTask(BaseEntity):
         default=Priority.MEDIUM.value,
         verbose_name='Prioridad'
     )
+    priority_rank = PriorityRankField()
     started_at = models.DateTimeField(null=True, blank=True, verbose_name='Iniciado en')
     completed_at = models.DateTimeField(null=True, blank=True, verbose_name='Completado en')
+    rank = models.CharField(max_length=255, blank=True, default='', verbose_name='Orden')
     
     class Meta:
         db_table = 'sprint_tasks'
         verbose_name = 'Tarea del Sprint'
         verbose_name_plural = 'Tareas del Sprint'
-        ordering = ['priority', 'created_at']
+        ordering = ['rank', 'created_at']
         unique_together = ['sprint', 'backlog_item']
+        indexes = [
+            models.Index(fields=['sprint', 'status', 'rank', 'created_at'], name='sprint_tasks_column_rank_idx'),
+            models.Index(fields=['sprint', 'priority_rank', 'created_at', 'id'], name='sprint_tasks_priority_idx'),
+        ]
     
     def __str__(self):
         return f"{self.backlog_item.title} - {self.sprint.name}"
@@ -144,26 +204,87 @@ class SprintTask(BaseEntity):
         """Verifica si la tarea está completada"""
         return self.status == Status.DONE.value
     
+    @property
+    def is_bug(self):
+        """Verifica si el ítem del backlog de la tarea está etiquetado como error"""
+        return any(str(label).strip().lower() == 'bug' for label in self.backlog_item.labels or [])
+    
+    @property
+    def duration_hours(self):
+        """Horas entre el inicio (o creación) y la finalización de la tarea"""
+        return self.hours_between(self.started_at, self.completed_at)
+    
+    def hours_between(self, started_at, completed_at):
+        """Duración con otras marcas de tiempo, p. ej. las previas a una transición"""
+        if not completed_at:
+            return 0
+        started_at = started_at or self.created_at
+        return max((completed_at - started_at).total_seconds() / 3600, 0)
+    
     def start_task(self):
-        """Inicia la tarea"""
+        """Inicia la tarea; retorna si cambió"""
         if self.status == Status.TODO.value:
-            from django.utils import timezone
-            self.status = Status.IN_PROGRESS.value
-            self.started_at = timezone.now()
-            self.save(update_fields=['status', 'started_at'])
+            return self._transition(Status.IN_PROGRESS.value, started_at=timezone.now())
+        return False
     
     def complete_task(self):
-        """Completa la tarea"""
+        """Completa la tarea; retorna si cambió"""
         if self.status == Status.IN_PROGRESS.value:
-            from django.utils import timezone
-            self.status = Status.DONE.value
-            self.completed_at = timezone.now()
-            self.save(update_fields=['status', 'completed_at'])
+            return self._transition(Status.DONE.value, completed_at=timezone.now())
+        return False
+    
+    def move_between(self, before=None, after=None):
+        """Reordena la tarjeta dentro de su columna entre dos tareas (por id)"""
+        from apps.sprint.infrastructure.ranking import sprint_task_ranks
+        return sprint_task_ranks.move(self, before, after)
     
     def move_to_sprint(self, new_sprint):
         """Mueve la tarea a otro sprint"""
-        self.sprint = new_sprint
-        self.save(update_fields=['sprint'])
+        old_sprint_id = self.sprint_id
+        with transaction.atomic():
+            self.sprint = new_sprint
+            self.rank = ''
+            self.save(update_fields=['sprint', 'rank'])
+            Sprint.apply_task_counters(
+                old_sprint_id, Sprint.task_counter_delta(self.status, self.story_points, -1)
+            )
+            Sprint.apply_task_counters(
+                new_sprint.pk, Sprint.task_counter_delta(self.status, self.story_points)
+            )
+            # post_save sólo conoce el sprint nuevo; el anterior también cambió
+            task_moved.send(sender=SprintTask, task=self, from_sprint_id=old_sprint_id, to_sprint_id=new_sprint.pk)
+    
+    def _transition(self, new_status, **timestamps):
+        """
+        Cambia el estado con un UPDATE condicional al estado leído, como
+        BulkTransitionService: si otra petición ya la cambió no se toca nada.
+        Los contadores del sprint se ajustan sólo cuando la fila cambió y la
+        tarjeta pasa al final de la columna destino.
+        """
+        from apps.sprint.infrastructure.ranking import sprint_task_ranks
+        old_status = self.status
+        previous = {'started_at': self.started_at, 'completed_at': self.completed_at}
+        with transaction.atomic():
+            changes = {
+                'status': new_status,
+                **timestamps,
+                'rank': sprint_task_ranks.append([self], status=new_status)[self.pk],
+                'updated_at': timezone.now(),
+            }
+            if not SprintTask.objects.filter(pk=self.pk, status=old_status).update(**changes):
+                return False
+            for field, value in changes.items():
+                setattr(self, field, value)
+            self.refresh_loaded_values(*changes)
+            Sprint.apply_task_counters(
+                self.sprint_id,
+                Sprint.task_counter_delta(old_status, self.story_points, -1),
+                Sprint.task_counter_delta(new_status, self.story_points),
+            )
+            task_status_changed.send(
+                sender=SprintTask, task=self, from_status=old_status, to_status=new_status, previous=previous
+            )
+        return True
 
 
 class SprintMember(BaseEntity):
@@ -0,0 +1,26 @@
+"""
+Eventos de dominio del módulo de sprint.
+"""
+from django.dispatch import Signal
+
+
+# Emitida dentro de la transacción que cambia el estado de una SprintTask. La
+# tarea ya tiene los valores nuevos; ``previous`` guarda los de antes.
+# Argumentos: task, from_status, to_status, previous
+task_status_changed = Signal()
+
+# Emitida dentro de la transacción que cierra un Sprint.
+# Argumentos: sprint
+sprint_completed = Signal()
+
+# Emitida dentro de la transacción que traspasa las tareas sin terminar de un
+# sprint a otro. Argumentos: from_sprint_id, to_sprint_id, tasks
+tasks_rolled_over = Signal()
+
+# Emitida dentro de la transacción que lleva una SprintTask a otro sprint, con
+# los contadores de ambos ya ajustados. Argumentos: task, from_sprint_id, to_sprint_id
+task_moved = Signal()
+
+# Emitida al guardar una SprintTask que cambia sus puntos sin cambiar de sprint,
+# con los contadores ya ajustados. Argumentos: task, from_points, to_points
+task_points_changed = Signal()
@@ -0,0 +1,13 @@
+from apps.shared.infrastructure.activity import TransitionSource, register_activity_source
+from apps.sprint.infrastructure.audit import sprint_task_audit
+
+
+sprint_task_activity = register_activity_source(TransitionSource(
+    'sprint_task_transition',
+    sprint_task_audit,
+    'sprint_task',
+    {
+        'sprint': lambda sprint_id: ('container_id', str(sprint_id)),
+        'user': lambda user_id: ('actor_id', user_id),
+    },
+))
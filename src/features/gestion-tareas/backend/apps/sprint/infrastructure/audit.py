@@ -0,0 +1,14 @@
+from django.dispatch import receiver
+from apps.shared.domain.models import AuditEntry
+from apps.shared.infrastructure.audit import AuditLog, register_audit_log
+from apps.sprint.domain.models import SprintTask
+from apps.sprint.domain.signals import task_status_changed
+
+
+sprint_task_audit = register_audit_log(AuditLog(SprintTask, container='sprint'))
+
+
+@receiver(task_status_changed, sender=SprintTask)
+def audit_task_transition(sender, task, **kwargs):
+    """La transición individual es un UPDATE condicional: se registra aquí y no en post_save"""
+    sprint_task_audit.record([task], AuditEntry.UPDATE, ['status', 'started_at', 'completed_at', 'rank'])
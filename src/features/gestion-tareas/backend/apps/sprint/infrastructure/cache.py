@@ -0,0 +1,5 @@
+from apps.shared.infrastructure.cache import CachedAggregate, register_cached_aggregate
+
+
+# El tablero muestra títulos del backlog y checklists: también depende de 'boards'
+sprint_board_cache = register_cached_aggregate(CachedAggregate('sprint_board', tags=['boards']))
@@ -0,0 +1,6 @@
+from apps.shared.infrastructure.ranking import RankIndex, register_rank_index
+from apps.sprint.domain.models import SprintTask
+
+
+# Cada columna del tablero es un estado dentro de un sprint
+sprint_task_ranks = register_rank_index(RankIndex(SprintTask, ('sprint_id', 'status')))
@@ -0,0 +1,96 @@
+"""
+Deltas en tiempo real de los tableros de sprint.
+
+Cada tarjeta viaja con los campos que el tablero necesita para ubicarla
+(columna, orden, responsable y puntos); los cambios masivos envían sólo
+los ids afectados.
+"""
+from collections import defaultdict
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.shared.domain.signals import tasks_status_changed
+from apps.shared.infrastructure.realtime import publish, sprint_channel, task_change
+from apps.sprint.domain.models import Sprint, SprintTask
+from apps.sprint.domain.signals import task_moved, task_status_changed, tasks_rolled_over
+
+
+def card_delta(task):
+    return {
+        'id': task.pk,
+        'backlog_item': task.backlog_item_id,
+        'status': task.status,
+        'rank': task.rank,
+        'assigned_to': task.assigned_to_id,
+        'story_points': task.story_points,
+        'priority': task.priority,
+    }
+
+
+def item_channels(item_ids):
+    """Canales de los tableros que muestran alguno de los ítems del backlog"""
+    sprint_ids = (
+        SprintTask.objects.filter(backlog_item_id__in=item_ids)
+        .order_by().values_list('sprint_id', flat=True).distinct()
+    )
+    return [sprint_channel(sprint_id) for sprint_id in sprint_ids]
+
+
+@receiver(post_save, sender=SprintTask)
+def publish_task_saved(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    change = task_change(created, update_fields, 'sprint')
+    if change in ('moved', 'transitioned'):
+        data = {'id': instance.pk, 'status': instance.status, 'rank': instance.rank}
+    else:
+        data = card_delta(instance)
+    publish([sprint_channel(instance.sprint_id)], f'task.{change}', **data)
+
+
+@receiver(post_delete, sender=SprintTask)
+def publish_task_deleted(sender, instance, **kwargs):
+    publish([sprint_channel(instance.sprint_id)], 'task.removed', id=instance.pk)
+
+
+@receiver(task_status_changed, sender=SprintTask)
+def publish_task_transitioned(sender, task, **kwargs):
+    # La transición individual es un UPDATE condicional: no pasa por post_save
+    publish(
+        [sprint_channel(task.sprint_id)], 'task.transitioned', id=task.pk, status=task.status, rank=task.rank
+    )
+
+
+@receiver(tasks_status_changed, sender=SprintTask)
+def publish_tasks_transitioned(sender, tasks, to_status, **kwargs):
+    by_sprint = defaultdict(list)
+    for task in tasks:
+        by_sprint[task.sprint_id].append(task)
+    for sprint_id, group in by_sprint.items():
+        # Las tarjetas pasan al final de la columna destino con claves nuevas
+        publish(
+            [sprint_channel(sprint_id)], 'tasks.transitioned',
+            ids=[task.pk for task in group], ranks=[task.rank for task in group], status=to_status,
+        )
+
+
+@receiver(task_moved, sender=SprintTask)
+def publish_task_moved(sender, task, from_sprint_id, **kwargs):
+    # post_save ya la anunció en el tablero destino
+    publish([sprint_channel(from_sprint_id)], 'task.removed', id=task.pk)
+
+
+@receiver(tasks_rolled_over, sender=Sprint)
+def publish_tasks_rolled_over(sender, from_sprint_id, to_sprint_id, tasks, **kwargs):
+    ids = [task.pk for task in tasks]
+    publish([sprint_channel(from_sprint_id)], 'tasks.removed', ids=ids)
+    # Las claves de orden cambian en el UPDATE: el tablero destino pide las tarjetas por id
+    publish([sprint_channel(to_sprint_id)], 'tasks.added', ids=ids)
+
+
+@receiver(post_save, sender=Sprint)
+def publish_sprint_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw and not created:
+        publish(
+            [sprint_channel(instance.pk)], 'sprint.updated',
+            id=instance.pk, name=instance.name, status=instance.status,
+        )
@@ -0,0 +1,127 @@
+"""
+Receptores que mantienen los contadores de Sprint al crear, eliminar,
+editar (estado o puntos) o cambiar de estado tareas en forma masiva, e
+invalidan los agregados cacheados de los sprints afectados. Un cambio de
+puntos se anuncia con ``task_points_changed`` para las métricas.
+"""
+from collections import defaultdict
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from apps.shared.domain.signals import tasks_status_changed
+from apps.shared.infrastructure.cache import invalidate_tags
+from apps.sprint.domain.models import TASK_COUNTER_FIELDS, Sprint, SprintTask
+from apps.sprint.domain.signals import (
+    sprint_completed, task_moved, task_points_changed, task_status_changed, tasks_rolled_over,
+)
+
+
+COUNTED_FIELDS = ('sprint_id', 'status', 'story_points')
+
+
+@receiver(pre_save, sender=SprintTask)
+def stage_counter_change(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Calcula el ajuste de contadores de un guardado que cambia el estado o los puntos"""
+    instance._counter_deltas = ()
+    instance._points_change = None
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not {'status', 'story_points'} & set(update_fields):
+        return
+    loaded = getattr(instance, '_loaded_values', None)
+    if loaded is None or any(field not in loaded for field in COUNTED_FIELDS):
+        loaded = SprintTask.objects.filter(pk=instance.pk).values(*COUNTED_FIELDS).first()
+        if loaded is None:
+            return
+    # Cambiar de sprint ajusta sus propios contadores (move_to_sprint, traspaso)
+    if loaded['sprint_id'] != instance.sprint_id:
+        return
+    if (loaded['status'], loaded['story_points']) != (instance.status, instance.story_points):
+        instance._counter_deltas = (
+            Sprint.task_counter_delta(loaded['status'], loaded['story_points'], -1),
+            Sprint.task_counter_delta(instance.status, instance.story_points),
+        )
+    if loaded['story_points'] != instance.story_points:
+        instance._points_change = (loaded['story_points'], instance.story_points)
+
+
+@receiver(post_save, sender=SprintTask)
+def count_saved_task(sender, instance, created, raw=False, **kwargs):
+    """Suma la tarea recién creada a los contadores de su sprint o aplica el ajuste de su edición"""
+    if raw:
+        return
+    if created:
+        Sprint.apply_task_counters(
+            instance.sprint_id, Sprint.task_counter_delta(instance.status, instance.story_points)
+        )
+    elif getattr(instance, '_counter_deltas', ()):
+        Sprint.apply_task_counters(instance.sprint_id, *instance._counter_deltas)
+        instance._counter_deltas = ()
+        if instance._points_change is not None:
+            from_points, to_points = instance._points_change
+            instance._points_change = None
+            task_points_changed.send(sender=SprintTask, task=instance, from_points=from_points, to_points=to_points)
+
+
+@receiver(post_delete, sender=SprintTask)
+def discount_deleted_task(sender, instance, **kwargs):
+    """Resta la tarea eliminada de los contadores de su sprint"""
+    Sprint.apply_task_counters(
+        instance.sprint_id, Sprint.task_counter_delta(instance.status, instance.story_points, -1)
+    )
+
+
+@receiver(tasks_status_changed, sender=SprintTask)
+def count_transitioned_tasks(sender, tasks, from_status, to_status, **kwargs):
+    """Mueve las tareas entre los contadores de estado con un UPDATE por sprint"""
+    totals = defaultdict(lambda: [0, 0])
+    for task in tasks:
+        totals[task.sprint_id][0] += 1
+        totals[task.sprint_id][1] += task.story_points or 0
+    from_fields, to_fields = TASK_COUNTER_FIELDS[from_status], TASK_COUNTER_FIELDS[to_status]
+    for sprint_id, (count, points) in totals.items():
+        Sprint.apply_task_counters(
+            sprint_id,
+            {from_fields[0]: -count, from_fields[1]: -points},
+            {to_fields[0]: count, to_fields[1]: points},
+        )
+
+
+def invalidate_sprints(*sprint_ids):
+    invalidate_tags('metrics', *(f'sprint:{sprint_id}' for sprint_id in sprint_ids))
+
+
+@receiver([post_save, post_delete], sender=Sprint)
+def invalidate_sprint_cache(sender, instance, **kwargs):
+    invalidate_tags('sprints')
+    invalidate_sprints(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=SprintTask)
+def invalidate_task_cache(sender, instance, **kwargs):
+    invalidate_sprints(instance.sprint_id)
+
+
+@receiver(task_status_changed, sender=SprintTask)
+def invalidate_transition_cache(sender, task, **kwargs):
+    invalidate_sprints(task.sprint_id)
+
+
+@receiver(tasks_status_changed, sender=SprintTask)
+def invalidate_bulk_transition_cache(sender, tasks, **kwargs):
+    invalidate_sprints(*{task.sprint_id for task in tasks})
+
+
+@receiver(task_moved, sender=SprintTask)
+def invalidate_moved_task_cache(sender, task, from_sprint_id, to_sprint_id, **kwargs):
+    invalidate_sprints(from_sprint_id, to_sprint_id)
+
+
+@receiver(tasks_rolled_over, sender=Sprint)
+def invalidate_rollover_cache(sender, from_sprint_id, to_sprint_id, **kwargs):
+    invalidate_sprints(from_sprint_id, to_sprint_id)
+
+
+@receiver(sprint_completed, sender=Sprint)
+def invalidate_completed_cache(sender, sprint, **kwargs):
+    invalidate_tags('sprints')
+    invalidate_sprints(sprint.pk)
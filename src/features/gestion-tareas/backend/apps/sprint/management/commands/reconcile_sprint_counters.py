@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from apps.sprint.application.services import SprintCounterService
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye los contadores de tareas y puntos por estado de cada sprint'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sprint',
+            action='append',
+            dest='sprint_ids',
+            help='Limita la reconciliación a un sprint (se puede repetir)',
+        )
+
+    def handle(self, *args, **options):
+        updated = SprintCounterService().reconcile(options['sprint_ids'])
+        self.stdout.write(self.style.SUCCESS(f'Contadores reconciliados en {updated} sprints'))
@@ -0,0 +1,2 @@
+"""Registro de los modelos del dominio para que Django los descubra (migraciones, syncdb)"""
+from apps.sprint.domain.models import *  # noqa: F401,F403
@@ -0,0 +1,23 @@
+from rest_framework import serializers
+from apps.sprint.domain.models import Sprint
+
+
+class SprintSerializer(serializers.ModelSerializer):
+    """Serializador de sprints"""
+
+    progress_percentage = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Sprint
+        fields = [
+            'id', 'name', 'description', 'start_date', 'end_date', 'goal',
+            'status', 'velocity', 'progress_percentage', 'created_by',
+            'created_at', 'updated_at',
+        ]
+        read_only_fields = ['id', 'velocity', 'created_by', 'created_at', 'updated_at']
+
+
+class SprintRolloverSerializer(serializers.Serializer):
+    """Entrada del traspaso de tareas sin terminar a otro sprint"""
+
+    target = serializers.PrimaryKeyRelatedField(queryset=Sprint.objects.exclude(status='completed'))
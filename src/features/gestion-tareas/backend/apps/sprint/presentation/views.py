@@ -0,0 +1,125 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+from apps.shared.application.services import ActivityFeedService, BulkTransitionService
+from apps.shared.domain.exceptions import BusinessRuleException, ValidationException
+from apps.shared.infrastructure.pagination import FeedPagination, KeysetPagination
+from apps.shared.infrastructure.realtime import sprint_channel
+from apps.shared.presentation.mixins import ConditionalGetMixin, conditional_response
+from apps.shared.presentation.serializers import AsOfSerializer, BulkTransitionSerializer, MoveSerializer
+from apps.shared.presentation.streams import event_stream
+from apps.sprint.application.services import SprintBoardService, SprintRolloverService
+from apps.sprint.domain.models import Sprint, SprintTask
+from apps.sprint.infrastructure.cache import sprint_board_cache
+from apps.sprint.presentation.serializers import SprintRolloverSerializer, SprintSerializer
+
+
+class SprintPagination(KeysetPagination):
+    """Paginación keyset según el orden por defecto de Sprint"""
+
+    ordering = ('-start_date', 'id')
+
+
+class SprintViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    """API de sprints"""
+
+    queryset = Sprint.objects.all()
+    serializer_class = SprintSerializer
+    pagination_class = SprintPagination
+    filterset_fields = ['status']
+    search_fields = ['name', 'goal']
+    # Consultas por acción, incluida la autenticación (ver QueryBudgetMiddleware). El tablero
+    # histórico lee dos veces por auditoría (punto de control y entradas) para tareas, ítems y checklists
+    query_budget = {'list': 6, 'retrieve': 5, 'board': 5, 'board_as_of': 12, 'activity': 14}
+
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
+
+    @action(detail=True)
+    def board(self, request, pk=None):
+        """Tablero del sprint agrupado por estado, con responsables, etiquetas y checklists"""
+        sprint = self.get_object()
+        service = SprintBoardService()
+        parts, last_modified = service.version(sprint)
+        return conditional_response(request, parts, last_modified, lambda: Response(
+            sprint_board_cache.get([sprint.pk], lambda: service.snapshot(sprint), tags=[f'sprint:{sprint.pk}'])
+        ))
+
+    @action(detail=True, url_path='board/as-of')
+    def board_as_of(self, request, pk=None):
+        """Tablero del sprint reconstruido desde la auditoría en el momento ?at="""
+        sprint = self.get_object()
+        serializer = AsOfSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return Response(SprintBoardService().as_of(sprint, serializer.validated_data['at']))
+
+    @action(detail=True)
+    def activity(self, request, pk=None):
+        """Comentarios y transiciones del sprint, del más reciente al más antiguo (paginación por cursor)"""
+        sprint = self.get_object()
+        paginator = FeedPagination()
+        events = paginator.paginate_feed(
+            lambda position, size: ActivityFeedService().page('sprint', sprint.pk, position, size), request
+        )
+        return paginator.get_paginated_response(events)
+
+    @action(detail=True, methods=['post'], url_path='bulk-transition')
+    def bulk_transition(self, request, pk=None):
+        """Cambia el estado de muchas tareas del sprint; retorna los ids que cambiaron"""
+        sprint = self.get_object()
+        serializer = BulkTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            changed = BulkTransitionService(SprintTask).transition(
+                sprint.tasks.select_related('backlog_item'),
+                serializer.validated_data['ids'],
+                serializer.validated_data['status'],
+                user=request.user,
+            )
+        except DjangoValidationError as exc:
+            raise ValidationError({'ids': exc.messages})
+        except ValidationException as exc:
+            raise ValidationError({exc.field or 'non_field_errors': exc.message})
+        return Response({'changed': changed})
+
+    @action(detail=True, methods=['post'], url_path=r'tasks/(?P<task_id>[^/.]+)/move')
+    def move_task(self, request, pk=None, task_id=None):
+        """Reordena una tarjeta dentro de su columna entre las tareas before y after"""
+        sprint = self.get_object()
+        task = get_object_or_404(sprint.tasks.all(), pk=task_id)
+        serializer = MoveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            rank = task.move_between(serializer.validated_data.get('before'), serializer.validated_data.get('after'))
+        except ValidationException as exc:
+            raise ValidationError({exc.field or 'non_field_errors': exc.message})
+        return Response({'id': task.pk, 'status': task.status, 'rank': rank})
+
+    @action(detail=True, methods=['post'])
+    def rollover(self, request, pk=None):
+        """Traspasa las tareas sin terminar al sprint indicado en target"""
+        sprint = self.get_object()
+        serializer = SprintRolloverSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            result = SprintRolloverService().rollover(
+                sprint, serializer.validated_data['target'], user=request.user
+            )
+        except BusinessRuleException as exc:
+            raise ValidationError({'target': str(exc)})
+        return Response(result)
+
+
+async def sprint_events(request, pk):
+    """Deltas del tablero del sprint (movimientos, transiciones, comentarios y etiquetas) por SSE"""
+    def channels(user):
+        try:
+            sprint_id = Sprint.objects.filter(pk=pk).values_list('pk', flat=True).first()
+        except (ValueError, DjangoValidationError):
+            return None
+        return [sprint_channel(sprint_id)] if sprint_id is not None else None
+
+    return await event_stream(request, channels)
@@ -0,0 +1,556 @@
+import asyncio
+import datetime
+import json
+import uuid
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.backlog.domain.models import BacklogItem
+from apps.historias.domain.models import StoryTask, UserStory
+from apps.shared.domain.ranking import even_ranks
+from apps.shared.domain.value_objects import Status
+from apps.shared.infrastructure.audit import checkpoint_audit_logs
+from apps.shared.infrastructure.pagination import FeedPagination
+from apps.shared.infrastructure.realtime import encode_delta, get_broker, sprint_channel
+from apps.shared.infrastructure.sql_budget import assert_query_budget, query_budget
+from apps.shared.presentation.streams import EventStream
+from apps.sprint.application.services import SprintBoardService, SprintCounterService
+from apps.sprint.domain.models import TASK_COUNTER_FIELDS, Sprint, SprintTask
+
+
+class SprintCounterTests(TestCase):
+    """Los contadores desnormalizados siguen a las tareas y coinciden con un recálculo completo"""
+
+    fields = [field for pair in TASK_COUNTER_FIELDS.values() for field in pair]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        today = timezone.localdate()
+        cls.sprint = Sprint.objects.create(
+            name='Sprint 1', goal='Contadores', start_date=today,
+            end_date=today + datetime.timedelta(days=14), created_by=cls.user,
+        )
+        cls.tasks = [
+            SprintTask.objects.create(
+                sprint=cls.sprint, story_points=points,
+                backlog_item=BacklogItem.objects.create(title=f'Ítem {points}', created_by=cls.user),
+            )
+            for points in (1, 3, 5, 8)
+        ]
+
+    def counters(self):
+        return Sprint.objects.filter(pk=self.sprint.pk).values(*self.fields).get()
+
+    def test_counters_follow_transitions_edits_and_deletes(self):
+        first, second, third, fourth = self.tasks
+        first.start_task()
+        first.complete_task()
+        second.start_task()
+        third.story_points = 2
+        third.save()
+        fourth.delete()
+
+        counters = self.counters()
+        self.assertEqual(counters, {
+            'todo_tasks': 1, 'todo_points': 2, 'in_progress_tasks': 1, 'in_progress_points': 3,
+            'in_review_tasks': 0, 'in_review_points': 0, 'done_tasks': 1, 'done_points': 1,
+        })
+        SprintCounterService().reconcile([self.sprint.pk])
+        self.assertEqual(self.counters(), counters)
+
+    def test_progress_reads_the_counters_without_queries(self):
+        self.tasks[0].start_task()
+        self.tasks[0].complete_task()
+        sprint = Sprint.objects.get(pk=self.sprint.pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual((sprint.progress_percentage, sprint.total_points), (25, 17))
+
+    def test_reconcile_repairs_drifted_counters(self):
+        Sprint.objects.filter(pk=self.sprint.pk).update(todo_tasks=99, done_points=7)
+
+        SprintCounterService().reconcile()
+
+        self.assertEqual(self.counters()['todo_tasks'], 4)
+        self.assertEqual(self.counters()['done_points'], 0)
+
+
+class SprintBulkTransitionTests(TestCase):
+    """El cambio masivo sólo mueve las tareas del sprint que admiten la transición"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        today = timezone.localdate()
+        cls.sprint, cls.other = [
+            Sprint.objects.create(
+                name=name, goal='Transiciones', start_date=today,
+                end_date=today + datetime.timedelta(days=14), created_by=cls.user,
+            )
+            for name in ('Sprint 1', 'Sprint 2')
+        ]
+        cls.tasks = [
+            SprintTask.objects.create(
+                sprint=sprint, story_points=2, status=status,
+                backlog_item=BacklogItem.objects.create(title=f'Ítem {index}', created_by=cls.user),
+            )
+            for index, (sprint, status) in enumerate([
+                (cls.sprint, Status.IN_PROGRESS.value), (cls.sprint, Status.IN_PROGRESS.value),
+                (cls.sprint, Status.IN_REVIEW.value), (cls.sprint, Status.TODO.value),
+                (cls.other, Status.IN_PROGRESS.value),
+            ])
+        ]
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def transition(self, tasks, status):
+        return self.client.post(
+            f'/api/v1/sprint/sprints/{self.sprint.pk}/bulk-transition/',
+            {'ids': [str(task.pk) for task in tasks], 'status': status}, content_type='application/json',
+        )
+
+    def test_only_allowed_tasks_of_the_sprint_change(self):
+        first, second, review, todo, foreign = self.tasks
+
+        response = self.transition(self.tasks, Status.IN_REVIEW.value)
+
+        self.assertEqual(set(response.json()['changed']), {str(first.pk), str(second.pk)})
+        statuses = dict(SprintTask.objects.values_list('pk', 'status'))
+        self.assertEqual(statuses[todo.pk], Status.TODO.value)
+        self.assertEqual(statuses[foreign.pk], Status.IN_PROGRESS.value)
+        column = list(
+            self.sprint.tasks.filter(status=Status.IN_REVIEW.value).order_by('rank').values_list('pk', flat=True)
+        )
+        self.assertEqual(column[0], review.pk)
+        self.assertEqual(set(column[1:]), {first.pk, second.pk})
+        sprint = Sprint.objects.get(pk=self.sprint.pk)
+        self.assertEqual((sprint.in_progress_tasks, sprint.in_review_tasks, sprint.in_review_points), (0, 3, 6))
+
+    def test_done_tasks_get_their_completion_time(self):
+        first = self.tasks[0]
+        self.transition([first], Status.DONE.value)
+
+        first.refresh_from_db()
+        self.assertIsNotNone(first.completed_at)
+
+    def test_rejects_unknown_status_and_ids(self):
+        self.assertEqual(self.transition(self.tasks, 'Archivada').status_code, 400)
+        response = self.client.post(
+            f'/api/v1/sprint/sprints/{self.sprint.pk}/bulk-transition/',
+            {'ids': ['no-es-un-id'], 'status': Status.DONE.value}, content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class SprintRolloverTests(TestCase):
+    """El traspaso mueve en bloque las tareas sin terminar y omite las de ítems ya planificados"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        today = timezone.localdate()
+        cls.sprint, cls.target = [
+            Sprint.objects.create(
+                name=name, goal='Traspaso', start_date=today,
+                end_date=today + datetime.timedelta(days=14), created_by=cls.user,
+            )
+            for name in ('Sprint 1', 'Sprint 2')
+        ]
+        items = [BacklogItem.objects.create(title=f'Ítem {index}', created_by=cls.user) for index in range(4)]
+        cls.done, cls.todo, cls.started, cls.planned = [
+            SprintTask.objects.create(sprint=cls.sprint, backlog_item=item, story_points=points, status=status)
+            for item, points, status in [
+                (items[0], 1, Status.DONE.value), (items[1], 2, Status.TODO.value),
+                (items[2], 3, Status.IN_PROGRESS.value), (items[3], 5, Status.TODO.value),
+            ]
+        ]
+        cls.existing = SprintTask.objects.create(sprint=cls.target, backlog_item=items[3], story_points=5)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def rollover(self, target):
+        return self.client.post(
+            f'/api/v1/sprint/sprints/{self.sprint.pk}/rollover/', {'target': str(target.pk)},
+            content_type='application/json',
+        )
+
+    def test_moves_unfinished_tasks_and_skips_planned_items(self):
+        response = self.rollover(self.target)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()['moved']), {str(self.todo.pk), str(self.started.pk)})
+        self.assertEqual(response.json()['skipped'], [str(self.planned.pk)])
+        sprints = dict(SprintTask.objects.values_list('pk', 'sprint_id'))
+        self.assertEqual(sprints[self.done.pk], self.sprint.pk)
+        self.assertEqual(sprints[self.planned.pk], self.sprint.pk)
+        self.assertEqual(sprints[self.todo.pk], self.target.pk)
+
+        todo_column = list(
+            self.target.tasks.filter(status=Status.TODO.value).order_by('rank').values_list('pk', flat=True)
+        )
+        self.assertEqual(todo_column, [self.existing.pk, self.todo.pk])
+
+    def test_counters_of_both_sprints_are_adjusted(self):
+        self.rollover(self.target)
+
+        source, target = Sprint.objects.get(pk=self.sprint.pk), Sprint.objects.get(pk=self.target.pk)
+        self.assertEqual((source.total_tasks, source.total_points), (2, 6))
+        self.assertEqual((target.total_tasks, target.total_points, target.in_progress_points), (3, 10, 3))
+
+    def test_target_must_be_another_sprint(self):
+        response = self.rollover(self.sprint)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('target', response.json())
+
+
+class SprintBoardSnapshotTests(TestCase):
+    """El tablero se arma con un número fijo de consultas, sin importar cuántas tarjetas tenga"""
+
+    cards = 500
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        today = timezone.localdate()
+        cls.sprint = Sprint.objects.create(
+            name='Sprint 1', goal='Tablero grande', start_date=today,
+            end_date=today + datetime.timedelta(days=14), created_by=cls.user,
+        )
+        statuses = [status.value for status in Status]
+        items = BacklogItem.objects.bulk_create([
+            BacklogItem(title=f'Ítem {index}', created_by=cls.user, labels=['bug'] if index % 7 == 0 else [])
+            for index in range(cls.cards)
+        ])
+        SprintTask.objects.bulk_create([
+            SprintTask(
+                sprint=cls.sprint, backlog_item=item, assigned_to=cls.user if index % 2 else None,
+                status=statuses[index % len(statuses)], story_points=3, rank=rank,
+            )
+            for index, (item, rank) in enumerate(zip(items, even_ranks(cls.cards)))
+        ])
+        story = UserStory.objects.create(
+            title='Historia', description='', as_a='usuario', i_want='ver el tablero', so_that='planificar',
+            backlog_item=items[0], author=cls.user,
+        )
+        StoryTask.objects.create(story=story, title='Diseño', status=Status.DONE.value)
+        StoryTask.objects.create(story=story, title='Implementación')
+        cls.first_item = items[0]
+
+    def test_snapshot_of_500_cards_within_five_queries(self):
+        with query_budget(5):
+            board = SprintBoardService().snapshot(self.sprint)
+
+        cards = [card for column in board['columns'] for card in column['tasks']]
+        self.assertEqual(len(cards), self.cards)
+        self.assertEqual([column['status'] for column in board['columns']], [status.value for status in Status])
+        first = next(card for card in cards if card['backlog_item']['id'] == self.first_item.pk)
+        self.assertEqual(first['checklist'], {'done': 1, 'total': 2})
+        self.assertEqual(first['backlog_item']['labels'], ['bug'])
+        for column in board['columns']:
+            ranks = [card['rank'] for card in column['tasks']]
+            self.assertEqual(ranks, sorted(ranks))
+
+    def test_board_endpoint_within_its_budget(self):
+        self.client.force_login(self.user)
+        response = self.client.get(f'/api/v1/sprint/sprints/{self.sprint.pk}/board/', HTTP_ACCEPT='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(assert_query_budget(response).count, 5)
+        self.assertEqual(sum(len(column['tasks']) for column in response.json()['columns']), self.cards)
+
+
+class SprintActivityFeedTests(TestCase):
+    """El feed del sprint se recorre página a página con cursores sobre ids UUID"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        today = timezone.localdate()
+        cls.sprint = Sprint.objects.create(
+            name='Sprint 1', goal='Feed', start_date=today,
+            end_date=today + datetime.timedelta(days=14), created_by=cls.user,
+        )
+        # La auditoría se escribe al confirmar la transacción
+        with cls.captureOnCommitCallbacks(execute=True):
+            for index in range(2):
+                item = BacklogItem.objects.create(title=f'Ítem {index}', created_by=cls.user)
+                task = SprintTask.objects.create(sprint=cls.sprint, backlog_item=item, story_points=3)
+                task.start_task()
+                task.complete_task()
+
+    def test_next_link_pages_through_every_transition(self):
+        self.client.force_login(self.user)
+        url = f'/api/v1/sprint/sprints/{self.sprint.pk}/activity/?page_size=3'
+        seen = []
+        while url:
+            response = self.client.get(url, HTTP_ACCEPT='application/json')
+            self.assertEqual(response.status_code, 200)
+            seen.extend(event['id'] for event in response.json()['results'])
+            url = response.json()['next']
+
+        self.assertEqual(len(seen), 4)
+        self.assertEqual(len(set(seen)), 4)
+
+    def test_malformed_cursor_id_is_not_found(self):
+        paginator = FeedPagination()
+        paginator.base_url = 'http://testserver/'
+        event = {'timestamp': timezone.now(), 'source': 'sprint_task_transition', 'id': 'no-es-un-uuid'}
+        token = paginator.encode_cursor(event, reverse=False).split('cursor=')[1]
+
+        self.client.force_login(self.user)
+        response = self.client.get(f'/api/v1/sprint/sprints/{self.sprint.pk}/activity/', {'cursor': token})
+        self.assertEqual(response.status_code, 404)
+
+
+class SprintTaskMoveTests(TestCase):
+    """Reordenar una tarjeta escribe sólo su clave y respeta el orden de sus vecinas"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        today = timezone.localdate()
+        cls.sprint = Sprint.objects.create(
+            name='Sprint 1', goal='Orden', start_date=today,
+            end_date=today + datetime.timedelta(days=14), created_by=cls.user,
+        )
+        cls.tasks = [
+            SprintTask.objects.create(
+                sprint=cls.sprint, story_points=1,
+                backlog_item=BacklogItem.objects.create(title=f'Ítem {index}', created_by=cls.user),
+            )
+            for index in range(3)
+        ]
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def move(self, task, **neighbours):
+        return self.client.post(
+            f'/api/v1/sprint/sprints/{self.sprint.pk}/tasks/{task.pk}/move/',
+            {field: str(other.pk) for field, other in neighbours.items()},
+            content_type='application/json',
+        )
+
+    def column(self):
+        return list(self.sprint.tasks.filter(status=Status.TODO.value).order_by('rank').values_list('pk', flat=True))
+
+    def test_move_between_neighbours(self):
+        first, second, third = self.tasks
+        response = self.move(third, before=first, after=second)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.column(), [first.pk, third.pk, second.pk])
+
+    def test_move_to_the_top_and_bottom(self):
+        first, second, third = self.tasks
+        self.assertEqual(self.move(third, after=first).status_code, 200)
+        self.assertEqual(self.move(first, before=second).status_code, 200)
+        self.assertEqual(self.column(), [third.pk, second.pk, first.pk])
+
+    def test_reversed_neighbours_are_rejected_without_rebalancing(self):
+        first, second, third = self.tasks
+        ranks = dict(self.sprint.tasks.values_list('pk', 'rank'))
+
+        response = self.move(first, before=third, after=second)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('after', response.json())
+        self.assertEqual(dict(self.sprint.tasks.values_list('pk', 'rank')), ranks)
+
+    def test_neighbour_from_another_column_is_rejected(self):
+        first, second, third = self.tasks
+        second.start_task()
+
+        response = self.move(first, before=second)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('before', response.json())
+
+
+class SprintBoardCacheTests(TestCase):
+    """El tablero cacheado se invalida cuando cambian los checklists de sus historias"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        today = timezone.localdate()
+        cls.sprint = Sprint.objects.create(
+            name='Sprint 1', goal='Caché', start_date=today,
+            end_date=today + datetime.timedelta(days=14), created_by=cls.user,
+        )
+        item = BacklogItem.objects.create(title='Ítem', created_by=cls.user)
+        SprintTask.objects.create(sprint=cls.sprint, backlog_item=item, story_points=3)
+        cls.story = UserStory.objects.create(
+            title='Historia', description='', as_a='usuario', i_want='ver avances', so_that='planificar',
+            backlog_item=item, author=cls.user,
+        )
+        cls.task = StoryTask.objects.create(story=cls.story, title='Diseño', status=Status.IN_PROGRESS.value)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def checklist(self):
+        response = self.client.get(f'/api/v1/sprint/sprints/{self.sprint.pk}/board/', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return [card['checklist'] for column in response.json()['columns'] for card in column['tasks']][0]
+
+    def test_story_task_bulk_transition_refreshes_the_board(self):
+        self.assertEqual(self.checklist(), {'done': 0, 'total': 1})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f'/api/v1/repo/stories/{self.story.pk}/tasks/bulk-transition/',
+                {'ids': [str(self.task.pk)], 'status': Status.DONE.value}, content_type='application/json',
+            )
+        self.assertEqual(response.json()['changed'], [str(self.task.pk)])
+
+        self.assertEqual(self.checklist(), {'done': 1, 'total': 1})
+
+
+@override_settings(AUDIT_LOG={**settings.AUDIT_LOG, 'CHECKPOINT_SETTLE': 0})
+class SprintBoardAsOfTests(TestCase):
+    """El tablero histórico se reconstruye desde los puntos de control dentro de su presupuesto"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        today = timezone.localdate()
+        cls.sprint = Sprint.objects.create(
+            name='Sprint 1', goal='Historia', start_date=today,
+            end_date=today + datetime.timedelta(days=14), created_by=cls.user,
+        )
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.tasks = []
+            for index in range(20):
+                item = BacklogItem.objects.create(title=f'Ítem {index}', created_by=cls.user)
+                cls.tasks.append(SprintTask.objects.create(
+                    sprint=cls.sprint, backlog_item=item, story_points=2, assigned_to=cls.user,
+                ))
+            story = UserStory.objects.create(
+                title='Historia', description='', as_a='usuario', i_want='ver el pasado', so_that='comparar',
+                backlog_item=cls.tasks[0].backlog_item, author=cls.user,
+            )
+            StoryTask.objects.create(story=story, title='Diseño')
+            cls.tasks[0].start_task()
+        checkpoint_audit_logs()
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.tasks[0].complete_task()
+            cls.tasks[1].start_task()
+
+    def test_board_as_of_after_a_checkpoint_within_its_budget(self):
+        self.client.force_login(self.user)
+        response = self.client.get(
+            f'/api/v1/sprint/sprints/{self.sprint.pk}/board/as-of/', {'at': timezone.now().isoformat()},
+            HTTP_ACCEPT='application/json',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(assert_query_budget(response).count, 12)
+        columns = {column['status']: column['tasks'] for column in response.json()['columns']}
+        self.assertEqual([card['id'] for card in columns[Status.DONE.value]], [str(self.tasks[0].pk)])
+        self.assertEqual([card['id'] for card in columns[Status.IN_PROGRESS.value]], [str(self.tasks[1].pk)])
+        self.assertEqual(len(columns[Status.TODO.value]), 18)
+        self.assertEqual(columns[Status.DONE.value][0]['checklist'], {'done': 0, 'total': 1})
+
+
+class SprintRealtimeTests(TestCase):
+    """Los cambios del tablero se publican como deltas en el canal del sprint al confirmar"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        today = timezone.localdate()
+        cls.sprint, cls.next_sprint = [
+            Sprint.objects.create(
+                name=name, goal='Tablero', start_date=today,
+                end_date=today + datetime.timedelta(days=14), created_by=cls.user,
+            )
+            for name in ('Sprint 1', 'Sprint 2')
+        ]
+        cls.task = SprintTask.objects.create(
+            sprint=cls.sprint, story_points=3,
+            backlog_item=BacklogItem.objects.create(title='Ítem', created_by=cls.user),
+        )
+
+    def published(self, action, execute=True):
+        with mock.patch.object(get_broker(), 'publish') as publish:
+            with self.captureOnCommitCallbacks(execute=execute):
+                action()
+        return [(channel, json.loads(message)) for (channel, message), _ in publish.call_args_list]
+
+    def test_nothing_is_published_before_commit(self):
+        self.assertEqual(self.published(self.task.start_task, execute=False), [])
+
+    def test_transition_sends_the_new_column_and_rank(self):
+        deltas = self.published(self.task.start_task)
+
+        self.task.refresh_from_db()
+        self.assertEqual(deltas, [(sprint_channel(self.sprint.pk), {
+            'type': 'task.transitioned', 'id': str(self.task.pk),
+            'status': Status.IN_PROGRESS.value, 'rank': self.task.rank,
+        })])
+
+    def test_move_to_another_sprint_updates_both_boards(self):
+        deltas = self.published(lambda: self.task.move_to_sprint(self.next_sprint))
+
+        types = {channel: delta['type'] for channel, delta in deltas}
+        self.assertEqual(types, {
+            sprint_channel(self.sprint.pk): 'task.removed',
+            sprint_channel(self.next_sprint.pk): 'task.added',
+        })
+
+
+class SprintEventStreamTests(TestCase):
+    """El stream SSE del tablero entrega los deltas de su canal y libera la suscripción al cerrarse"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana', 'ana@example.com', 'secreta')
+        today = timezone.localdate()
+        cls.sprint = Sprint.objects.create(
+            name='Sprint 1', goal='Tablero', start_date=today,
+            end_date=today + datetime.timedelta(days=14), created_by=cls.user,
+        )
+        cls.url = f'/api/v1/sprint/sprints/{cls.sprint.pk}/events/'
+
+    async def test_requires_credentials_and_an_existing_sprint(self):
+        self.assertEqual((await self.async_client.get(self.url)).status_code, 401)
+
+        await sync_to_async(self.async_client.force_login)(self.user)
+        response = await self.async_client.get(f'/api/v1/sprint/sprints/{uuid.uuid4()}/events/')
+        self.assertEqual(response.status_code, 404)
+
+    async def test_streams_deltas_of_its_channel(self):
+        await sync_to_async(self.async_client.force_login)(self.user)
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+        events = aiter(response.streaming_content)
+        self.assertTrue((await anext(events)).startswith(b'retry: '))
+        broker = get_broker()
+        broker.publish('sprint:otro', encode_delta('task.added', {'id': 'ajena'}))
+        broker.publish(sprint_channel(self.sprint.pk), encode_delta('task.removed', {'id': 'propia'}))
+
+        event = await asyncio.wait_for(anext(events), timeout=5)
+        self.assertEqual(event, b'event: task.removed\ndata: {"type":"task.removed","id":"propia"}\n\n')
+
+    async def test_closing_the_stream_releases_its_subscription(self):
+        channel = sprint_channel(self.sprint.pk)
+        events = EventStream([channel]).events()
+        await anext(events)
+        self.assertIn(channel, get_broker().subscriptions)
+
+        await events.aclose()
+
+        self.assertNotIn(channel, get_broker().subscriptions)
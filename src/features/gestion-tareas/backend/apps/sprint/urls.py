@@ -0,0 +1,11 @@
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+from apps.sprint.presentation.views import SprintViewSet, sprint_events
+
+router = DefaultRouter()
+router.register('sprints', SprintViewSet, basename='sprint')
+
+urlpatterns = [
+    path('sprints/<pk>/events/', sprint_events, name='sprint-events'),
+    path('', include(router.urls)),
+]
@@ -0,0 +1,16 @@
+"""
+Suite de benchmarks de los caminos calientes del backend.
+
+    python manage.py run_benchmarks --settings=config.settings.benchmark --scale smoke
+    python manage.py run_benchmarks --settings=config.settings.benchmark --scale full --save-baseline
+
+Los resultados quedan en ``benchmarks/results/<escala>.json``, con la
+comparación contra ``benchmarks/baselines/<escala>.json`` cuando existe.
+La línea base se versiona para que las regresiones se vean en la revisión.
+
+Para cargar volumen de producción en la base de desarrollo (no la de
+test) se generan organizaciones sintéticas; ``large`` ronda el millón de
+filas por organización:
+
+    python manage.py generate_scale_data --preset large --organisations 2 --seed 7
+"""
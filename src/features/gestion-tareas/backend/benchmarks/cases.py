@@ -0,0 +1,157 @@
+"""
+Casos de benchmark de los caminos calientes del backend.
+
+Cada caso recibe el contexto (dataset, usuario y cliente HTTP autenticado)
+y retorna la operación a cronometrar. Los casos ``cold`` vacían la caché
+antes de cada corrida para medir el cálculo y no el acierto de caché. El
+orden de declaración es el de ejecución: los que escriben van al final.
+"""
+import csv
+import io
+from urllib.parse import urlencode
+
+from django.core.files.base import ContentFile
+from django.db.models import Avg, Count
+
+from apps.backlog.application.services import ImportService
+from apps.backlog.domain.models import BacklogItem, ImportJob
+from apps.backlog.infrastructure.export import BacklogItemExport
+from apps.metricas.application.services import (
+    BurndownService, MetricsSummaryService, TeamMetricsService, VelocityHistoryService,
+)
+from apps.metricas.domain.models import IndividualMetric
+from apps.shared.application.services import BulkTransitionService
+from apps.shared.domain.value_objects import Priority, Status
+from apps.sprint.domain.models import Sprint, SprintTask
+from benchmarks.runner import benchmark
+
+
+def api(path, **params):
+    return f'{path}?{urlencode(params, doseq=True)}' if params else path
+
+
+@benchmark('backlog.list')
+def backlog_list(context):
+    return lambda: context.get(api('/api/v1/backlog/items/'))
+
+
+@benchmark('backlog.list_filtered')
+def backlog_list_filtered(context):
+    url = api('/api/v1/backlog/items/', status=Status.TODO.value, priority=Priority.HIGH.value, label='bug')
+    return lambda: context.get(url)
+
+
+@benchmark('backlog.list_deep_page')
+def backlog_list_deep_page(context):
+    # Página 50 siguiendo los cursores: el costo de keyset no crece con la profundidad
+    url = api('/api/v1/backlog/items/')
+    for _ in range(50):
+        url = context.get(url).json().get('next') or url
+    return lambda: context.get(url)
+
+
+@benchmark('backlog.search')
+def backlog_search(context):
+    word = max(BacklogItem.objects.order_by('pk').values_list('title', flat=True).first().split(), key=len)
+    url = api('/api/v1/backlog/items/search/', q=word.strip('.'))
+    return lambda: context.get(url)
+
+
+@benchmark('backlog.stats', cold=True)
+def backlog_stats(context):
+    return lambda: context.get(api('/api/v1/backlog/items/stats/'))
+
+
+@benchmark('sprint.board', cold=True)
+def sprint_board(context):
+    return lambda: context.get(api(f'/api/v1/sprint/sprints/{context.dataset.active_sprint_id}/board/'))
+
+
+@benchmark('sprint.activity')
+def sprint_activity(context):
+    return lambda: context.get(api(f'/api/v1/sprint/sprints/{context.dataset.active_sprint_id}/activity/'))
+
+
+@benchmark('sprint.progress')
+def sprint_progress(context):
+    return lambda: context.get(api('/api/v1/sprint/sprints/', status='completed'))
+
+
+@benchmark('metrics.summary')
+def metrics_summary(context):
+    return lambda: MetricsSummaryService().summary(last=3)
+
+
+@benchmark('metrics.team')
+def metrics_team(context):
+    sprint_ids = list(
+        Sprint.objects.filter(status='completed').order_by('-end_date').values_list('id', flat=True)[:3]
+    )
+    return lambda: TeamMetricsService().team(sprint_ids)
+
+
+@benchmark('metrics.velocity')
+def metrics_velocity(context):
+    return lambda: VelocityHistoryService().history(last=12)
+
+
+@benchmark('metrics.burndown')
+def metrics_burndown(context):
+    sprint = Sprint.objects.filter(status='completed').order_by('-end_date').first()
+    return lambda: BurndownService().series(sprint)
+
+
+@benchmark('metrics.individual_by_type', repeat=5)
+def metrics_individual_by_type(context):
+    queryset = (
+        IndividualMetric.objects.order_by()
+        .values('metric_type')
+        .annotate(average=Avg('value'), measurements=Count('id'))
+    )
+    return lambda: list(queryset)
+
+
+@benchmark('backlog.export', repeat=3, warmup=0)
+def backlog_export(context):
+    return lambda: sum(len(chunk) for chunk in BacklogItemExport().render_csv(BacklogItem.objects.all()))
+
+
+@benchmark('tasks.bulk_transition')
+def tasks_bulk_transition(context):
+    # Alterna las mismas tareas entre "en progreso" y "en revisión"
+    ids = list(
+        SprintTask.objects.filter(sprint_id=context.dataset.active_sprint_id, status=Status.IN_PROGRESS.value)
+        .values_list('id', flat=True)[:200]
+    )
+    service = BulkTransitionService(SprintTask)
+    queryset = SprintTask.objects.filter(sprint_id=context.dataset.active_sprint_id)
+    targets = [Status.IN_REVIEW.value, Status.IN_PROGRESS.value]
+    state = {'runs': 0}
+
+    def transition():
+        target = targets[state['runs'] % 2]
+        state['runs'] += 1
+        return service.transition(queryset, ids, target, user=context.user)
+
+    return transition
+
+
+@benchmark('backlog.import', repeat=3, warmup=0)
+def backlog_import(context):
+    rows = min(5000, max(context.dataset.counts.get('backlog.BacklogItem', 0) // 20, 500))
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(['title', 'description', 'priority', 'status', 'story_points', 'labels', 'assigned_to'])
+    for number in range(rows):
+        writer.writerow([
+            f'Ítem importado {number}', 'Importado por el benchmark', Priority.MEDIUM.value,
+            Status.TODO.value, 3, 'bug;api', context.user.username,
+        ])
+    content = buffer.getvalue().encode('utf-8')
+
+    def run():
+        job = ImportJob.objects.create(kind='backlog', format='csv', created_by=context.user)
+        job.source.save('benchmark.csv', ContentFile(content), save=True)
+        ImportService().run(job)
+
+    return run
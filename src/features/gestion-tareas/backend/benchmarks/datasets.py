@@ -0,0 +1,330 @@
+"""
+Datasets de benchmark construidos con las factories y ``bulk_create``.
+
+La escala ``full`` reproduce el volumen de una instalación grande
+(100k ítems, 2k sprints, 500k tareas de sprint, 1M métricas
+individuales); ``smoke`` sirve para verificar la suite en segundos. Con la
+misma semilla se obtienen exactamente los mismos datos.
+
+``bulk_create`` no dispara señales, así que los datos derivados
+(contadores de Sprint, índices de etiquetas y de búsqueda, historial de
+velocidad) se reconstruyen con los servicios de cada app al terminar.
+"""
+import datetime
+from collections import defaultdict
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Dict, List
+
+from django.contrib.auth.models import User
+from django.db import connection
+from factory.random import randgen, reseed_random
+
+from apps.backlog.domain.models import BacklogComment, BacklogItem
+from apps.backlog.infrastructure.labels import backlog_item_labels
+from apps.historias.domain.models import StoryComment, StoryTask, UserStory
+from apps.historias.infrastructure.labels import user_story_labels
+from apps.metricas.application.services import VelocityHistoryService
+from apps.metricas.domain.models import (
+    BurndownSnapshot, IndividualMetric, MetricAlert, SprintMetric, TeamMetric,
+)
+from apps.shared.domain.ranking import even_ranks
+from apps.shared.domain.value_objects import Status
+from apps.shared.infrastructure.search import search_indexes
+from apps.sprint.application.services import SprintCounterService
+from apps.sprint.domain.models import Sprint, SprintMember, SprintTask
+from benchmarks import factories
+
+SCALES = {
+    'smoke': {
+        'users': 20,
+        'backlog_items': 2_000,
+        'backlog_comments': 2_000,
+        'user_stories': 1_000,
+        'story_tasks_per_story': 3,
+        'story_comments': 1_000,
+        'sprints': 40,
+        'members_per_sprint': 6,
+        'tasks_per_sprint': 25,
+        'individual_metrics': 10_000,
+        'team_metrics': 200,
+        'metric_alerts': 100,
+    },
+    'medium': {
+        'users': 100,
+        'backlog_items': 20_000,
+        'backlog_comments': 40_000,
+        'user_stories': 10_000,
+        'story_tasks_per_story': 4,
+        'story_comments': 10_000,
+        'sprints': 400,
+        'members_per_sprint': 8,
+        'tasks_per_sprint': 125,
+        'individual_metrics': 200_000,
+        'team_metrics': 2_000,
+        'metric_alerts': 1_000,
+    },
+    'full': {
+        'users': 300,
+        'backlog_items': 100_000,
+        'backlog_comments': 200_000,
+        'user_stories': 50_000,
+        'story_tasks_per_story': 4,
+        'story_comments': 50_000,
+        'sprints': 2_000,
+        'members_per_sprint': 8,
+        'tasks_per_sprint': 250,
+        'individual_metrics': 1_000_000,
+        'team_metrics': 10_000,
+        'metric_alerts': 5_000,
+    },
+}
+
+# Reparto de estados de las tareas de sprints cerrados y del sprint activo
+CLOSED_STATUS_WEIGHTS = [(Status.DONE.value, 85), (Status.IN_PROGRESS.value, 10), (Status.TODO.value, 5)]
+ACTIVE_STATUS_WEIGHTS = [
+    (Status.TODO.value, 35), (Status.IN_PROGRESS.value, 30), (Status.IN_REVIEW.value, 15), (Status.DONE.value, 20),
+]
+
+
+@dataclass
+class Dataset:
+    """Ids de referencia que usan los casos de benchmark"""
+
+    scale: str
+    seed: int
+    counts: Dict[str, int] = field(default_factory=dict)
+    user_ids: List = field(default_factory=list)
+    sprint_ids: List = field(default_factory=list)
+    active_sprint_id: object = None
+
+    @classmethod
+    def load(cls, scale, seed):
+        """Referencias de un dataset ya construido (p. ej. con --keepdb)"""
+        sprints = list(Sprint.objects.order_by('start_date', 'id').values_list('id', 'status'))
+        return cls(
+            scale=scale,
+            seed=seed,
+            counts=count_rows(),
+            user_ids=list(User.objects.filter(username__startswith='usuario').values_list('id', flat=True)),
+            sprint_ids=[pk for pk, _ in sprints],
+            active_sprint_id=next((pk for pk, status in sprints if status == 'active'), None),
+        )
+
+
+def count_rows():
+    models = [
+        BacklogItem, BacklogComment, UserStory, StoryTask, StoryComment, Sprint, SprintMember,
+        SprintTask, SprintMetric, BurndownSnapshot, IndividualMetric, TeamMetric, MetricAlert,
+    ]
+    return {model._meta.label: model.objects.count() for model in models}
+
+
+def ref(model, pk):
+    """Instancia mínima para asignar una FK sin cargar la fila ni disparar la SubFactory"""
+    return model(pk=pk)
+
+
+def weighted(weights):
+    return randgen.choices([value for value, _ in weights], [weight for _, weight in weights])[0]
+
+
+class DatasetBuilder:
+    """Construye un dataset completo en lotes con ``Factory.build`` y ``bulk_create``"""
+
+    batch_size = 5000
+
+    def __init__(self, scale='smoke', seed=20240101, log=None):
+        if scale not in SCALES:
+            raise ValueError(f'Escala desconocida: {scale}')
+        self.scale = scale
+        self.seed = seed
+        self.sizes = SCALES[scale]
+        self.log = log or (lambda message: None)
+
+    def bulk(self, model, objects, after=None):
+        """Inserta los objetos en lotes; ``after(batch)`` recibe cada lote insertado"""
+        objects = iter(objects)
+        total = 0
+        while True:
+            batch = list(islice(objects, self.batch_size))
+            if not batch:
+                break
+            model.objects.bulk_create(batch, batch_size=self.batch_size)
+            if after is not None:
+                after(batch)
+            total += len(batch)
+        self.log(f'{model._meta.label}: {total}')
+        return total
+
+    def build(self):
+        reseed_random(self.seed)
+        dataset = Dataset(scale=self.scale, seed=self.seed)
+
+        users = [factories.UserFactory(username=f'usuario{n:05d}') for n in range(self.sizes['users'])]
+        dataset.user_ids = [user.pk for user in users]
+
+        items = self.build_backlog(users)
+        self.build_stories(users, items)
+        sprints = self.build_sprints(users)
+        dataset.sprint_ids = [sprint.pk for sprint in sprints]
+        dataset.active_sprint_id = next(sprint.pk for sprint in sprints if sprint.status == 'active')
+        self.build_sprint_tasks(users, sprints, items)
+        self.build_metrics(users, sprints)
+        self.rebuild_derived()
+        dataset.counts = count_rows()
+        return dataset
+
+    def build_backlog(self, users):
+        items = []
+        assignees = users + [None]
+        self.bulk(BacklogItem, (
+            factories.BacklogItemFactory.build(created_by=randgen.choice(users), assigned_to=randgen.choice(assignees))
+            for _ in range(self.sizes['backlog_items'])
+        ), after=lambda batch: (items.extend(item.pk for item in batch), backlog_item_labels.index_new(batch)))
+        self.bulk(BacklogComment, (
+            factories.BacklogCommentFactory.build(
+                backlog_item=ref(BacklogItem, randgen.choice(items)), author=randgen.choice(users),
+            )
+            for _ in range(self.sizes['backlog_comments'])
+        ))
+        return items
+
+    def build_stories(self, users, items):
+        stories = []
+        story_items = items[:self.sizes['user_stories']]
+        labels = dict(BacklogItem.objects.filter(pk__in=story_items).values_list('pk', 'labels'))
+        self.bulk(UserStory, (
+            factories.UserStoryFactory.build(
+                backlog_item=ref(BacklogItem, pk), author=randgen.choice(users), labels=labels[pk],
+            )
+            for pk in story_items
+        ), after=lambda batch: (stories.extend(story.pk for story in batch), user_story_labels.index_new(batch)))
+
+        assignees = users + [None]
+        ranks = even_ranks(self.sizes['story_tasks_per_story'])
+
+        def story_tasks():
+            for story_id in stories:
+                for rank in ranks:
+                    yield factories.StoryTaskFactory.build(
+                        story=ref(UserStory, story_id), rank=rank, assigned_to=randgen.choice(assignees)
+                    )
+
+        self.bulk(StoryTask, story_tasks())
+        self.bulk(StoryComment, (
+            factories.StoryCommentFactory.build(
+                story=ref(UserStory, randgen.choice(stories)), author=randgen.choice(users),
+            )
+            for _ in range(self.sizes['story_comments'])
+        ))
+
+    def build_sprints(self, users):
+        count = self.sizes['sprints']
+        # Sprints consecutivos de dos semanas: el penúltimo activo hoy y el último en planificación
+        first_start = datetime.date.today() - datetime.timedelta(days=14 * (count - 1) + 7)
+        sprints = []
+        for position in range(count):
+            start = first_start + datetime.timedelta(days=14 * position)
+            status = 'completed' if position < count - 2 else ('active' if position == count - 2 else 'planning')
+            sprints.append(factories.SprintFactory.build(
+                name=f'Sprint {position + 1}', start_date=start, end_date=start + datetime.timedelta(days=13),
+                status=status, created_by=randgen.choice(users),
+            ))
+        self.bulk(Sprint, sprints)
+        self.bulk(SprintMember, (
+            factories.SprintMemberFactory.build(sprint=sprint, user=user)
+            for sprint in sprints
+            for user in randgen.sample(users, min(self.sizes['members_per_sprint'], len(users)))
+        ))
+        return sprints
+
+    def build_sprint_tasks(self, users, sprints, items):
+        per_sprint = self.sizes['tasks_per_sprint']
+
+        def tasks():
+            for position, sprint in enumerate(sprints):
+                weights = ACTIVE_STATUS_WEIGHTS if sprint.status != 'completed' else CLOSED_STATUS_WEIGHTS
+                members = randgen.sample(users, min(self.sizes['members_per_sprint'], len(users)))
+                columns = defaultdict(list)
+                # Ítems consecutivos: ningún ítem se repite dentro del mismo sprint
+                for offset in range(per_sprint):
+                    status = weighted(weights) if sprint.status != 'planning' else Status.TODO.value
+                    started = datetime.datetime.combine(sprint.start_date, datetime.time(9), datetime.timezone.utc)
+                    columns[status].append(factories.SprintTaskFactory.build(
+                        sprint=sprint,
+                        backlog_item=ref(BacklogItem, items[(position * per_sprint + offset) % len(items)]),
+                        status=status,
+                        assigned_to=randgen.choice(members),
+                        started_at=started if status != Status.TODO.value else None,
+                        completed_at=started + datetime.timedelta(days=randgen.randint(1, 13))
+                        if status == Status.DONE.value else None,
+                    ))
+                for column in columns.values():
+                    for task, rank in zip(column, even_ranks(len(column))):
+                        task.rank = rank
+                        yield task
+
+        self.bulk(SprintTask, tasks())
+        SprintCounterService().reconcile()
+
+    def build_metrics(self, users, sprints):
+        closed = [sprint for sprint in sprints if sprint.status == 'completed']
+        counters = {
+            row['id']: row for row in Sprint.objects.filter(pk__in=[sprint.pk for sprint in closed]).values(
+                'id', 'done_tasks', 'done_points', 'todo_points', 'in_progress_points', 'in_review_points',
+                'todo_tasks', 'in_progress_tasks', 'in_review_tasks',
+            )
+        }
+
+        def sprint_metrics():
+            for sprint in closed:
+                row = counters[sprint.pk]
+                planned = row['done_points'] + row['todo_points'] + row['in_progress_points'] + row['in_review_points']
+                metric = factories.SprintMetricFactory.build(
+                    sprint=sprint,
+                    planned_velocity=planned,
+                    actual_velocity=row['done_points'],
+                    planned_story_points=planned,
+                    completed_story_points=row['done_points'],
+                    total_tasks=(
+                        row['done_tasks'] + row['todo_tasks'] + row['in_progress_tasks'] + row['in_review_tasks']
+                    ),
+                    completed_tasks=row['done_tasks'],
+                )
+                metric.calculate_rates(save=False)
+                yield metric
+
+        def snapshots():
+            # Burndown lineal desde el total hasta lo que quedó sin terminar
+            for sprint in closed:
+                row = counters[sprint.pk]
+                points = row['done_points'] + row['todo_points'] + row['in_progress_points'] + row['in_review_points']
+                tasks = row['done_tasks'] + row['todo_tasks'] + row['in_progress_tasks'] + row['in_review_tasks']
+                for day in range(14):
+                    yield factories.BurndownSnapshotFactory.build(
+                        sprint=sprint, date=sprint.start_date + datetime.timedelta(days=day),
+                        total_points=points, remaining_points=points - row['done_points'] * day // 13,
+                        total_tasks=tasks, remaining_tasks=tasks - row['done_tasks'] * day // 13,
+                    )
+
+        self.bulk(SprintMetric, sprint_metrics())
+        self.bulk(BurndownSnapshot, snapshots())
+        self.bulk(IndividualMetric, (
+            factories.IndividualMetricFactory.build(user=randgen.choice(users), sprint=randgen.choice(closed))
+            for _ in range(self.sizes['individual_metrics'])
+        ))
+        self.bulk(TeamMetric, (
+            factories.TeamMetricFactory.build(calculated_by=randgen.choice(users))
+            for _ in range(self.sizes['team_metrics'])
+        ))
+        self.bulk(MetricAlert, (
+            factories.MetricAlertFactory.build() for _ in range(self.sizes['metric_alerts'])
+        ))
+
+    def rebuild_derived(self):
+        VelocityHistoryService().rebuild()
+        for table, index in search_indexes.items():
+            backend = index.backend(connection)
+            if backend is not None:
+                self.log(f'{table}: {backend.rebuild()} documentos indexados')
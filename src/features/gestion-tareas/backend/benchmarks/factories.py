@@ -0,0 +1,215 @@
+"""
+Factories de factory-boy para todos los modelos del dominio.
+
+Sirven tanto para crear objetos sueltos (``create()``) como para armar
+lotes grandes sin tocar la base (``build()`` + ``bulk_create``); en ese
+caso las claves foráneas se pasan explícitamente para que no se creen
+objetos relacionados por cada fila. Con ``factory.random.reseed_random``
+los valores son los mismos en cada ejecución.
+"""
+import datetime
+from decimal import Decimal
+
+import factory
+from django.contrib.auth.models import User
+from factory import fuzzy
+from factory.django import DjangoModelFactory
+from factory.random import randgen
+
+from apps.backlog.domain.models import BacklogComment, BacklogItem
+from apps.historias.domain.models import StoryComment, StoryTask, UserStory
+from apps.metricas.domain.models import (
+    BurndownSnapshot, IndividualMetric, MetricAlert, SprintMetric, TeamMetric, VelocityHistory,
+)
+from apps.shared.domain.value_objects import Priority, Status
+from apps.sprint.domain.models import Sprint, SprintMember, SprintTask
+
+LABELS = ['bug', 'frontend', 'backend', 'api', 'ux', 'deuda-tecnica', 'seguridad', 'rendimiento', 'datos', 'infra']
+PRIORITIES = [priority.value for priority in Priority]
+STATUSES = [status.value for status in Status]
+BACKLOG_POINTS = [1, 2, 3, 5, 8, 13, 20]
+STORY_POINTS = [1, 2, 3, 5, 8, 13, 21]
+FAKER_LOCALE = 'es_ES'
+
+
+class UserFactory(DjangoModelFactory):
+    class Meta:
+        model = User
+        django_get_or_create = ('username',)
+
+    username = factory.Sequence(lambda n: f'usuario{n:05d}')
+    first_name = factory.Faker('first_name', locale=FAKER_LOCALE)
+    last_name = factory.Faker('last_name', locale=FAKER_LOCALE)
+    email = factory.LazyAttribute(lambda user: f'{user.username}@example.com')
+    password = 'benchmark'
+
+
+class BacklogItemFactory(DjangoModelFactory):
+    class Meta:
+        model = BacklogItem
+
+    title = factory.Faker('sentence', nb_words=6, locale=FAKER_LOCALE)
+    description = factory.Faker('paragraph', nb_sentences=3, locale=FAKER_LOCALE)
+    priority = fuzzy.FuzzyChoice(PRIORITIES)
+    status = fuzzy.FuzzyChoice(STATUSES)
+    created_by = factory.SubFactory(UserFactory)
+    due_date = fuzzy.FuzzyDate(datetime.date(2023, 1, 1), datetime.date(2026, 12, 31))
+    story_points = fuzzy.FuzzyChoice(BACKLOG_POINTS + [None])
+    labels = factory.LazyFunction(lambda: sorted(randgen.sample(LABELS, randgen.randint(0, 3))))
+
+
+class BacklogCommentFactory(DjangoModelFactory):
+    class Meta:
+        model = BacklogComment
+
+    backlog_item = factory.SubFactory(BacklogItemFactory)
+    content = factory.Faker('sentence', nb_words=12, locale=FAKER_LOCALE)
+    author = factory.SubFactory(UserFactory)
+
+
+class UserStoryFactory(DjangoModelFactory):
+    class Meta:
+        model = UserStory
+
+    title = factory.Faker('sentence', nb_words=5, locale=FAKER_LOCALE)
+    description = factory.Faker('paragraph', nb_sentences=2, locale=FAKER_LOCALE)
+    as_a = fuzzy.FuzzyChoice(['usuario', 'administrador', 'product owner', 'desarrollador'])
+    i_want = factory.Faker('sentence', nb_words=6, locale=FAKER_LOCALE)
+    so_that = factory.Faker('sentence', nb_words=6, locale=FAKER_LOCALE)
+    acceptance_criteria = factory.Faker('sentence', nb_words=10, locale=FAKER_LOCALE)
+    priority = fuzzy.FuzzyChoice(PRIORITIES)
+    status = fuzzy.FuzzyChoice(STATUSES)
+    story_points = fuzzy.FuzzyChoice(STORY_POINTS)
+    backlog_item = factory.SubFactory(BacklogItemFactory)
+    author = factory.SubFactory(UserFactory)
+    labels = factory.LazyAttribute(lambda story: list(story.backlog_item.labels))
+    epic = fuzzy.FuzzyChoice(['Onboarding', 'Pagos', 'Reportes', 'Notificaciones', ''])
+
+
+class StoryTaskFactory(DjangoModelFactory):
+    class Meta:
+        model = StoryTask
+
+    story = factory.SubFactory(UserStoryFactory)
+    title = factory.Faker('sentence', nb_words=4, locale=FAKER_LOCALE)
+    status = fuzzy.FuzzyChoice(STATUSES)
+    estimated_hours = fuzzy.FuzzyDecimal(1, 16, precision=1)
+
+
+class StoryCommentFactory(DjangoModelFactory):
+    class Meta:
+        model = StoryComment
+
+    story = factory.SubFactory(UserStoryFactory)
+    content = factory.Faker('sentence', nb_words=12, locale=FAKER_LOCALE)
+    author = factory.SubFactory(UserFactory)
+    is_internal = fuzzy.FuzzyChoice([False, False, False, True])
+
+
+class SprintFactory(DjangoModelFactory):
+    class Meta:
+        model = Sprint
+
+    name = factory.Sequence(lambda n: f'Sprint {n + 1}')
+    start_date = factory.Sequence(lambda n: datetime.date(2020, 1, 6) + datetime.timedelta(days=14 * n))
+    end_date = factory.LazyAttribute(lambda sprint: sprint.start_date + datetime.timedelta(days=13))
+    goal = factory.Faker('sentence', nb_words=8, locale=FAKER_LOCALE)
+    status = 'completed'
+    created_by = factory.SubFactory(UserFactory)
+
+
+class SprintMemberFactory(DjangoModelFactory):
+    class Meta:
+        model = SprintMember
+
+    sprint = factory.SubFactory(SprintFactory)
+    user = factory.SubFactory(UserFactory)
+    role = fuzzy.FuzzyChoice(['developer', 'developer', 'developer', 'tester', 'scrum_master'])
+    capacity = fuzzy.FuzzyChoice([50, 80, 100, 100])
+
+
+class SprintTaskFactory(DjangoModelFactory):
+    class Meta:
+        model = SprintTask
+
+    sprint = factory.SubFactory(SprintFactory)
+    backlog_item = factory.SubFactory(BacklogItemFactory)
+    status = fuzzy.FuzzyChoice(STATUSES)
+    story_points = fuzzy.FuzzyChoice(STORY_POINTS)
+    priority = fuzzy.FuzzyChoice(PRIORITIES)
+
+
+class SprintMetricFactory(DjangoModelFactory):
+    class Meta:
+        model = SprintMetric
+
+    sprint = factory.SubFactory(SprintFactory)
+    planned_velocity = fuzzy.FuzzyInteger(20, 60)
+    actual_velocity = factory.LazyAttribute(lambda metric: max(metric.planned_velocity + randgen.randint(-15, 10), 0))
+    average_task_duration = fuzzy.FuzzyDecimal(4, 40)
+    team_size = fuzzy.FuzzyInteger(4, 9)
+    bugs_found = fuzzy.FuzzyInteger(0, 12)
+    bugs_resolved = factory.LazyAttribute(lambda metric: randgen.randint(0, metric.bugs_found))
+
+
+class BurndownSnapshotFactory(DjangoModelFactory):
+    class Meta:
+        model = BurndownSnapshot
+
+    sprint = factory.SubFactory(SprintFactory)
+    date = factory.LazyAttribute(lambda snapshot: snapshot.sprint.start_date)
+    total_points = fuzzy.FuzzyInteger(40, 120)
+    remaining_points = factory.LazyAttribute(lambda snapshot: snapshot.total_points)
+    total_tasks = fuzzy.FuzzyInteger(10, 40)
+    remaining_tasks = factory.LazyAttribute(lambda snapshot: snapshot.total_tasks)
+
+
+class VelocityHistoryFactory(DjangoModelFactory):
+    class Meta:
+        model = VelocityHistory
+
+    sprint = factory.SubFactory(SprintFactory)
+    position = factory.Sequence(lambda n: n + 1)
+    end_date = factory.LazyAttribute(lambda history: history.sprint.end_date)
+    velocity = fuzzy.FuzzyInteger(20, 60)
+    committed_points = factory.LazyAttribute(lambda history: history.velocity + randgen.randint(0, 15))
+
+
+class TeamMetricFactory(DjangoModelFactory):
+    class Meta:
+        model = TeamMetric
+
+    name = factory.LazyAttribute(lambda metric: metric.metric_type.capitalize())
+    metric_type = fuzzy.FuzzyChoice([choice for choice, _ in TeamMetric.METRIC_TYPES])
+    value = fuzzy.FuzzyDecimal(0, 100)
+    unit = '%'
+    target_value = Decimal('80.00')
+    measurement_date = fuzzy.FuzzyDate(datetime.date(2020, 1, 1), datetime.date(2026, 12, 31))
+    calculated_by = factory.SubFactory(UserFactory)
+
+
+class IndividualMetricFactory(DjangoModelFactory):
+    class Meta:
+        model = IndividualMetric
+
+    user = factory.SubFactory(UserFactory)
+    name = factory.LazyAttribute(lambda metric: metric.metric_type.capitalize())
+    metric_type = fuzzy.FuzzyChoice([choice for choice, _ in IndividualMetric.METRIC_TYPES])
+    value = fuzzy.FuzzyDecimal(0, 100)
+    unit = '%'
+    sprint = None
+    measurement_date = fuzzy.FuzzyDate(datetime.date(2020, 1, 1), datetime.date(2026, 12, 31))
+
+
+class MetricAlertFactory(DjangoModelFactory):
+    class Meta:
+        model = MetricAlert
+
+    name = factory.Sequence(lambda n: f'Alerta {n}')
+    alert_type = fuzzy.FuzzyChoice([choice for choice, _ in MetricAlert.ALERT_TYPES])
+    severity = fuzzy.FuzzyChoice([choice for choice, _ in MetricAlert.ALERT_SEVERITY])
+    metric_name = fuzzy.FuzzyChoice(['velocity', 'completion_rate', 'bug_resolution_rate'])
+    current_value = fuzzy.FuzzyDecimal(0, 100)
+    threshold_value = Decimal('70.00')
+    message = factory.Faker('sentence', nb_words=8, locale=FAKER_LOCALE)
+    is_resolved = fuzzy.FuzzyChoice([True, False])
@@ -0,0 +1,177 @@
+"""
+Ejecución de los casos, resultados en JSON y comparación con la línea base.
+
+Por caso se guardan mínimo, mediana, p95 y promedio en milisegundos y la
+cantidad de consultas SQL de la última corrida. La comparación usa la
+mediana: un caso es regresión si supera la línea base en más de
+``tolerance`` (y al menos ``min_delta_ms``) o si ejecuta más consultas.
+"""
+import json
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable
+
+import django
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+
+from apps.shared.infrastructure.sql_budget import QueryRecorder
+
+
+@dataclass
+class Case:
+    name: str
+    setup: Callable
+    repeat: int = 10
+    warmup: int = 1
+    cold: bool = False
+
+
+# Casos declarados con @benchmark, en orden de ejecución
+cases = {}
+
+
+def benchmark(name, repeat=10, warmup=1, cold=False):
+    """Registra ``setup(context)``, que retorna la operación a cronometrar"""
+    def decorator(setup):
+        cases[name] = Case(name, setup, repeat, warmup, cold)
+        return setup
+    return decorator
+
+
+class Context:
+    """Dataset, usuario y cliente HTTP autenticado que comparten los casos"""
+
+    def __init__(self, dataset, user):
+        self.dataset = dataset
+        self.user = user
+        self.client = Client(HTTP_ACCEPT='application/json')
+        self.client.force_login(user)
+
+    def get(self, url):
+        response = self.client.get(url)
+        if response.status_code != 200:
+            raise AssertionError(f'GET {url}: {response.status_code}')
+        if response.streaming:
+            b''.join(response.streaming_content)
+        return response
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+def run_case(case, context):
+    operation = case.setup(context)
+    for _ in range(case.warmup):
+        if case.cold:
+            cache.clear()
+        operation()
+
+    timings = []
+    queries = 0
+    for _ in range(case.repeat):
+        if case.cold:
+            cache.clear()
+        with QueryRecorder(case.name) as recorder:
+            started = time.perf_counter()
+            operation()
+            timings.append((time.perf_counter() - started) * 1000)
+        queries = recorder.count
+
+    return {
+        'runs': len(timings),
+        'min_ms': round(min(timings), 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(percentile(timings, 0.95), 3),
+        'mean_ms': round(statistics.fmean(timings), 3),
+        'queries': queries,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(dataset, user, only=None, log=None):
+    """Ejecuta los casos (todos o los de ``only``) y retorna el documento de resultados"""
+    import benchmarks.cases  # noqa: F401  (registra los casos)
+
+    log = log or (lambda message: None)
+    selected = [case for name, case in cases.items() if not only or name in only]
+    context = Context(dataset, user)
+    results = {}
+    for case in selected:
+        results[case.name] = run_case(case, context)
+        log(f'{case.name}: {results[case.name]["median_ms"]} ms, {results[case.name]["queries"]} consultas')
+
+    return {
+        'meta': {
+            'scale': dataset.scale,
+            'seed': dataset.seed,
+            'rows': dataset.counts,
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'revision': git_revision(),
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        },
+        'cases': results,
+    }
+
+
+def compare(results, baseline, tolerance=0.2, min_delta_ms=1.0):
+    """Compara cada caso contra la línea base; retorna {caso: detalle con ``status``}"""
+    if baseline['meta'].get('scale') != results['meta'].get('scale'):
+        raise ValueError(
+            f'La línea base es de la escala {baseline["meta"].get("scale")}, '
+            f'los resultados de {results["meta"].get("scale")}'
+        )
+    comparison = {}
+    for name, result in results['cases'].items():
+        base = baseline['cases'].get(name)
+        if base is None:
+            comparison[name] = {'status': 'new'}
+            continue
+        delta = result['median_ms'] - base['median_ms']
+        ratio = result['median_ms'] / base['median_ms'] if base['median_ms'] else None
+        if result['queries'] > base['queries'] or (
+            ratio is not None and ratio > 1 + tolerance and delta >= min_delta_ms
+        ):
+            status = 'regression'
+        elif ratio is not None and ratio < 1 - tolerance and -delta >= min_delta_ms:
+            status = 'improvement'
+        else:
+            status = 'unchanged'
+        comparison[name] = {
+            'status': status,
+            'baseline_ms': base['median_ms'],
+            'median_ms': result['median_ms'],
+            'ratio': round(ratio, 3) if ratio is not None else None,
+            'baseline_queries': base['queries'],
+            'queries': result['queries'],
+        }
+    return comparison
+
+
+def load(path):
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def dump(document, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(document, file, indent=2, sort_keys=True, ensure_ascii=False, default=str)
+        file.write('\n')
@@ -0,0 +1,465 @@
+"""
+Organizaciones sintéticas de tamaño configurable para pruebas de carga.
+
+Una organización es un equipo aislado por prefijo de usuario: sus
+usuarios, sprints de dos semanas con miembros y capacidad, backlog,
+historias con tareas y comentarios, y varios años de métricas (sprint,
+burndown, individuales, de equipo y alertas). El contenido depende sólo
+de la semilla, así que dos ejecuciones con los mismos parámetros generan
+los mismos datos.
+
+A diferencia de ``datasets`` no pasa por las factories: las filas se
+arman con constructores de modelo y textos precalculados y se insertan con
+``bulk_create`` en lotes grandes dentro de una sola transacción con las
+claves foráneas diferidas, lo que permite cargar un millón de filas en
+menos de un minuto en SQLite o PostgreSQL.
+"""
+import datetime
+import random
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+
+from apps.backlog.domain.models import BacklogComment, BacklogItem
+from apps.backlog.infrastructure.labels import backlog_item_labels
+from apps.historias.domain.models import StoryComment, StoryTask, UserStory
+from apps.historias.infrastructure.labels import user_story_labels
+from apps.metricas.application.services import VelocityHistoryService
+from apps.metricas.domain.models import (
+    BurndownSnapshot, IndividualMetric, MetricAlert, SprintMetric, TeamMetric,
+)
+from apps.shared.domain.ranking import even_ranks
+from apps.shared.domain.value_objects import Status
+from apps.shared.infrastructure.cache import invalidate_tags
+from apps.shared.infrastructure.search import search_indexes
+from apps.sprint.application.services import SprintCounterService
+from apps.sprint.domain.models import Sprint, SprintMember, SprintTask
+from benchmarks.datasets import ACTIVE_STATUS_WEIGHTS, CLOSED_STATUS_WEIGHTS
+from benchmarks.factories import BACKLOG_POINTS, LABELS, PRIORITIES, STATUSES, STORY_POINTS
+
+
+@dataclass(frozen=True)
+class OrganisationSize:
+    """Volumen de una organización; los ``*_per_*`` son promedios por padre"""
+
+    users: int
+    years: int
+    backlog_items: int
+    comments_per_item: float
+    stories_per_item: float
+    tasks_per_story: int
+    comments_per_story: float
+    members_per_sprint: int
+    tasks_per_sprint: int
+
+
+# ``large`` ronda el millón de filas por organización contando las etiquetas
+PRESETS = {
+    'small': OrganisationSize(
+        users=15, years=1, backlog_items=2_000, comments_per_item=1, stories_per_item=0.5,
+        tasks_per_story=3, comments_per_story=1, members_per_sprint=6, tasks_per_sprint=30,
+    ),
+    'medium': OrganisationSize(
+        users=60, years=3, backlog_items=25_000, comments_per_item=1.5, stories_per_item=0.5,
+        tasks_per_story=4, comments_per_story=1, members_per_sprint=9, tasks_per_sprint=80,
+    ),
+    'large': OrganisationSize(
+        users=200, years=5, backlog_items=120_000, comments_per_item=2, stories_per_item=0.5,
+        tasks_per_story=4, comments_per_story=1.5, members_per_sprint=12, tasks_per_sprint=200,
+    ),
+}
+
+SPRINT_DAYS = 14
+SPRINTS_PER_YEAR = 26
+ROLES = ['developer', 'developer', 'developer', 'developer', 'tester', 'scrum_master', 'product_owner']
+CAPACITIES = [50, 80, 100, 100, 100]
+PERSONAS = ['usuario', 'administrador', 'product owner', 'desarrollador', 'cliente']
+EPICS = ['Onboarding', 'Pagos', 'Reportes', 'Notificaciones', 'Integraciones', '']
+FIRST_NAMES = [
+    'Ana', 'Luis', 'Carmen', 'Jorge', 'Lucía', 'Pablo', 'Elena', 'Diego', 'Sofía', 'Mateo', 'Valeria', 'Tomás',
+]
+LAST_NAMES = ['García', 'Pérez', 'López', 'Sánchez', 'Romero', 'Torres', 'Flores', 'Rivera', 'Díaz', 'Morales']
+WORDS = (
+    'agregar validar corregir migrar exportar importar optimizar revisar documentar configurar '
+    'usuario cliente pedido factura pago reporte panel tablero sprint tarea historia búsqueda '
+    'filtro permiso sesión correo notificación integración servicio consulta índice caché error '
+    'formulario pantalla móvil web api datos métrica alerta backlog etiqueta comentario archivo'
+).split()
+TEXT_POOL_SIZE = 4096
+ALERT_THRESHOLD = Decimal('70.00')
+
+
+def percent(part, total):
+    return (Decimal(part * 100) / total).quantize(Decimal('0.01')) if total else Decimal('0.00')
+
+
+def sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+class TextPool:
+    """Oraciones precalculadas: elegir de la lista es mucho más barato que generar texto por fila"""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.short = [sentence(rng, rng.randint(3, 6)) for _ in range(TEXT_POOL_SIZE)]
+        self.long = [
+            ' '.join(sentence(rng, rng.randint(6, 12)) for _ in range(3)) for _ in range(TEXT_POOL_SIZE)
+        ]
+
+    def title(self):
+        return self.rng.choice(self.short)
+
+    def paragraph(self):
+        return self.rng.choice(self.long)
+
+
+@contextmanager
+def bulk_load():
+    """
+    Transacción única con las restricciones diferidas hasta el COMMIT.
+
+    En PostgreSQL las claves foráneas de Django ya son ``DEFERRABLE``;
+    ``SET CONSTRAINTS ALL DEFERRED`` lo hace explícito. En SQLite se difieren
+    con ``defer_foreign_keys`` y se relaja ``synchronous`` mientras dura la
+    carga (se restaura al salir).
+    """
+    synchronous = None
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            synchronous = cursor.execute('PRAGMA synchronous').fetchone()[0]
+            cursor.execute('PRAGMA synchronous = OFF')
+    try:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                if connection.vendor == 'postgresql':
+                    cursor.execute('SET CONSTRAINTS ALL DEFERRED')
+                elif connection.vendor == 'sqlite':
+                    cursor.execute('PRAGMA defer_foreign_keys = ON')
+            yield connection
+    finally:
+        if synchronous is not None:
+            with connection.cursor() as cursor:
+                cursor.execute(f'PRAGMA synchronous = {int(synchronous)}')
+
+
+class ScaleDataGenerator:
+    """Genera ``organisations`` organizaciones de tamaño ``size``"""
+
+    batch_size = 10_000
+
+    def __init__(self, size, organisations=1, seed=42, prefix='carga', batch_size=None,
+                 search_index=True, log=None):
+        self.size = size
+        self.organisations = organisations
+        self.seed = seed
+        self.prefix = prefix
+        self.batch_size = batch_size or self.batch_size
+        self.search_index = search_index
+        self.log = log or (lambda message: None)
+        self.rng = random.Random(seed)
+        self.text = TextPool(self.rng)
+        self.counts = Counter()
+        self.sprint_ids = []
+        self.today = datetime.date.today()
+
+    def existing_users(self):
+        return User.objects.filter(username__startswith=f'{self.prefix}-').exists()
+
+    def bulk(self, model, objects, after=None):
+        """Inserta en lotes de ``batch_size``; ``after(batch)`` recibe cada lote ya insertado"""
+        objects = iter(objects)
+        started = time.perf_counter()
+        total = 0
+        while True:
+            batch = list(islice(objects, self.batch_size))
+            if not batch:
+                break
+            model.objects.bulk_create(batch, batch_size=self.batch_size)
+            if after is not None:
+                after(batch)
+            total += len(batch)
+        self.counts[model._meta.label] += total
+        self.log(f'{model._meta.label}: {total} filas en {time.perf_counter() - started:.1f} s')
+        return total
+
+    def generate(self):
+        """Carga todas las organizaciones y reconstruye los datos derivados; retorna las filas por modelo"""
+        with bulk_load():
+            password = make_password(self.prefix)
+            for number in range(1, self.organisations + 1):
+                self.log(f'Organización {number}/{self.organisations}')
+                self.generate_organisation(f'{self.prefix}-{number:03d}', password)
+            self.rebuild_derived()
+            invalidate_tags('backlog', 'boards', 'sprints', 'metrics')
+        return dict(self.counts)
+
+    def generate_organisation(self, slug, password):
+        users = self.generate_users(slug, password)
+        items = self.generate_backlog(users)
+        self.generate_stories(users, items)
+        sprints, members = self.generate_sprints(slug, users)
+        tallies = self.generate_sprint_tasks(sprints, members, items)
+        self.generate_metrics(sprints, members, tallies)
+
+    def generate_users(self, slug, password):
+        rng = self.rng
+        users = [
+            User(
+                username=f'{slug}-{number:04d}', email=f'{slug}-{number:04d}@example.com', password=password,
+                first_name=rng.choice(FIRST_NAMES), last_name=rng.choice(LAST_NAMES),
+            )
+            for number in range(1, self.size.users + 1)
+        ]
+        self.bulk(User, users)
+        if users[0].pk is None:
+            # Backends sin RETURNING en bulk_create: se recuperan los ids por nombre de usuario
+            ids = dict(
+                User.objects.filter(username__startswith=f'{slug}-').values_list('username', 'id')
+            )
+            for user in users:
+                user.pk = ids[user.username]
+        return users
+
+    def generate_backlog(self, users):
+        rng, text, size = self.rng, self.text, self.size
+        assignees = users + [None]
+        first_due = self.today - datetime.timedelta(days=365 * size.years)
+        due_range = 365 * (size.years + 1)
+        items = []
+
+        def backlog_items():
+            for _ in range(size.backlog_items):
+                yield BacklogItem(
+                    title=text.title(), description=text.paragraph(),
+                    priority=rng.choice(PRIORITIES), status=rng.choice(STATUSES),
+                    created_by=rng.choice(users), assigned_to=rng.choice(assignees),
+                    due_date=(
+                        first_due + datetime.timedelta(days=rng.randrange(due_range)) if rng.random() < 0.6 else None
+                    ),
+                    story_points=rng.choice(BACKLOG_POINTS) if rng.random() < 0.8 else None,
+                    labels=sorted(rng.sample(LABELS, rng.randint(0, 3))),
+                )
+
+        def indexed(batch):
+            items.extend(batch)
+            self.count_labels(backlog_item_labels.index_new(batch, batch_size=self.batch_size))
+
+        self.bulk(BacklogItem, backlog_items(), after=indexed)
+        self.bulk(BacklogComment, (
+            BacklogComment(backlog_item=rng.choice(items), author=rng.choice(users), content=text.title())
+            for _ in range(int(len(items) * size.comments_per_item))
+        ))
+        return items
+
+    def generate_stories(self, users, items):
+        rng, text, size = self.rng, self.text, self.size
+        stories = []
+
+        def user_stories():
+            # Como mucho una historia por ítem (OneToOne)
+            for item in rng.sample(items, min(int(len(items) * size.stories_per_item), len(items))):
+                yield UserStory(
+                    title=item.title, description=text.paragraph(), as_a=rng.choice(PERSONAS),
+                    i_want=text.title(), so_that=text.title(), acceptance_criteria=text.paragraph(),
+                    priority=item.priority, status=rng.choice(STATUSES), story_points=rng.choice(STORY_POINTS),
+                    backlog_item=item, author=rng.choice(users), labels=list(item.labels), epic=rng.choice(EPICS),
+                )
+
+        def indexed(batch):
+            stories.extend(batch)
+            self.count_labels(user_story_labels.index_new(batch, batch_size=self.batch_size))
+
+        self.bulk(UserStory, user_stories(), after=indexed)
+
+        assignees = users + [None]
+        ranks = even_ranks(size.tasks_per_story)
+
+        def story_tasks():
+            for story in stories:
+                for rank in ranks:
+                    status = rng.choice(STATUSES)
+                    yield StoryTask(
+                        story=story, title=text.title(), status=status, assigned_to=rng.choice(assignees),
+                        estimated_hours=Decimal(rng.randint(2, 160)) / 10,
+                        actual_hours=Decimal(rng.randint(2, 200)) / 10 if status == Status.DONE.value else None,
+                        rank=rank,
+                    )
+
+        self.bulk(StoryTask, story_tasks())
+        self.bulk(StoryComment, (
+            StoryComment(story=rng.choice(stories), author=rng.choice(users), content=text.title(),
+                         is_internal=rng.random() < 0.25)
+            for _ in range(int(len(stories) * size.comments_per_story))
+        ))
+
+    def generate_sprints(self, slug, users):
+        """Inserta los sprints y sus miembros; retorna ambos como listas paralelas"""
+        rng, size = self.rng, self.size
+        count = size.years * SPRINTS_PER_YEAR
+        # Sprints consecutivos: el penúltimo contiene a hoy y el último está en planificación
+        first_start = self.today - datetime.timedelta(days=SPRINT_DAYS * (count - 2) + SPRINT_DAYS // 2)
+        sprints = []
+        for position in range(count):
+            start = first_start + datetime.timedelta(days=SPRINT_DAYS * position)
+            sprints.append(Sprint(
+                name=f'{slug} · Sprint {position + 1}', start_date=start,
+                end_date=start + datetime.timedelta(days=SPRINT_DAYS - 1), goal=self.text.title(),
+                status='completed' if position < count - 2 else ('active' if position == count - 2 else 'planning'),
+                created_by=rng.choice(users),
+            ))
+        self.bulk(Sprint, sprints)
+        self.sprint_ids.extend(sprint.pk for sprint in sprints)
+
+        members = [rng.sample(users, min(size.members_per_sprint, len(users))) for _ in sprints]
+        self.bulk(SprintMember, (
+            SprintMember(sprint=sprint, user=user, role=rng.choice(ROLES), capacity=rng.choice(CAPACITIES))
+            for sprint, team in zip(sprints, members) for user in team
+        ))
+        return sprints, members
+
+    def generate_sprint_tasks(self, sprints, members, items):
+        """Inserta las tareas y retorna, por sprint, los puntos y tareas totales y hechos"""
+        rng, per_sprint = self.rng, min(self.size.tasks_per_sprint, len(items))
+        tallies = [Counter() for _ in sprints]
+
+        def tasks():
+            for position, (sprint, team, tally) in enumerate(zip(sprints, members, tallies)):
+                weights = CLOSED_STATUS_WEIGHTS if sprint.status == 'completed' else ACTIVE_STATUS_WEIGHTS
+                statuses, status_weights = zip(*weights)
+                started = datetime.datetime.combine(sprint.start_date, datetime.time(9), datetime.timezone.utc)
+                columns = {}
+                # Ítems consecutivos: ningún ítem se repite dentro del mismo sprint
+                for offset in range(per_sprint):
+                    item = items[(position * per_sprint + offset) % len(items)]
+                    status = (
+                        Status.TODO.value if sprint.status == 'planning'
+                        else rng.choices(statuses, status_weights)[0]
+                    )
+                    points = item.story_points or rng.choice(STORY_POINTS)
+                    done = status == Status.DONE.value
+                    tally.update(points=points, tasks=1, done_points=points if done else 0, done_tasks=int(done))
+                    columns.setdefault(status, []).append(SprintTask(
+                        sprint=sprint, backlog_item=item, status=status, priority=item.priority,
+                        story_points=points, assigned_to=rng.choice(team),
+                        started_at=started if status != Status.TODO.value else None,
+                        completed_at=(
+                            started + datetime.timedelta(days=rng.randint(1, SPRINT_DAYS - 1)) if done else None
+                        ),
+                    ))
+                for column in columns.values():
+                    for task, rank in zip(column, even_ranks(len(column))):
+                        task.rank = rank
+                        yield task
+
+        self.bulk(SprintTask, tasks())
+        return tallies
+
+    def generate_metrics(self, sprints, members, tallies):
+        rng = self.rng
+        closed = [
+            (sprint, team, tally) for sprint, team, tally in zip(sprints, members, tallies)
+            if sprint.status == 'completed'
+        ]
+        burning = closed + [
+            (sprint, team, tally) for sprint, team, tally in zip(sprints, members, tallies)
+            if sprint.status == 'active'
+        ]
+
+        def sprint_metrics():
+            for sprint, team, tally in closed:
+                bugs_found = rng.randint(0, 12)
+                metric = SprintMetric(
+                    sprint=sprint, planned_velocity=tally['points'], actual_velocity=tally['done_points'],
+                    planned_story_points=tally['points'], completed_story_points=tally['done_points'],
+                    total_tasks=tally['tasks'], completed_tasks=tally['done_tasks'],
+                    average_task_duration=Decimal(rng.randint(40, 400)) / 10,
+                    team_size=len(team),
+                    average_tasks_per_member=(Decimal(tally['tasks']) / len(team)).quantize(Decimal('0.01')),
+                    bugs_found=bugs_found, bugs_resolved=rng.randint(0, bugs_found),
+                )
+                metric.calculate_rates(save=False)
+                yield metric
+
+        def snapshots():
+            # Burndown con ruido alrededor de la recta ideal; el del sprint activo llega hasta hoy
+            for sprint, _, tally in burning:
+                days = min(SPRINT_DAYS, (self.today - sprint.start_date).days + 1)
+                burned_points = burned_tasks = 0
+                for day in range(days):
+                    ideal = (day + 1) / SPRINT_DAYS * rng.uniform(0.7, 1.2)
+                    burned_points = max(burned_points, min(int(tally['done_points'] * ideal), tally['done_points']))
+                    burned_tasks = max(burned_tasks, min(int(tally['done_tasks'] * ideal), tally['done_tasks']))
+                    if day == SPRINT_DAYS - 1:
+                        burned_points, burned_tasks = tally['done_points'], tally['done_tasks']
+                    yield BurndownSnapshot(
+                        sprint=sprint, date=sprint.start_date + datetime.timedelta(days=day),
+                        total_points=tally['points'], remaining_points=tally['points'] - burned_points,
+                        total_tasks=tally['tasks'], remaining_tasks=tally['tasks'] - burned_tasks,
+                    )
+
+        def alerts():
+            # Una alerta por sprint cerrado por debajo del 70 % de lo comprometido; las viejas ya resueltas
+            for sprint, _, tally in closed:
+                rate = percent(tally['done_points'], tally['points'])
+                if rate >= ALERT_THRESHOLD:
+                    continue
+                resolved = sprint.end_date < self.today - datetime.timedelta(days=90)
+                yield MetricAlert(
+                    name=f'{sprint.name}: completitud baja', alert_type='threshold',
+                    severity='critical' if rate < 50 else 'high', metric_name='completion_rate',
+                    current_value=rate, threshold_value=ALERT_THRESHOLD,
+                    message=f'{sprint.name} completó el {rate} % de los puntos comprometidos',
+                    is_resolved=resolved,
+                    resolved_at=datetime.datetime.combine(
+                        sprint.end_date + datetime.timedelta(days=SPRINT_DAYS), datetime.time(9),
+                        datetime.timezone.utc,
+                    ) if resolved else None,
+                )
+
+        self.bulk(SprintMetric, sprint_metrics())
+        self.bulk(BurndownSnapshot, snapshots())
+        self.bulk(IndividualMetric, (
+            IndividualMetric(
+                user=user, sprint=sprint, name=label, metric_type=metric_type,
+                value=Decimal(rng.randint(3000, 10000)) / 100, unit='%', measurement_date=sprint.end_date,
+            )
+            for sprint, team, _ in closed for user in team
+            for metric_type, label in IndividualMetric.METRIC_TYPES
+        ))
+        self.bulk(TeamMetric, (
+            TeamMetric(
+                name=label, metric_type=metric_type, value=Decimal(rng.randint(4000, 10000)) / 100, unit='%',
+                target_value=Decimal('80.00'), measurement_date=sprint.end_date, calculated_by=rng.choice(team),
+            )
+            for sprint, team, _ in closed for metric_type, label in TeamMetric.METRIC_TYPES
+        ))
+        self.bulk(MetricAlert, alerts())
+
+    def count_labels(self, memberships):
+        if memberships:
+            self.counts[memberships[0]._meta.label] += len(memberships)
+
+    def rebuild_derived(self):
+        """Contadores de sprint, historial de velocidad e índices de búsqueda (bulk_create no emite señales)"""
+        started = time.perf_counter()
+        SprintCounterService().reconcile(self.sprint_ids)
+        VelocityHistoryService().rebuild()
+        if self.search_index:
+            for table, index in search_indexes.items():
+                backend = index.backend(connection)
+                if backend is not None:
+                    self.log(f'{table}: {backend.rebuild()} documentos indexados')
+        self.log(f'Datos derivados reconstruidos en {time.perf_counter() - started:.1f} s')
+
+
+def scaled(size, **overrides):
+    """Copia de ``size`` con los campos indicados reemplazados (los ``None`` se ignoran)"""
+    return replace(size, **{name: value for name, value in overrides.items() if value is not None})
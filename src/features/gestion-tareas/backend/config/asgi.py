@@ -1,5 +1,8 @@
 """
 ASGI config for gestion_tareas project.
+
+Los streams de eventos (SSE) de tableros y backlog necesitan un servidor
+ASGI, por ejemplo: gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker
 """
 import os
 from django.core.asgi import get_asgi_application
@@ -0,0 +1,11 @@
+"""
+Celery config for gestion_tareas project.
+"""
+import os
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.production')
+
+app = Celery('gestion_tareas')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
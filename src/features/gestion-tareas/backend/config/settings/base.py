@@ -3,6 +3,7 @@
 import os
 from pathlib import Path
 import environ
+from celery.schedules import crontab
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -40,7 +41,6 @@ THIRD_PARTY_APPS = [
     'corsheaders',
     'django_extensions',
     'django_filters',
-    'simple_history',
 ]
 
 LOCAL_APPS = [
@@ -55,6 +55,7 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'apps.shared.presentation.middleware.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -62,7 +63,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'simple_history.middleware.HistoryRequestMiddleware',
+    'apps.shared.presentation.middleware.AuditActorMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -124,6 +125,10 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Media files (archivos de importación subidos)
+MEDIA_URL = '/media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -138,12 +143,12 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'apps.shared.infrastructure.pagination.KeysetPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
-        'rest_framework.filters.SearchFilter',
-        'rest_framework.filters.OrderingFilter',
+        'apps.shared.infrastructure.search.FullTextSearchFilter',
+        'apps.shared.infrastructure.labels.LabelFilterBackend',
     ],
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
@@ -160,9 +165,42 @@ REST_FRAMEWORK = {
 CORS_ALLOWED_ORIGINS = env('CORS_ALLOWED_ORIGINS')
 CORS_ALLOW_CREDENTIALS = True
 
-# Simple History
-SIMPLE_HISTORY_HISTORY_ID_USE_UUID = True
-SIMPLE_HISTORY_HISTORY_CHANGE_REASON_USE_TEXT_FIELD = True
+# Filtro por etiquetas: 'table' (tabla de pertenencia) o 'json' (contención JSON + GIN, sólo PostgreSQL)
+LABEL_FILTER_STRATEGY = env('LABEL_FILTER_STRATEGY', default='table')
+
+# Cache de agregados (Redis); las etiquetas de invalidación viven en la misma caché
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': env('REDIS_URL'),
+        'KEY_PREFIX': 'gestion_tareas',
+        'TIMEOUT': 300,
+    }
+}
+
+# Novedades en tiempo real (SSE): Redis reparte los eventos entre workers ASGI
+REALTIME_BROKER = {
+    'BACKEND': 'apps.shared.infrastructure.realtime.RedisBroker',
+    'OPTIONS': {
+        'url': env('REDIS_URL'),
+    },
+}
+
+# Presupuesto de consultas SQL por petición (apps.shared.infrastructure.sql_budget)
+SQL_BUDGET = {
+    'DEFAULT_BUDGET': env.int('SQL_DEFAULT_BUDGET', default=50),
+    'N_PLUS_ONE_THRESHOLD': 5,
+    'SLOWEST': 5,
+    'LOG_SAMPLE_RATE': env.float('SQL_LOG_SAMPLE_RATE', default=0.01),
+}
+
+# Auditoría por diferencias de SprintTask, StoryTask y BacklogItem (apps.shared.infrastructure.audit)
+AUDIT_LOG = {
+    'ASYNC': env.bool('AUDIT_LOG_ASYNC', default=False),
+    'BATCH_SIZE': 1000,
+    'CHECKPOINT_SETTLE': 5,
+    'RETENTION_DAYS': env.int('AUDIT_LOG_RETENTION_DAYS', default=365),
+}
 
 # Celery Configuration
 CELERY_BROKER_URL = env('REDIS_URL')
@@ -170,4 +208,18 @@ CELERY_RESULT_BACKEND = env('REDIS_URL')
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
-CELERY_TIMEZONE = TIME_ZONE
\ No newline at end of file
+CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    'compact-audit-log': {
+        'task': 'apps.shared.tasks.compact_audit_log',
+        'schedule': crontab(hour=3, minute=30),
+    },
+    'checkpoint-audit-log': {
+        'task': 'apps.shared.tasks.checkpoint_audit_log',
+        'schedule': crontab(minute=10),
+    },
+    'overdue-digest': {
+        'task': 'apps.backlog.tasks.send_overdue_digests',
+        'schedule': crontab(hour=8, minute=0, day_of_week='mon-fri'),
+    },
+}
@@ -0,0 +1,60 @@
+from .base import *
+
+# Benchmark settings: la misma base de datos que producción (DATABASE_URL) sin
+# servicios externos, para que los tiempos midan sólo la aplicación
+DEBUG = False
+
+ALLOWED_HOSTS = ['testserver', 'localhost']
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+REALTIME_BROKER = {
+    'BACKEND': 'apps.shared.infrastructure.realtime.InProcessBroker',
+}
+
+# Los archivos de importación no tocan el disco
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.InMemoryStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+# Se mide, pero no se corta la petición ni se escriben logs por cada una
+SQL_BUDGET = {
+    **SQL_BUDGET,
+    'LOG_SAMPLE_RATE': 0,
+}
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+CELERY_TASK_ALWAYS_EAGER = True
+CELERY_TASK_EAGER_PROPAGATES = True
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'django': {
+            'handlers': ['console'],
+            'level': 'ERROR',
+        },
+        'apps': {
+            'handlers': ['console'],
+            'level': 'ERROR',
+        },
+    },
+}
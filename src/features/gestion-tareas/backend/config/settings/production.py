@@ -40,6 +40,10 @@ LOGGING = {
             'format': '{levelname} {asctime} {module} {process:d} {thread:d} {message}',
             'style': '{',
         },
+        'metrics': {
+            'format': '{message}',
+            'style': '{',
+        },
     },
     'handlers': {
         'file': {
@@ -49,6 +53,13 @@ LOGGING = {
             'backupCount': 10,
             'formatter': 'verbose',
         },
+        'sql_metrics': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': BASE_DIR / 'logs' / 'sql_metrics.jsonl',
+            'maxBytes': 1024 * 1024 * 15,  # 15MB
+            'backupCount': 10,
+            'formatter': 'metrics',
+        },
     },
     'root': {
         'handlers': ['file'],
@@ -65,5 +76,11 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        # Una línea JSON por petición: endpoint, consultas, presupuesto, tiempos y N+1
+        'apps.sql.metrics': {
+            'handlers': ['sql_metrics'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
\ No newline at end of file
@@ -11,6 +11,25 @@ DATABASES = {
     }
 }
 
+# Cache en memoria local para testing
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Broker de eventos en memoria del proceso para testing
+REALTIME_BROKER = {
+    'BACKEND': 'apps.shared.infrastructure.realtime.InProcessBroker',
+}
+
+# Exceder el presupuesto de consultas de una vista hace fallar el test
+SQL_BUDGET = {
+    **SQL_BUDGET,
+    'STRICT': True,
+    'LOG_SAMPLE_RATE': 0,
+}
+
 # Speed up tests
 PASSWORD_HASHERS = [
     'django.contrib.auth.hashers.MD5PasswordHasher',
@@ -6,9 +6,10 @@ from django.urls import path, include
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    # path('api/v1/backlog/', include('apps.backlog.infrastructure.api.urls')),
-    # path('api/v1/sprint/', include('apps.sprint.infrastructure.api.urls')),
-    # path('api/v1/repo/', include('apps.historias.infrastructure.api.urls')),
-    # path('api/v1/metrics/', include('apps.metricas.infrastructure.api.urls')),
+    path('api/v1/backlog/', include('apps.backlog.urls')),
+    path('api/v1/sprint/', include('apps.sprint.urls')),
+    path('api/v1/repo/', include('apps.historias.urls')),
+    path('api/v1/metrics/', include('apps.metricas.urls')),
+    path('api/v1/activity/', include('apps.shared.urls')),
     # path('api/v1/dashboard/', include('apps.dashboard.infrastructure.api.urls')),
 ]
\ No newline at end of file